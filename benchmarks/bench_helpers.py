@@ -0,0 +1,41 @@
+import random
+import time
+from collections.abc import Callable
+from typing import Final
+from typing import TypeVar
+
+T = TypeVar("T")
+
+__KANJI: Final = [chr(c) for c in range(0x4E00, 0x9FA0)]
+__HIRAGANA: Final = [chr(c) for c in range(0x3041, 0x3094)]
+
+
+def make_vocab_file(filename: str, rows: int, seed: int = 0) -> None:
+    """Writes a vocab of made up words, in lists of 100, the
+    same every time for a given seed."""
+    rng = random.Random(seed)
+    seen: set[str] = set()
+    with open(filename, "w", encoding="utf-8") as f:
+        for row in range(rows):
+            kanji = ""
+            while kanji == "" or kanji in seen:
+                kanji = "".join(rng.choices(__KANJI, k=rng.randint(1, 3)))
+            seen.add(kanji)
+            kana_list = [
+                "".join(rng.choices(__HIRAGANA, k=rng.randint(2, 6)))
+                for _ in range(rng.randint(0, 2))
+            ]
+            list_name = f"{(row // 100 + 1) * 100:04d}"
+            known = rng.randint(0, 1)
+            f.write(f"{list_name},{kanji},{known},{','.join(kana_list)}\n")
+
+
+def timed(label: str, f: Callable[[], T], repeat: int = 1) -> T:
+    """Calls f repeat times, prints the average time it
+    took, and returns the last result."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = f()
+    seconds = (time.perf_counter() - start) / repeat
+    print(f"  {label:<40} {seconds * 1000:10.2f} ms")
+    return result
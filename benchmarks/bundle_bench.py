@@ -0,0 +1,67 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import partial
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+__ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main() -> None:
+    """Times starting up, from starting Python to the first
+    prompt, with --profile-startup, which quits there, from
+    source that hasn't been compiled, as after changing it,
+    from source that has, and from the bundle that
+    scripts/bundle builds."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    print(f"bundle, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        bundle = os.path.join(tmp_dir, "nevsjapanesevocab.pyz")
+        subprocess.run(
+            ["bash", os.path.join(__ROOT, "scripts", "bundle"), bundle], check=True
+        )
+        # A copy, so that its bytecode isn't written.
+        source = os.path.join(tmp_dir, "source")
+        for directory in ["src", "locales"]:
+            shutil.copytree(
+                os.path.join(__ROOT, directory),
+                os.path.join(source, directory),
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+        shutil.copy(os.path.join(__ROOT, "nevsjapanesevocab.py"), source)
+        env = {**os.environ, "XDG_CACHE_HOME": os.path.join(tmp_dir, "cache")}
+        args = [filename, "--profile-startup"]
+        start = partial(subprocess.run, env=env, capture_output=True, check=True)
+        # Fills the caches.
+        start([sys.executable, bundle, *args])
+        timed(
+            "from source, compiling",
+            partial(
+                start,
+                [sys.executable, "-B", "nevsjapanesevocab.py", *args],
+                cwd=source,
+                env={**env, "PYTHONPATH": os.path.join(source, "src")},
+            ),
+            5,
+        )
+        timed(
+            "from source, compiled",
+            partial(
+                start,
+                [sys.executable, "nevsjapanesevocab.py", *args],
+                cwd=__ROOT,
+                env={**env, "PYTHONPATH": os.path.join(__ROOT, "src")},
+            ),
+            5,
+        )
+        timed("from the bundle", partial(start, [sys.executable, bundle, *args]), 5)
+
+
+if __name__ == "__main__":
+    main()
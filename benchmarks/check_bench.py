@@ -0,0 +1,34 @@
+import collections
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+from check import check_vocab
+
+
+def main() -> None:
+    """Times checking a vocab file, and measures the peak
+    memory that it takes with tracemalloc, which should
+    stay about the same as the file gets bigger.
+    tracemalloc doesn't see SQLite's page cache, which is
+    bounded anyway."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"check, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        timed("check", lambda: collections.deque(check_vocab(filename), 0))
+        # Again, since tracemalloc slows it down a lot.
+        tracemalloc.start()
+        collections.deque(check_vocab(filename), 0)
+        _size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {'peak':<40} {peak / 1024 / 1024:10.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import collections
+import os
+import sys
+import tempfile
+from functools import partial
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+from storage import CsvStorage
+
+
+def main() -> None:
+    """Times parsing and writing the rows of a CSV vocab,
+    without building a vocab from them, and parsing them
+    with more and more processes, up to the number of
+    cores."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cores = os.cpu_count() or 1
+    print(f"csv, {rows} rows, {cores} cores")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        storage = CsvStorage(filename)
+        timed("load", lambda: collections.deque(storage.load(), 0))
+        processes = 2
+        while processes <= max(cores, 2):
+            timed(
+                f"load in {processes} processes",
+                partial(collections.deque, storage.load_parallel(processes), 0),
+            )
+            processes *= 2
+        loaded = list(storage.load())
+        timed("save", lambda: storage.save(loaded))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+from vocab import Vocab
+
+
+def main() -> None:
+    """Compares opening and searching a big CSV vocab,
+    parsing all of it up front, and lazily."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"lazy, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        bench("eager", filename, False)
+        bench("lazy", filename, True)
+
+
+def bench(name: str, filename: str, lazy: bool) -> None:
+    vocab = timed(f"{name} load", lambda: Vocab(filename, lazy=lazy))
+    # Traced separately, tracing slows loading down a lot.
+    tracemalloc.start()
+    traced = Vocab(filename, lazy=lazy)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+    print(f"  {name + ' load memory':<40} {size / 1024 / 1024:10.2f} MB")
+    timed(f"{name} first search", lambda: vocab.search_page("あ", count=20))
+    timed(f"{name} search", lambda: vocab.search_page("い", count=20))
+    kanji = vocab.search_page("list:0100", count=1)[1][0]
+    timed(f"{name} toggle known", lambda: vocab.toggle_known(kanji), 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from bench_helpers import make_vocab_file
+
+from vocab import Vocab
+
+
+def main() -> None:
+    """Measures the memory that each entry of a loaded vocab
+    takes, with tracemalloc, after loading pykakasi's
+    dictionaries, which are shared by every vocab."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"memory, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        Vocab(filename, lazy=True)
+        for lazy in [False, True]:
+            name = "lazy" if lazy else "eager"
+            size = loaded_size(filename, lazy)
+            print(f"  {name + ' total':<40} {size / 1024 / 1024:10.2f} MB")
+            print(f"  {name + ' per entry':<40} {size / rows:10.0f} bytes")
+
+
+def loaded_size(filename: str, lazy: bool) -> int:
+    tracemalloc.start()
+    vocab = Vocab(filename, lazy=lazy)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del vocab
+    return size
+
+
+if __name__ == "__main__":
+    main()
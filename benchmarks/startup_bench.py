@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+from functools import partial
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+__ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main() -> None:
+    """Times starting up, from starting Python to the first
+    prompt, with --profile-startup, which quits there, with
+    the caches empty, then with them filled, then lazily,
+    and shows the profile of the last."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"startup, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.path.join(__ROOT, "src"),
+            "XDG_CACHE_HOME": os.path.join(tmp_dir, "cache"),
+        }
+        args = [sys.executable, "nevsjapanesevocab.py", filename, "--profile-startup"]
+        start = partial(
+            subprocess.run,
+            cwd=__ROOT,
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        timed("first prompt, empty caches", partial(start, args))
+        timed("first prompt", partial(start, args), 5)
+        profile = timed("first prompt, lazy", partial(start, [*args, "--lazy"]), 5)
+        report = profile.stdout.split("\n\n")[-1]
+        print("  " + report.strip().replace("\n", "\n  "))
+
+
+if __name__ == "__main__":
+    main()
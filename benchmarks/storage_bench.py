@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+from vocab import Vocab
+
+
+def main() -> None:
+    """Compares loading, searching, changing, and saving,
+    with CSV and SQLite storage."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"storage, {rows} rows")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_filename = os.path.join(tmp_dir, "vocab.csv")
+        db_filename = os.path.join(tmp_dir, "vocab.db")
+        make_vocab_file(csv_filename, rows)
+        vocab = Vocab(csv_filename)
+        vocab.filename = db_filename
+        timed("sqlite import", vocab.save)
+        bench("csv", csv_filename)
+        bench("sqlite", db_filename)
+
+
+def bench(name: str, filename: str) -> None:
+    vocab = timed(f"{name} load", lambda: Vocab(filename))
+    timed(f"{name} search", lambda: vocab.search_page("あ", count=20))
+    kanji = vocab.search_page("list:0100", count=1)[1][0]
+    timed(f"{name} toggle known", lambda: vocab.toggle_known(kanji), 100)
+    timed(f"{name} save", vocab.save)
+
+
+if __name__ == "__main__":
+    main()
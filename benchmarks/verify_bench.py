@@ -0,0 +1,35 @@
+import os
+import sys
+import tempfile
+from functools import partial
+
+from bench_helpers import make_vocab_file
+from bench_helpers import timed
+
+from verify import verify_readings
+from vocab import Vocab
+
+
+def main() -> None:
+    """Times verifying every kanji's reading, in one
+    process, and in more and more processes, up to the
+    number of cores."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cores = os.cpu_count() or 1
+    print(f"verify, {rows} rows, {cores} cores")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "vocab.csv")
+        make_vocab_file(filename, rows)
+        kana_lists = list(Vocab(filename).kana_lists())
+    processes = 1
+    while processes <= max(cores, 2):
+        diffs = timed(
+            f"verify in {processes} processes",
+            partial(verify_readings, kana_lists, processes),
+        )
+        processes *= 2
+    print(f"  {len(diffs)} differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,91 +1,236 @@
 #!/usr/bin/python
-import re
+# pylint: disable=wrong-import-position,wrong-import-order
 import sys
+
+from startup import start_profile
+from startup import startup_report
+from startup import startup_step
+
+# Before anything else is imported, so that importing it is
+# profiled. Modules that are slow to import, pykakasi,
+# Jamdict, and multiprocessing, are imported where they're
+# first used, and aren't imported here.
+if "--profile-startup" in sys.argv:  # pragma: no cover
+    start_profile()
+
+import argparse
+import re
 from dataclasses import dataclass
 from typing import Final
+from typing import NoReturn
+from unicodedata import normalize
 
 from colors import color  # type: ignore
 
+from check import check_vocab
 from commands import CommandStack
+from glosses import GlossIndex
 from localisation import _
 from localisation import set_locale
+from lookups import DeckDictionary
+from lookups import open_deck_dictionary
+from lookups import open_lookup_cache
+from operations import cancel_prefetch_lookups
 from operations import format_help
 from operations import get_operations
+from operations import prefetch_lookups
+from operations import set_lookup_cache
+from query import QUERY_PUNCTUATION
+from query import is_query
+from query import parse_query
+from readings import open_reading_cache
+from rows import format_rows
+from storage import STORAGE_ERRORS
+from validation import valid_string
 from vocab import Vocab
 
+# Public for tests.
+RESULTS_PER_PAGE: Final = 20
+
 
 # Everything in main is tested either by the
 # functionalities' own tests (changing locales, displaying
 # help, load, and save) or in testing user interaction by
 # driving the main_stuff function that main passes off to.
 def main() -> None:  # pragma: no cover
+    startup_step("importing")
     set_locale("ja")
+    args = __parse_args()
     print(color(_("nevs-japanese-vocab-list"), style="bold"))
+    startup_step("setting the locale and parsing arguments")
+
+    vocab_file: Final = args.vocab_file
+    if args.check:
+        __check(vocab_file)
 
-    vocab_file: Final = "vocab.csv"
+    glosses = GlossIndex(GlossIndex.filename_for(vocab_file))
     try:
         print(_("loading") + "...")
-        vocab = Vocab(vocab_file)
-    except OSError as err:
+        vocab = Vocab(
+            vocab_file,
+            lazy=args.lazy,
+            processes=args.processes,
+            readings=open_reading_cache(background=True),
+            find_glossed=glosses.find,
+        )
+    except STORAGE_ERRORS as err:
         print(
-            _("{vocab_file}-failed-to-read-{err}").format(vocab_file=vocab_file, e=err)
+            _("{vocab_file}-failed-to-read-{err}").format(
+                vocab_file=vocab_file, err=err
+            )
         )
         sys.exit(1)
+    startup_step("loading the vocab")
+
+    if args.export is not None:
+        print(_("saving") + "...")
+        vocab.filename = args.export
+        vocab.save()
+        sys.exit(0)
+
+    if args.build_dictionary:
+        print(_("building-the-dictionary") + "...")
+        DeckDictionary(DeckDictionary.filename_for(vocab_file)).build(vocab)
+        sys.exit(0)
+
+    if args.build_glosses:
+        print(_("building-the-glosses") + "...")
+        print(
+            _("added-the-glosses-of-{count}-kanji").format(
+                count=glosses.build(vocab.kana_lists())
+            )
+        )
+        sys.exit(0)
 
+    dictionary = open_deck_dictionary(vocab_file)
+    if dictionary is not None:
+        dictionary.follow(vocab)
+    set_lookup_cache(open_lookup_cache(dictionary, prefetch_size=args.prefetch))
+    startup_step("opening the dictionaries")
     command_stack = CommandStack()
     print(format_help())
+    startup_step("showing help")
+    report = startup_report()
+    if report is not None:
+        print(report)
+        sys.exit(0)
 
-    search: str = ""
-    kanji_found: list[str] = []
+    # The previous search, the kanji found, and whether the
+    # search was exact.
+    previous: tuple[str, list[str], bool] = ("", [], False)
     try:
         while True:
             # This is called by tests.
-            (search, kanji_found) = main_stuff(
-                vocab,
-                command_stack,
-                previous_search=search,
-                previous_kanji_found=kanji_found,
-            )
+            previous = main_stuff(vocab, command_stack, *previous)
     except BaseException:
         print(_("saving") + "...")
         vocab.save()
         raise
 
 
+def __check(vocab_file: str) -> NoReturn:  # pragma: no cover
+    """Prints every problem in the vocab file, and exits
+    with 1 if there are any."""
+    problem_count = 0
+    try:
+        for problem in check_vocab(vocab_file):
+            print(problem)
+            problem_count += 1
+    except STORAGE_ERRORS as err:
+        print(
+            _("{vocab_file}-failed-to-read-{err}").format(
+                vocab_file=vocab_file, err=err
+            )
+        )
+        sys.exit(1)
+    print(
+        _("{count}-problems-found-in-{vocab_file}").format(
+            count=problem_count, vocab_file=vocab_file
+        )
+    )
+    sys.exit(1 if problem_count > 0 else 0)
+
+
+def __parse_args() -> argparse.Namespace:  # pragma: no cover
+    parser = argparse.ArgumentParser(description=_("nevs-japanese-vocab-list"))
+    parser.add_argument(
+        "vocab_file", nargs="?", default="vocab.csv", help=_("help-vocab-file")
+    )
+    parser.add_argument("--export", metavar="FILE", help=_("help-export"))
+    parser.add_argument("--lazy", action="store_true", help=_("help-lazy"))
+    parser.add_argument(
+        "--build-dictionary", action="store_true", help=_("help-build-dictionary")
+    )
+    parser.add_argument(
+        "--build-glosses", action="store_true", help=_("help-build-glosses")
+    )
+    parser.add_argument("--check", action="store_true", help=_("help-check"))
+    parser.add_argument(
+        "--processes", metavar="N", type=int, default=1, help=_("help-processes")
+    )
+    parser.add_argument(
+        "--prefetch", metavar="N", type=int, default=0, help=_("help-prefetch")
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true", help=_("help-profile-startup")
+    )
+    return parser.parse_args()
+
+
 # Called by tests.
 def main_stuff(
     vocab: Vocab,
     command_stack: CommandStack,
     previous_search: str,
     previous_kanji_found: list[str],
-) -> tuple[str, list[str]]:  # search, kanji found.
-    search = "".join(
-        [
-            c if c.isalnum() else " "
-            for c in input(_("search") + ": ")
-            if c.isalnum() or c.isspace()
-        ]
-    ).strip()
+    previous_exact: bool = False,
+) -> tuple[str, list[str], bool]:  # search, kanji found, exact.
+    # Normalized first, so that combining marks, such as a
+    # separate dakuten, are kept.
+    text = normalize("NFC", input(_("search") + ": "))
+    search = __cleaned(text, QUERY_PUNCTUATION)
+    if not is_query(search):
+        # Only queries keep the punctuation that they need,
+        # commands and plain searches don't.
+        search = __cleaned(text, "")
+    # Readings generated while waiting for input are shown by
+    # whatever is shown next.
+    vocab.apply_readings()
     parts = [part for part in search.split(" ") if len(part) > 0]
     exact = False
     if len(parts) == 0:
         search = previous_search
+        exact = previous_exact
+    elif is_query(search):
+        search = " ".join(parts)
+        if parse_query(search) is None:
+            print(_("{search}-is-not-a-valid-search").format(search=search))
+            return previous_search, previous_kanji_found, previous_exact
     else:
         command = parts[0] if len(parts) > 0 else ""
         params = parts[1:] if len(parts) > 1 else []
         params = do_shortcuts(command, params, len(previous_search) > 0)
         if command == "q" and len(params) == 0:
             sys.exit(0)
+        if command == "n" and len(params) == 0 and len(previous_search) > 0:
+            return (
+                previous_search,
+                __show_results(
+                    vocab, previous_search, previous_exact, previous_kanji_found
+                ),
+                previous_exact,
+            )
         operations = get_operations()
         if command in operations:
             operation_descriptor = operations[command]
-            params = replace_indices(
-                vocab,
-                previous_search,
-                previous_kanji_found,
-                params,
-                operation_descriptor.accepts_english_params,
-            )
+            if operation_descriptor.takes_indices:
+                params = replace_indices(
+                    vocab,
+                    previous_search,
+                    previous_kanji_found,
+                    params,
+                    operation_descriptor.accepts_english_params,
+                )
             if operation_descriptor.are_good_params(
                 params
             ) and operation_descriptor.operation_is_valid(command_stack):
@@ -96,51 +241,70 @@ def main_stuff(
                 if result.invalidate_previous_results:
                     previous_kanji_found = []
                 if result.new_search is None:
-                    search = previous_search
-                    return search, previous_kanji_found
+                    return previous_search, previous_kanji_found, previous_exact
                 search = result.new_search
-                exact = True
+                # A query, such as a whole list, is searched
+                # for as any other query is.
+                exact = not is_query(search)
             else:
                 print(operation_descriptor.error_message)
                 search = previous_search
+                exact = previous_exact
         elif len(params) > 0:
             print(_("usage-h-to-show-usage"))
-            return previous_search, previous_kanji_found
+            return previous_search, previous_kanji_found, previous_exact
 
     if search == "":
-        return "", previous_kanji_found
-
-    kanji_found = vocab.search(search, exact)
-    if len(kanji_found) > 0:
-        print(_("found") + f": ({len(kanji_found)})")
-        for kanji_index, kanji in enumerate(kanji_found):
-            out = [
-                color(f"{kanji_index + 1:4d}", fg="grey")
-                + " "
-                + color(vocab.get_list_name(kanji), fg="grey")
-                + " "
-                + kanji
-            ]
-            kana_list = vocab.get_kana(kanji)
-            if len(kana_list) > 0:
-                out.append(
-                    color(
-                        " ".join(
-                            [
-                                f'{color(str(kana_index + 1), fg="grey")} {kana}'
-                                for kana_index, kana in enumerate(kana_list)
-                            ]
-                        ),
-                        fg="grey",
-                    )
-                )
-            if vocab.is_known(kanji):
-                green_tick = color("✓", fg="green")
-                out.append(green_tick)
-            print("  " + " ".join(out))
-    else:
+        return "", previous_kanji_found, False
+
+    return search, __show_results(vocab, search, exact, []), exact
+
+
+def __cleaned(text: str, punctuation: str) -> str:
+    """Input with only letters, numbers, spaces, and the
+    punctuation given, in it."""
+    return "".join(
+        [
+            c if c.isalnum() or c in punctuation else " "
+            for c in text
+            if c.isalnum() or c.isspace() or c in punctuation
+        ]
+    ).strip()
+
+
+def __show_results(
+    vocab: Vocab, search: str, exact: bool, kanji_found: list[str]
+) -> list[str]:
+    """Shows the next page of search results after those
+    already found, and returns all of the kanji found so
+    far, so that indices stay the same from page to page.
+
+    The page is written in one go, because on Termux it is
+    writing to the terminal that is slow, not searching."""
+    start = len(kanji_found)
+    if start == 0:
+        # Whether or not it finds anything, the previous
+        # search's results needn't be looked up any more.
+        cancel_prefetch_lookups()
+    total, page = vocab.search_page(search, exact, start, RESULTS_PER_PAGE)
+    if total == 0:
         print(_("nothing-found"))
-    return search, kanji_found
+        return []
+    if len(page) == 0:
+        print(_("nothing-more-found"))
+        return kanji_found
+    out: list[str] = []
+    if start == 0:
+        out.append(_("found") + f": ({total})")
+    out.extend(format_rows(vocab, page, start))
+    remaining = total - start - len(page)
+    if remaining > 0:
+        out.append(_("{count}-more-n-for-next-page").format(count=remaining))
+    sys.stdout.write("\n".join(out) + "\n")
+    if start == 0:
+        # After the page is shown, so as not to hold it up.
+        prefetch_lookups(page)
+    return kanji_found + page
 
 
 @dataclass
@@ -187,8 +351,10 @@ def replace_indices(
     """Given a set of search results, and command
     parameters that reference kanji and kana by index in
     those results, replace the indices with the kanji and
-    kana. Replace index 0 with the previous search term."""
-    assert all(Vocab.valid_string(kanji) for kanji in kanji_found)
+    kana. Replace index 0 with the previous search term.
+    The search results are those of every page shown so
+    far, so indices on later pages work the same."""
+    assert all(valid_string(kanji) for kanji in kanji_found)
     assert all(kanji in vocab for kanji in kanji_found)
     assert all(len(p) > 0 for p in params)
     kanji = None
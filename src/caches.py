@@ -0,0 +1,142 @@
+import os
+import sqlite3
+from collections.abc import Callable
+from collections.abc import Iterable
+from itertools import count
+from itertools import islice
+from typing import Final
+from typing import TypeVar
+
+Cache = TypeVar("Cache")
+
+# The version of what made each cache's contents, by name.
+__META_SCHEMA: Final = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+
+def user_cache_dir() -> str:
+    """The directory for caches in the user's cache
+    directory, made if it doesn't exist."""
+    cache_dir = os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "nevsjapanesevocab",
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def open_in_cache_dir(
+    filename: str, open_cache: Callable[[str | None], Cache]
+) -> Cache:
+    """A cache opened with its file in the user's cache
+    directory, or in memory, with None, if it can't be
+    opened there."""
+    try:
+        return open_cache(os.path.join(user_cache_dir(), filename))
+    except (OSError, sqlite3.Error):
+        return open_cache(None)
+
+
+def connect_versioned(
+    filename: str | None, schema: str, name: str, version: str, tables: list[str]
+) -> sqlite3.Connection:
+    """Connects to an SQLite cache, on disk, or in memory if
+    no file name is given, which is what tests use, making
+    its tables with a schema. Its tables are emptied when the
+    version of what made their contents, such as pykakasi or
+    Jamdict, given by name, changes, since it might make
+    them differently."""
+    connection = sqlite3.connect(":memory:" if filename is None else filename)
+    with connection:
+        connection.executescript(schema + __META_SCHEMA)
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (name,)
+        ).fetchone()
+        if row is None or row[0] != version:
+            for table in tables:
+                connection.execute(f"DELETE FROM {table}")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, version)
+            )
+    return connection
+
+
+class LruTable:
+    """A table of strings by string keys in an SQLite cache,
+    see connect_versioned(), with a used column, that holds
+    at most max_size of them, forgetting the least recently
+    used first.
+
+    SQLite is only used from the thread that made the cache,
+    so whatever a cache does on a worker thread has to be
+    put in it from that thread."""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        columns: tuple[str, str],  # key, value.
+        max_size: int,
+    ) -> None:
+        assert max_size > 0, max_size
+        self.__connection: sqlite3.Connection = connection
+        self.__table: str = table
+        self.__key: str
+        self.__value: str
+        (self.__key, self.__value) = columns
+        self.__max_size: int = max_size
+        self.__size: int
+        self.__last_used: int
+        (self.__size, self.__last_used) = connection.execute(
+            f"SELECT count(*), coalesce(max(used), 0) FROM {table}"
+        ).fetchone()
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def get(self, key: str) -> str | None:
+        """The value of a key, or None if it isn't there,
+        which is now the most recently used."""
+        self.__last_used += 1
+        with self.__connection:
+            row = self.__connection.execute(
+                f"""
+                UPDATE {self.__table} SET used = ? WHERE {self.__key} = ?
+                RETURNING {self.__value}
+                """,
+                (self.__last_used, key),
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    def put(self, items: Iterable[tuple[str, str]]) -> None:
+        """Adds items, key and value, all in one go, as if
+        they had just been used, keeping at most the first
+        max_size."""
+        used = count(self.__last_used + 1)
+        with self.__connection:
+            self.__connection.executemany(
+                f"INSERT OR REPLACE INTO {self.__table} VALUES (?, ?, ?)",
+                (
+                    (key, value, next(used))
+                    for key, value in islice(items, self.__max_size)
+                ),
+            )
+            self.__last_used = next(used) - 1
+            (self.__size,) = self.__connection.execute(
+                f"SELECT count(*) FROM {self.__table}"
+            ).fetchone()
+            if self.__size > self.__max_size:
+                self.__connection.execute(
+                    f"""
+                    DELETE FROM {self.__table} WHERE {self.__key} IN (
+                        SELECT {self.__key} FROM {self.__table}
+                        ORDER BY used LIMIT ?
+                    )
+                    """,
+                    (self.__size - self.__max_size,),
+                )
+                self.__size = self.__max_size
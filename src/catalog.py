@@ -0,0 +1,350 @@
+# Written by scripts/translate, from the locales' .po files.
+# pylint: disable=line-too-long,too-many-lines
+from typing import Final
+
+CATALOG: Final[dict[str, dict[str, str]]] = {
+    "en": {
+        "added-the-glosses-of-{count}-kanji": "Added the glosses of {count} kanji.",
+        "added-{count}-readings": "Added {count} readings.",
+        "already-known": "already known",
+        "bar": "|",
+        "building-the-dictionary": "Building the dictionary",
+        "building-the-glosses": "Building the glosses",
+        "deleted-{count}-readings": "Deleted {count} readings.",
+        "english": "English",
+        "found": "Found",
+        "help-add-readings": "Add their generated readings to them.",
+        "help-build-dictionary": "Save the dictionary entries of the vocab's words beside it, for faster lookups, and quit.",
+        "help-build-glosses": "Save English glosses of the vocab's kanji beside it, for gloss: searches, and quit.",
+        "help-change-kana": "Change a kana for a kanji.",
+        "help-change-kanji": "Change a kanji.",
+        "help-check": "Check the vocab file, list every problem in it, and quit.",
+        "help-delete-kana": "Delete a kana from a kanji.",
+        "help-delete-kanji": "Delete a kanji.",
+        "help-dictionary-search": "Search the Japanese/English dictionary.",
+        "help-export": "Save the vocab to another file, CSV, or SQLite if it ends in .db, and quit.",
+        "help-info": "Show info, known & learning.",
+        "help-known-or-not?{green_tick}": "Toggle known {green_tick} status.",
+        "help-lazy": "Only read words from the vocab file as they are used, for very big CSV files.",
+        "help-new-kana": "Add a new kana to a kanji.",
+        "help-new-kanji": "Add a new kanji.",
+        "help-next-page": "Show the next page of results.",
+        "help-prefetch": "Look up the first N results of each search in the dictionary in the background, so that l with their index is instant.",
+        "help-processes": "Parse a big CSV vocab file in N processes when loading it.",
+        "help-profile-startup": "Show how long importing each module and each step of starting up take, up to the first prompt, and quit.",
+        "help-quit": "Quit.",
+        "help-redo": "Redo.",
+        "help-save": "Save.",
+        "help-search": "Search.",
+        "help-set-list-known": "Set a whole list known, or unknown with 0.",
+        "help-show-this-help": "Show this help.",
+        "help-undo": "Undo.",
+        "help-verify-readings": "Show kanji whose kana don't include their generated reading.",
+        "help-vocab-file": "The vocab file, CSV, or SQLite if it ends in .db.",
+        "info": "Info",
+        "japanese": "Japanese",
+        "kana": "kana",
+        "kanji": "kanji",
+        "known": "Known",
+        "learning": "Learning",
+        "list": "list",
+        "list-{list_name}-not-found": "List {list_name} not found.",
+        "lists": "lists",
+        "loading": "Loading",
+        "nevs-japanese-vocab-list": "Nev's Japanese Vocab List",
+        "new-kana": "new-kana",
+        "new-kanji": "new-kanji",
+        "nothing-found": "Nothing found.",
+        "nothing-more-found": "Nothing more found.",
+        "saving": "Saving",
+        "search": "Search",
+        "set-{count}-in-list-{list_name}-known": "Set {count} kanji in list {list_name} to known.",
+        "set-{count}-in-list-{list_name}-unknown": "Set {count} kanji in list {list_name} to unknown.",
+        "space": " ",
+        "there-is-nothing-to-redo": "There is nothing to redo.",
+        "there-is-nothing-to-undo": "There is nothing to undo.",
+        "toggled-the-{known_status}-of-{kanji}": "Toggled the status of {kanji} to {known_status}.",
+        "total": "Total",
+        "unknown": "unknown",
+        "usage": "Help",
+        "usage-h-to-show-usage": "Use h to show help.",
+        "verifying-readings": "Verifying readings",
+        "{count}-kanji-without-their-generated-reading": "{count} kanji without their generated reading.",
+        "{count}-more-n-for-next-page": "{count} more, n for the next page.",
+        "{count}-problems-found-in-{vocab_file}": "{count} problems found in {vocab_file}.",
+        "{kana}-added-to-{kanji}": "{kana} has been added to {kanji}.",
+        "{kana}-already-exists-for-{kanji}": "{kana} already exists for {kanji}.",
+        "{kana}-changed-to-{new_kana}-for-{kanji}": "{kana} has been changed to {new_kana} for {kanji}.",
+        "{kana}-deleted-from-{kanji}": "{kana} has been deleted from {kanji}.",
+        "{kana}-not-found-for-{kanji}": "{kana} not found for {kanji}.",
+        "{kanji}-added-to-list-{list_name}": "{kanji} has been added to list {list_name}.",
+        "{kanji}-already-exists": "{kanji} already exists.",
+        "{kanji}-changed-to-{new_kanji}": "{kanji} has been changed to {new_kanji}.",
+        "{kanji}-deleted": "{kanji} deleted.",
+        "{kanji}-has-been-deleted-from-list-{list_name}": "{kanji} has been deleted from list {list_name}.",
+        "{kanji}-not-found": "{kanji} not found.",
+        "{new_kana}-changed-back-to-{kana}-for-{kanji}": "{new_kana} has been changed back to {kana} for {kanji}.",
+        "{new_kanji}-changed-back-to-{kanji}": "{new_kanji} has been changed back to {kanji}.",
+        "{search}-is-not-a-valid-search": "{search} is not a valid search.",
+        "{vocab_file}-failed-to-read-{err}": "Failed to load {vocab_file} - {err}",
+        "{vocab_file}-failed-to-write-{err}": "Failed to save {vocab_file} - {err}",
+    },
+    "es": {
+        "added-the-glosses-of-{count}-kanji": "Las glosas de {count} kanji han sido añadidas.",
+        "added-{count}-readings": "{count} lecturas han sido añadidas.",
+        "already-known": "ya conocido",
+        "bar": "|",
+        "building-the-dictionary": "Construyendo el diccionario",
+        "building-the-glosses": "Construyendo las glosas",
+        "deleted-{count}-readings": "{count} lecturas han sido borradas.",
+        "english": "inglés",
+        "found": "Encontró",
+        "help-add-readings": "Añadirles su lectura generada.",
+        "help-build-dictionary": "Guardar las entradas del diccionario de las palabras del vocabulario junto a él, para buscar más rápido, y salir.",
+        "help-build-glosses": "Guardar glosas en inglés de los kanji del vocabulario junto a él, para búsquedas gloss:, y salir.",
+        "help-change-kana": "Cambiar un kana.",
+        "help-change-kanji": "Cambiar un kanji.",
+        "help-check": "Comprobar el archivo de vocabulario, mostrar todos sus problemas, y salir.",
+        "help-delete-kana": "Borrar un kana.",
+        "help-delete-kanji": "Borrar un kanji.",
+        "help-dictionary-search": "Buscar en el diccionario japonés/inglés.",
+        "help-export": "Guardar el vocabulario en otro archivo, CSV, o SQLite si termina en .db, y salir.",
+        "help-info": "Mostrar la información, conocidos y se apprenden.",
+        "help-known-or-not?{green_tick}": "Cambiar el estado conocido {green_tick}.",
+        "help-lazy": "Leer las palabras del archivo de vocabulario solo cuando se usan, para archivos CSV muy grandes.",
+        "help-new-kana": "Añadir un kana.",
+        "help-new-kanji": "Añadir un kanji.",
+        "help-next-page": "Mostrar la página siguiente de resultados.",
+        "help-prefetch": "Buscar en el diccionario los N primeros resultados de cada búsqueda en segundo plano, para que l con su índice sea instantáneo.",
+        "help-processes": "Analizar un archivo de vocabulario CSV grande en N procesos al cargarlo.",
+        "help-profile-startup": "Mostrar cuánto tardan en importarse los módulos y cada paso del arranque, hasta el primer aviso, y salir.",
+        "help-quit": "Salir.",
+        "help-redo": "Rehacer.",
+        "help-save": "Guardar.",
+        "help-search": "Buscar.",
+        "help-set-list-known": "Marcar toda una lista como conocida, o desconocida con 0.",
+        "help-show-this-help": "Mostrar esta ayuda.",
+        "help-undo": "Deshacer.",
+        "help-verify-readings": "Mostrar los kanji cuyos kana no incluyen su lectura generada.",
+        "help-vocab-file": "El archivo de vocabulario, CSV, o SQLite si termina en .db.",
+        "info": "Información",
+        "japanese": "japonés",
+        "kana": "kana",
+        "kanji": "kanji",
+        "known": "Conocidos",
+        "learning": "Se aprenden",
+        "list": "lista",
+        "list-{list_name}-not-found": "La lista {list_name} no era encontrada.",
+        "lists": "listas",
+        "loading": "Cargando",
+        "nevs-japanese-vocab-list": "La Lista de Vocabulario de Nev",
+        "new-kana": "kana-nuevo",
+        "new-kanji": "kanji-nuevo",
+        "nothing-found": "Nada encontrado.",
+        "nothing-more-found": "No se encontró nada más.",
+        "saving": "Guardando",
+        "search": "Buscar",
+        "set-{count}-in-list-{list_name}-known": "{count} kanji de la lista {list_name} han sido marcados como conocidos.",
+        "set-{count}-in-list-{list_name}-unknown": "{count} kanji de la lista {list_name} han sido marcados como desconocidos.",
+        "space": " ",
+        "there-is-nothing-to-redo": "No hay nada para deshacer.",
+        "there-is-nothing-to-undo": "No hay nada para deshacer.",
+        "toggled-the-{known_status}-of-{kanji}": "El estado de {kanji} ha sido cambiado a {known_status}.",
+        "total": "Total",
+        "unknown": "desconocido",
+        "usage": "Uso",
+        "usage-h-to-show-usage": "Usar h para mostrar el ayuda.",
+        "verifying-readings": "Verificando lecturas",
+        "{count}-kanji-without-their-generated-reading": "{count} kanji sin su lectura generada.",
+        "{count}-more-n-for-next-page": "{count} más, n para la página siguiente.",
+        "{count}-problems-found-in-{vocab_file}": "{count} problemas encontrados en {vocab_file}.",
+        "{kana}-added-to-{kanji}": "{kana} a side añadido a {kanji}.",
+        "{kana}-already-exists-for-{kanji}": "{kana} ya existe por {kanji}.",
+        "{kana}-changed-to-{new_kana}-for-{kanji}": "{new_kana} a sido cambiado a {kana} por {kanji}.",
+        "{kana}-deleted-from-{kanji}": "{kana} a sido borrado de {kanji}.",
+        "{kana}-not-found-for-{kanji}": "{kana} no a sido encontrado por {kanji}.",
+        "{kanji}-added-to-list-{list_name}": "{kanji} a side añadido a la lista {list_name}.",
+        "{kanji}-already-exists": "{kanji} ya existe.",
+        "{kanji}-changed-to-{new_kanji}": "{kanji} a sido cambiado a {new_kanji}.",
+        "{kanji}-deleted": "{kanji} a sido borrado.",
+        "{kanji}-has-been-deleted-from-list-{list_name}": "{kanji} ha side borrado de la lista {list_name}.",
+        "{kanji}-not-found": "{kanji} no era encontrado.",
+        "{new_kana}-changed-back-to-{kana}-for-{kanji}": "{new_kana} a sido cambiado a {kana} por {kanji}.",
+        "{new_kanji}-changed-back-to-{kanji}": "{new_kanji} a side cambiado a {kanji}.",
+        "{search}-is-not-a-valid-search": "{search} no es una búsqueda válida.",
+        "{vocab_file}-failed-to-read-{err}": "Falló de cargar el archivo {vocab_file} - {err}",
+        "{vocab_file}-failed-to-write-{err}": "Falló de guardar el archivo {vocab_file} - {err}",
+    },
+    "fr": {
+        "added-the-glosses-of-{count}-kanji": "Les gloses de {count} kanji ont été ajoutées.",
+        "added-{count}-readings": "{count} lectures ont été ajoutées.",
+        "already-known": "déjà connu",
+        "bar": "|",
+        "building-the-dictionary": "Construction du dictionnaire",
+        "building-the-glosses": "Construction des gloses",
+        "deleted-{count}-readings": "{count} lectures ont été supprimées.",
+        "english": "anglais",
+        "found": "Trouvé",
+        "help-add-readings": "Leur ajouter leur lecture générée.",
+        "help-build-dictionary": "Sauvegarder les entrées du dictionnaire des mots du vocabulaire à côté de lui, pour des recherches plus rapides, et quitter.",
+        "help-build-glosses": "Sauvegarder des gloses anglaises des kanji du vocabulaire à côté de lui, pour les recherches gloss:, et quitter.",
+        "help-change-kana": "Changer un kana.",
+        "help-change-kanji": "Changer un kanji.",
+        "help-check": "Vérifier le fichier de vocabulaire, afficher tous ses problèmes, et quitter.",
+        "help-delete-kana": "Supprimer un kana.",
+        "help-delete-kanji": "Supprimer un kanji.",
+        "help-dictionary-search": "Rechercher dans le dictionnaire japonais/anglais.",
+        "help-export": "Sauvegarder le vocabulaire dans un autre fichier, CSV, ou SQLite s'il se termine par .db, et quitter.",
+        "help-info": "Afficher des informations, connu et pour apprendre.",
+        "help-known-or-not?{green_tick}": "Basculer l'état connu {green_tick}.",
+        "help-lazy": "Ne lire les mots du fichier de vocabulaire qu'au moment où ils sont utilisés, pour les très gros fichiers CSV.",
+        "help-new-kana": "Ajouter un nouveau kana.",
+        "help-new-kanji": "Ajouter un kanji.",
+        "help-next-page": "Afficher la page suivante de résultats.",
+        "help-prefetch": "Rechercher dans le dictionnaire les N premiers résultats de chaque recherche en arrière-plan, pour que l avec leur index soit instantané.",
+        "help-processes": "Analyser un gros fichier de vocabulaire CSV dans N processus au chargement.",
+        "help-profile-startup": "Afficher le temps d'import de chaque module et de chaque étape du démarrage, jusqu'à la première invite, et quitter.",
+        "help-quit": "Quitter.",
+        "help-redo": "Refaire.",
+        "help-save": "Sauvegarder.",
+        "help-search": "Chercher.",
+        "help-set-list-known": "Marquer toute une liste comme connue, ou inconnue avec 0.",
+        "help-show-this-help": "Afficher cet aide.",
+        "help-undo": "Défaire.",
+        "help-verify-readings": "Afficher les kanji sans leur lecture générée.",
+        "help-vocab-file": "Le fichier de vocabulaire, CSV, ou SQLite s'il se termine par .db.",
+        "info": "L'info",
+        "japanese": "japonais",
+        "kana": "kana",
+        "kanji": "kanji",
+        "known": "Connus",
+        "learning": "En train d'être appris",
+        "list": "liste",
+        "list-{list_name}-not-found": "La liste {list_name} n'est pas trouvée.",
+        "lists": "listes",
+        "loading": "Chargement",
+        "nevs-japanese-vocab-list": "Le Liste de Vocabulaire de Nev",
+        "new-kana": "kana-nouveau",
+        "new-kanji": "kanji-nouveau",
+        "nothing-found": "Rien trouvé.",
+        "nothing-more-found": "Rien de plus trouvé.",
+        "saving": "Sauvegarde",
+        "search": "Chercher",
+        "set-{count}-in-list-{list_name}-known": "{count} kanji de la liste {list_name} sont maintenant connus.",
+        "set-{count}-in-list-{list_name}-unknown": "{count} kanji de la liste {list_name} sont maintenant inconnus.",
+        "space": " ",
+        "there-is-nothing-to-redo": "Il n'y a rien a refaire.",
+        "there-is-nothing-to-undo": "Il n'y a rien a défaire.",
+        "toggled-the-{known_status}-of-{kanji}": "Le statut de {kanji} est passé à {known_status}.",
+        "total": "Total",
+        "unknown": "inconnu",
+        "usage": "L'utilisation",
+        "usage-h-to-show-usage": "Utiliser h pour afficher l'aide.",
+        "verifying-readings": "Vérification des lectures",
+        "{count}-kanji-without-their-generated-reading": "{count} kanji sans leur lecture générée.",
+        "{count}-more-n-for-next-page": "{count} de plus, n pour la page suivante.",
+        "{count}-problems-found-in-{vocab_file}": "{count} problèmes trouvés dans {vocab_file}.",
+        "{kana}-added-to-{kanji}": "{kana} a été ajouté à {kanji}.",
+        "{kana}-already-exists-for-{kanji}": "{kana} existe déjà pour {kanji}.",
+        "{kana}-changed-to-{new_kana}-for-{kanji}": "{kana} a été changé en {new_kana} pour {kanji}.",
+        "{kana}-deleted-from-{kanji}": "{kana} a été supprimé de {kanji}.",
+        "{kana}-not-found-for-{kanji}": "{kana} n'est pas trouvé pour {kanji}.",
+        "{kanji}-added-to-list-{list_name}": "{kanji} a été ajouté à la liste {list_name}.",
+        "{kanji}-already-exists": "{kanji} existe déjà.",
+        "{kanji}-changed-to-{new_kanji}": "{kanji} a été changé en {new_kanji}.",
+        "{kanji}-deleted": "{kanji} a été supprimé.",
+        "{kanji}-has-been-deleted-from-list-{list_name}": "{kanji} a été supprimé de la liste {list_name}.",
+        "{kanji}-not-found": "{kanji} n'est pas trouvé.",
+        "{new_kana}-changed-back-to-{kana}-for-{kanji}": "{new_kana} a été changé en {kana} pour {kanji}.",
+        "{new_kanji}-changed-back-to-{kanji}": "{new_kanji} a été changé en {kanji}.",
+        "{search}-is-not-a-valid-search": "{search} n'est pas une recherche valide.",
+        "{vocab_file}-failed-to-read-{err}": "Échec de la lecture du {vocab_file} - {err}",
+        "{vocab_file}-failed-to-write-{err}": "Échec de la sauvegarde du {vocab_file} - {err}",
+    },
+    "ja": {
+        "added-the-glosses-of-{count}-kanji": "{count}個の漢字の英語の意味を追加した。",
+        "added-{count}-readings": "{count}個の読みを追加した。",
+        "already-known": "既知",
+        "bar": "｜",
+        "building-the-dictionary": "辞書を作成中",
+        "building-the-glosses": "英語の意味を作成中",
+        "deleted-{count}-readings": "{count}個の読みを削除した。",
+        "english": "英語",
+        "found": "見つかった",
+        "help-add-readings": "生成された読みを追加する。",
+        "help-build-dictionary": "語彙の単語の辞書項目を語彙の隣に書き込んで終了する。辞書検索が速くなる。",
+        "help-build-glosses": "語彙の漢字の英語の意味を語彙の隣に書き込んで終了する。gloss:検索用。",
+        "help-change-kana": "仮名変更",
+        "help-change-kanji": "漢字変更",
+        "help-check": "語彙ファイルを確認して、全ての問題を表示して終了する。",
+        "help-delete-kana": "仮名削除",
+        "help-delete-kanji": "漢字削除",
+        "help-dictionary-search": "和英辞書で検索する。",
+        "help-export": "語彙を別のファイルに書き込んで終了する。.dbで終わればSQLite、それ以外はCSV。",
+        "help-info": "データ",
+        "help-known-or-not?{green_tick}": "分かったか{green_tick}否かを切り換える。",
+        "help-lazy": "語彙ファイルの単語を使う時だけ読み込む。とても大きいCSVファイル用。",
+        "help-new-kana": "新仮名",
+        "help-new-kanji": "新漢字",
+        "help-next-page": "次のページを表示する。",
+        "help-prefetch": "検索結果の最初のN個を裏で辞書検索して、番号でのlを速くする。",
+        "help-processes": "大きいCSV語彙ファイルをN個のプロセスで読み込む。",
+        "help-profile-startup": "各モジュールのインポートと起動の各段階に最初のプロンプトまでかかる時間を表示して終了する。",
+        "help-quit": "終了",
+        "help-redo": "遣り直す。",
+        "help-save": "書き込む。",
+        "help-search": "検索",
+        "help-set-list-known": "リスト全体を既知にする。0なら未知にする。",
+        "help-show-this-help": "この使い方を表示する。",
+        "help-undo": "元に戻す。",
+        "help-verify-readings": "生成された読みが仮名にない漢字を表示する。",
+        "help-vocab-file": "語彙ファイル。.dbで終わればSQLite、それ以外はCSV。",
+        "info": "データ",
+        "japanese": "日本語",
+        "kana": "仮名",
+        "kanji": "漢字",
+        "known": "分かった",
+        "learning": "学んでいる",
+        "list": "リスト",
+        "list-{list_name}-not-found": "リスト{list_name}は見つからない。",
+        "lists": "リスト",
+        "loading": "読み込み中",
+        "nevs-japanese-vocab-list": "ネフの日本語語彙リスト",
+        "new-kana": "新仮名",
+        "new-kanji": "新漢字",
+        "nothing-found": "何も見つからない。",
+        "nothing-more-found": "これ以上見つからない。",
+        "saving": "読み込み中",
+        "search": "検索",
+        "set-{count}-in-list-{list_name}-known": "リスト{list_name}の{count}個の漢字が既知に変更された。",
+        "set-{count}-in-list-{list_name}-unknown": "リスト{list_name}の{count}個の漢字が未知に変更された。",
+        "space": "　",
+        "there-is-nothing-to-redo": "遣り直すものがない。",
+        "there-is-nothing-to-undo": "元に戻すものがない。",
+        "toggled-the-{known_status}-of-{kanji}": "{kanji}のステータスが{known_status}に変更された。",
+        "total": "合計",
+        "unknown": "未知",
+        "usage": "使い方",
+        "usage-h-to-show-usage": "使い方: h 使い方を表示する。",
+        "verifying-readings": "読みを確認中",
+        "{count}-kanji-without-their-generated-reading": "生成された読みがない漢字は{count}個。",
+        "{count}-more-n-for-next-page": "あと{count}件、nで次のページ。",
+        "{count}-problems-found-in-{vocab_file}": "{vocab_file}に{count}個の問題が見つかった。",
+        "{kana}-added-to-{kanji}": "{kana}は{kanji}に追加した。",
+        "{kana}-already-exists-for-{kanji}": "{kanji}は{kana}が既に有る。",
+        "{kana}-changed-to-{new_kana}-for-{kanji}": "{kanji}は{kana}を{new_kana}に変更した。",
+        "{kana}-deleted-from-{kanji}": "{kana}は{kanji}から削除した。",
+        "{kana}-not-found-for-{kanji}": "{kanji}は{kana}が見つからない。",
+        "{kanji}-added-to-list-{list_name}": "{kanji}はリスト{list_name}に追加した。",
+        "{kanji}-already-exists": "{kanji}は既に有る。",
+        "{kanji}-changed-to-{new_kanji}": "f'{kanji}を{new_kanji}に変更した。",
+        "{kanji}-deleted": "{kanji}は削除した。",
+        "{kanji}-has-been-deleted-from-list-{list_name}": "{kanji}はリスト{list_name}から削除した。",
+        "{kanji}-not-found": "{kanji}は見つからない。",
+        "{new_kana}-changed-back-to-{kana}-for-{kanji}": "{kanji}は{new_kana}を{kana}に戻した。",
+        "{new_kanji}-changed-back-to-{kanji}": "{new_kanji}を{kanji}に戻した。",
+        "{search}-is-not-a-valid-search": "{search}は有効な検索ではない。",
+        "{vocab_file}-failed-to-read-{err}": "{vocab_file}が読み込みに失敗した。{err}",
+        "{vocab_file}-failed-to-write-{err}": "{vocab_file}が書き込みに失敗した。{err}",
+    },
+}
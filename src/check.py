@@ -0,0 +1,85 @@
+# pylint: disable=broad-exception-caught
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing
+from typing import Final
+from unicodedata import normalize
+
+from storage import CsvStorage
+from storage import Row
+from storage import open_storage
+
+# Kanji are written to the table of kanji seen this many at a
+# time.
+__BATCH_ROWS: Final = 10_000
+
+# Every line of a kanji after its first line, with its first
+# line.
+__DUPLICATES: Final = """
+    SELECT line, list_name, kanji, first_line, first_list_name
+    FROM (
+        SELECT line, list_name, kanji,
+            first_value(line) OVER kanji_lines AS first_line,
+            first_value(list_name) OVER kanji_lines AS first_list_name
+        FROM seen
+        WINDOW kanji_lines AS (PARTITION BY kanji ORDER BY line)
+    )
+    WHERE line != first_line
+    ORDER BY line
+"""
+
+
+def check_vocab(filename: str) -> Iterator[str]:
+    """Generates a message for every problem in a vocab
+    file, in one pass through it: format errors, kanji that
+    are in it more than once, of which only the last is
+    kept when it is loaded, and kana that are the same as
+    their kanji, which are left out when it is saved.
+
+    The kanji seen are kept in a temporary SQLite database
+    on disk, rather than in memory, so that a file of
+    millions of lines is checked in bounded memory."""
+    with closing(sqlite3.connect("")) as seen:
+        seen.execute("CREATE TABLE seen (line INTEGER, list_name TEXT, kanji TEXT)")
+        batch: list[tuple[int, str, str]] = []
+        for line_number, row in __rows(filename):
+            if isinstance(row, Exception):
+                yield str(row)
+                continue
+            list_name, kanji, _known, kana_list = row
+            kanji = normalize("NFC", kanji)
+            if any(normalize("NFC", kana) == kanji for kana in kana_list):
+                yield (
+                    f"line {line_number + 1}: kana '{kanji}' "
+                    + "is the same as the kanji."
+                )
+            batch.append((line_number, list_name, kanji))
+            if len(batch) == __BATCH_ROWS:
+                seen.executemany("INSERT INTO seen VALUES (?, ?, ?)", batch)
+                batch.clear()
+        seen.executemany("INSERT INTO seen VALUES (?, ?, ?)", batch)
+        for line_number, list_name, kanji, first_line, first_list_name in seen.execute(
+            __DUPLICATES
+        ):
+            yield (
+                f"line {line_number + 1}: kanji '{kanji}' in list {list_name} "
+                + f"is also on line {first_line + 1} in list {first_list_name}, "
+                + "only the last is kept."
+            )
+
+
+def __rows(filename: str) -> Iterator[tuple[int, Row | Exception]]:
+    """Generates each line's row, or its format error. An
+    SQLite database's constraints keep out format errors,
+    and its line numbers are row numbers."""
+    storage = open_storage(filename)
+    if not isinstance(storage, CsvStorage):
+        yield from enumerate(storage.load())
+        return
+    with open(filename, encoding="utf-8") as f:
+        for line_number, line in enumerate(f):
+            try:
+                yield (line_number, CsvStorage.parse_line(line, line_number))
+            except Exception as err:
+                yield (line_number, err)
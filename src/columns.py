@@ -0,0 +1,332 @@
+import sys
+from array import array
+from bisect import insort
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterable
+from itertools import chain
+from itertools import compress
+from unicodedata import normalize
+
+from storage import MappedCsv
+
+
+class LazyLines:
+    """The lines of a mapped CSV file, see storage.py, that
+    kanji haven't been parsed from yet, by id, and the kanji
+    that have changed since it was mapped, which searching
+    the file has to find as well."""
+
+    def __init__(self, mapped: MappedCsv) -> None:
+        self.__mapped: MappedCsv = mapped
+        self.__unparsed: dict[int, int] = {}  # id.
+        self.__changed: set[int] = set()
+
+    def add(self, kanji_id: int, line_number: int) -> None:
+        self.__unparsed[kanji_id] = line_number
+
+    def parse(self, kanji_id: int) -> tuple[bool, tuple[str, ...]] | None:
+        """The known status and kana of a kanji, parsed from
+        its line, or None if it has already been parsed."""
+        if len(self.__unparsed) == 0 or kanji_id not in self.__unparsed:
+            return None
+        _list_name, _kanji, known, kana_list = self.__mapped.row(
+            self.__unparsed.pop(kanji_id)
+        )
+        return known, tuple(sorted(normalize("NFC", kana) for kana in kana_list))
+
+    def unparsed(self) -> list[int]:
+        return list(self.__unparsed)
+
+    def forget(self, kanji_id: int) -> None:
+        self.__unparsed.pop(kanji_id, None)
+
+    def changed(self, kanji_id: int) -> None:
+        self.__changed.add(kanji_id)
+
+    def find(self, s: str, ids: dict[str, int]) -> Iterable[int]:
+        """The ids of the kanji whose lines contain a string,
+        and of every kanji that has changed, which might now
+        contain it, once each, and -1 for the lines of kanji
+        that have since been changed or deleted."""
+        return dict.fromkeys(
+            chain(
+                (
+                    ids.get(self.__mapped.kanji(line), -1)
+                    for line in self.__mapped.find(s)
+                ),
+                self.__changed,
+            )
+        )
+
+    def close(self) -> None:
+        self.__mapped.close()
+
+
+class Columns:
+    """A vocab's kanji, their kana, and their known status,
+    in columns indexed by id, see vocab.py. Once an id's
+    kanji is deleted its kanji and kana are None, and it is
+    unknown. Known status is kept in an array, so that
+    filtering it runs a column at a time, and the number of
+    known kanji is kept as it changes.
+
+    Lazy, each kanji's known status and kana are parsed from
+    its line in the mapped file the first time that either
+    is used."""
+
+    def __init__(self, mapped: MappedCsv | None = None) -> None:
+        self.__ids: dict[str, int] = {}  # kanji.
+        self.__kanji: list[str | None] = []
+        self.__kana: list[tuple[str, ...] | None] = []
+        self.__known: bytearray = bytearray()  # 1 for known.
+        self.__known_count: int = 0
+        self.__lazy: LazyLines | None = None if mapped is None else LazyLines(mapped)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    @property
+    def deleted_count(self) -> int:
+        """The number of ids of kanji that are deleted."""
+        return len(self.__kanji) - len(self.__ids)
+
+    def __contains__(self, kanji: str) -> bool:
+        return kanji in self.__ids
+
+    @property
+    def lazy(self) -> bool:
+        return self.__lazy is not None
+
+    def get_id(self, kanji: str) -> int | None:
+        return self.__ids.get(kanji)
+
+    def ids(self) -> Iterable[int]:
+        """The ids of every kanji that isn't deleted."""
+        return self.__ids.values()
+
+    def is_deleted(self, kanji_id: int) -> bool:
+        return self.__kanji[kanji_id] is None
+
+    def kanji_of(self, kanji_id: int) -> str:
+        kanji = self.__kanji[kanji_id]
+        assert kanji is not None, kanji_id
+        return kanji
+
+    def kana_of(self, kanji_id: int) -> tuple[str, ...]:
+        kana = self.__kana[self.__parsed(kanji_id)]
+        assert kana is not None, kanji_id
+        return kana
+
+    def known_of(self, kanji_id: int) -> bool:
+        return self.__known[self.__parsed(kanji_id)] == 1
+
+    @property
+    def known(self) -> bytearray:
+        """The known column, 1 for known, which is only
+        whole once everything has been parsed."""
+        return self.__known
+
+    @property
+    def known_count(self) -> int:
+        """The number of known kanji, of those parsed."""
+        return self.__known_count
+
+    def add(self, kanji: str, known: bool, kana: tuple[str, ...]) -> int:
+        """Adds a kanji, and returns its id."""
+        kanji_id = len(self.__kanji)
+        self.__ids[kanji] = kanji_id
+        self.__kanji.append(kanji)
+        self.__kana.append(kana)
+        self.__known.append(known)
+        self.__known_count += known
+        return kanji_id
+
+    def set(self, kanji_id: int, known: bool, kana: tuple[str, ...]) -> None:
+        """Replaces a kanji's known status and kana, as they
+        are loaded."""
+        self.__known_count += known - self.__known[kanji_id]
+        self.__known[kanji_id] = known
+        self.__kana[kanji_id] = kana
+
+    def set_kana(self, kanji_id: int, kana: tuple[str, ...]) -> None:
+        self.__kana[self.__parsed(kanji_id)] = kana
+
+    def set_known(self, kanji_id: int, known: bool) -> None:
+        self.__known_count += known - self.__known[self.__parsed(kanji_id)]
+        self.__known[kanji_id] = known
+
+    def rename(self, kanji_id: int, new_kanji: str) -> None:
+        del self.__ids[self.kanji_of(kanji_id)]
+        self.__ids[new_kanji] = kanji_id
+        self.__kanji[kanji_id] = new_kanji
+
+    def delete(self, kanji_id: int) -> None:
+        del self.__ids[self.kanji_of(kanji_id)]
+        self.__kanji[kanji_id] = None
+        self.__kana[kanji_id] = None
+        self.__known_count -= self.__known[kanji_id]
+        self.__known[kanji_id] = False
+        if self.__lazy is not None:
+            self.__lazy.forget(kanji_id)
+
+    def map_line(self, kanji_id: int, line_number: int, normalized: bool) -> None:
+        """The rest of a kanji is parsed from a line of the
+        mapped file the first time it's used, or now if the
+        line isn't NFC normalized, in which case it's
+        searched for as if it had changed."""
+        assert self.__lazy is not None, kanji_id
+        self.__lazy.add(kanji_id, line_number)
+        if not normalized:
+            self.changed(self.__parsed(kanji_id))
+
+    def changed(self, kanji_id: int) -> None:
+        if self.__lazy is not None:
+            self.__lazy.changed(kanji_id)
+
+    def find(self, s: str) -> list[int]:
+        """The kanji whose lines in the mapped file contain a
+        string, and every kanji that has changed since it was
+        mapped, which might now contain it."""
+        assert self.__lazy is not None, s
+        return [
+            kanji_id
+            for kanji_id in self.__lazy.find(s, self.__ids)
+            if kanji_id != -1 and self.__kanji[kanji_id] is not None
+        ]
+
+    def parse_all(self) -> None:
+        """Parses everything that hasn't been, and stops being
+        lazy."""
+        if self.__lazy is None:
+            return
+        for kanji_id in self.__lazy.unparsed():
+            self.__parsed(kanji_id)
+        self.__lazy.close()
+        self.__lazy = None
+
+    def compact(self) -> list[int]:
+        """Drops the ids of deleted kanji, keeping the rest in
+        order, and returns the new id of each old id, -1 for
+        those dropped. Everything has to have been parsed."""
+        assert self.__lazy is None
+        new_ids: list[int] = []
+        kept = 0
+        for kanji in self.__kanji:
+            new_ids.append(-1 if kanji is None else kept)
+            kept += kanji is not None
+        self.__known = bytearray(
+            known for known, new_id in zip(self.__known, new_ids) if new_id != -1
+        )
+        self.__kana = [kana for kana in self.__kana if kana is not None]
+        self.__kanji = [kanji for kanji in self.__kanji if kanji is not None]
+        self.__ids = {
+            kanji: new_ids[kanji_id] for kanji, kanji_id in self.__ids.items()
+        }
+        return new_ids
+
+    def __parsed(self, kanji_id: int) -> int:
+        """Parses a kanji if it hasn't been, and returns its
+        id."""
+        if self.__lazy is not None:
+            parsed = self.__lazy.parse(kanji_id)
+            if parsed is not None:
+                self.set(kanji_id, *parsed)
+        return kanji_id
+
+
+class Lists:
+    """Which list each kanji is in, by id, and the ids of
+    each list's kanji, in kanji order, which is the order
+    that they are saved in, kept as they change, so that
+    saving doesn't sort anything."""
+
+    def __init__(self) -> None:
+        self.__lists: "array[int]" = array("i")  # id, list number, -1 for none.
+        self.__names: list[str] = []  # list number.
+        self.__numbers: dict[str, int] = {}  # list name.
+        self.__ids: dict[str, "array[int]"] = {}  # list name, ids in kanji order.
+        self.__sorted_names: list[str] = []
+
+    def name_of(self, kanji_id: int) -> str:
+        return self.__names[self.__lists[kanji_id]]
+
+    def ids(self, list_name: str) -> "array[int]":
+        """The ids of a list's kanji, in kanji order, none if
+        there is no such list."""
+        return self.__ids.get(list_name, array("i"))
+
+    def sorted_names(self) -> list[str]:
+        return self.__sorted_names
+
+    def last_name(self) -> str:
+        return self.__sorted_names[-1]
+
+    def in_range(self, first: int, last: int) -> list["array[int]"]:
+        """The ids of the kanji of each list numbered from
+        first to last."""
+        return [
+            ids
+            for list_name, ids in self.__ids.items()
+            if first <= int(list_name) <= last
+        ]
+
+    def add(self, list_name: str) -> int:
+        """Adds a list, if it isn't there, and returns its
+        number."""
+        if list_name not in self.__numbers:
+            list_name = sys.intern(list_name)
+            self.__numbers[list_name] = len(self.__names)
+            self.__names.append(list_name)
+            self.__ids[list_name] = array("i")
+            insort(self.__sorted_names, list_name)
+        return self.__numbers[list_name]
+
+    def put(self, kanji_id: int, list_name: str, key: Callable[[int], str]) -> None:
+        """Puts a kanji in a list, taking it out of the one
+        it was in, in order of key, its kanji. Files are
+        saved in that order, so loading one appends."""
+        self.remove(kanji_id)
+        self.__lists[kanji_id] = self.add(list_name)
+        ids = self.__ids[list_name]
+        if len(ids) == 0 or key(ids[-1]) < key(kanji_id):
+            ids.append(kanji_id)
+        else:
+            insort(ids, kanji_id, key=key)
+
+    def remove(self, kanji_id: int) -> None:
+        """Takes a kanji out of its list, if it's in one."""
+        if kanji_id >= len(self.__lists):
+            self.__lists.extend([-1] * (kanji_id + 1 - len(self.__lists)))
+        elif self.__lists[kanji_id] != -1:
+            self.__ids[self.name_of(kanji_id)].remove(kanji_id)
+            self.__lists[kanji_id] = -1
+
+    def compact(self, new_ids: list[int]) -> None:
+        """Gives kanji the new ids that Columns.compact()
+        returned."""
+        self.__lists = array(
+            "i",
+            (
+                list_number
+                for list_number, new_id in zip(self.__lists, new_ids)
+                if new_id != -1
+            ),
+        )
+        for ids in self.__ids.values():
+            ids[:] = array("i", (new_ids[kanji_id] for kanji_id in ids))
+
+    def info(self, known: bytearray) -> dict[str, tuple[int, int]]:
+        """Returns (known, learning) counts for each list
+        that has kanji in it, in list name order, given the
+        known column."""
+        totals = Counter(self.__lists)
+        known_totals = Counter(compress(self.__lists, known))
+        return {
+            list_name: (
+                known_totals[list_number],
+                totals[list_number] - known_totals[list_number],
+            )
+            for list_name in self.__sorted_names
+            if totals[list_number := self.__numbers[list_name]] > 0
+        }
@@ -121,8 +121,8 @@ class DeleteCommand(Command):
 
     def undo(self) -> str:
         self.vocab.add(self.__kanji, self.__list_name)
-        self.vocab.set_known(self.__kanji, self.__known)
-        self.vocab.replace_all_kana(self.__kanji, self.__kana)
+        self.vocab.set_known([self.__kanji], self.__known)
+        self.vocab.replace_all_kana([(self.__kanji, self.__kana)])
         return super().undo()
 
     def redo(self) -> str:
@@ -173,17 +173,16 @@ class AddKanaCommand(Command):
         Command.__init__(self, vocab)
         self.__kanji: str = kanji
         self.__kana: str = kana
-        self.__index: int = -1
 
     def do(self) -> None:
-        self.__index = self.vocab.add_kana(self.__kanji, self.__kana)
+        self.vocab.add_kana(self.__kanji, self.__kana)
 
     def undo(self) -> str:
         self.vocab.delete_kana(self.__kanji, self.__kana)
         return super().undo()
 
     def redo(self) -> str:
-        self.vocab.add_kana(self.__kanji, self.__kana, self.__index)
+        self.vocab.add_kana(self.__kanji, self.__kana)
         return super().redo()
 
     def _undone_message(self) -> str:
@@ -229,13 +228,12 @@ class DeleteKanaCommand(Command):
         Command.__init__(self, vocab)
         self.__kanji: str = kanji
         self.__kana: str = kana
-        self.__index: int = -1
 
     def do(self) -> None:
-        self.__index = self.vocab.delete_kana(self.__kanji, self.__kana)
+        self.vocab.delete_kana(self.__kanji, self.__kana)
 
     def undo(self) -> str:
-        self.vocab.add_kana(self.__kanji, self.__kana, self.__index)
+        self.vocab.add_kana(self.__kanji, self.__kana)
         return super().undo()
 
     def redo(self) -> str:
@@ -261,11 +259,11 @@ class ToggleKnownCommand(Command):
         self.redo()
 
     def undo(self) -> str:
-        self.vocab.set_known(self.__kanji, self.__known)
+        self.vocab.set_known([self.__kanji], self.__known)
         return super().undo()
 
     def redo(self) -> str:
-        self.vocab.set_known(self.__kanji, not self.__known)
+        self.vocab.set_known([self.__kanji], not self.__known)
         return super().redo()
 
     def _undone_message(self) -> str:
@@ -284,3 +282,73 @@ class ToggleKnownCommand(Command):
         return _("toggled-the-{known_status}-of-{kanji}").format(
             kanji=self.__kanji, known_status=known_status
         )
+
+
+class SetListKnownCommand(Command):
+    def __init__(self, vocab: Vocab, list_name: str, known: bool) -> None:
+        Command.__init__(self, vocab)
+        self.__list_name: str = list_name
+        self.__known: bool = known
+        self.__kanji: list[str] = []
+
+    def do(self) -> None:
+        self.__kanji = self.vocab.set_list_known(self.__list_name, self.__known)
+
+    def undo(self) -> str:
+        self.vocab.set_known(self.__kanji, not self.__known)
+        return super().undo()
+
+    def redo(self) -> str:
+        self.vocab.set_known(self.__kanji, self.__known)
+        return super().redo()
+
+    def _undone_message(self) -> str:
+        return self.__message(False)
+
+    def _redone_message(self) -> str:
+        return self.__message(True)
+
+    def __message(self, redo: bool) -> str:
+        return (
+            _("set-{count}-in-list-{list_name}-known")
+            if redo == self.__known
+            else _("set-{count}-in-list-{list_name}-unknown")
+        ).format(count=len(self.__kanji), list_name=self.__list_name)
+
+
+class AddReadingsCommand(Command):
+    """Adds generated readings to the kana of many kanji,
+    as one command, to be undone and redone as one."""
+
+    def __init__(self, vocab: Vocab, readings: list[tuple[str, str]]) -> None:
+        Command.__init__(self, vocab)
+        self.__readings: list[tuple[str, str]] = readings  # kanji, reading.
+        # The kana from before, to be put back.
+        self.__kana_lists: list[tuple[str, list[str]]] = []  # kanji, kana.
+
+    def do(self) -> None:
+        self.__kana_lists = [
+            (kanji, self.vocab.get_kana(kanji)) for kanji, _reading in self.__readings
+        ]
+        self.vocab.replace_all_kana(
+            [
+                (kanji, [*kana_list, reading])
+                for (kanji, kana_list), (_kanji, reading) in zip(
+                    self.__kana_lists, self.__readings
+                )
+            ]
+        )
+
+    def undo(self) -> str:
+        self.vocab.replace_all_kana(self.__kana_lists)
+        return super().undo()
+
+    def redo(self) -> str:
+        self.do()
+        return super().redo()
+
+    def _undone_message(self) -> str:
+        return _("deleted-{count}-readings").format(count=len(self.__readings))
+
+    def _redone_message(self) -> str:
+        return _("added-{count}-readings").format(count=len(self.__readings))
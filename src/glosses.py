@@ -0,0 +1,159 @@
+import os
+import sqlite3
+from collections.abc import Iterable
+from itertools import groupby
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Final
+
+from caches import connect_versioned
+from lookups import data_version
+from lookups import find_entries
+from lookups import new_jamdict
+from query import gloss_words
+
+if TYPE_CHECKING:
+    from jamdict import Jamdict  # type: ignore
+
+# The most glosses kept for a kanji, its first ones, which
+# are its most common meanings.
+GLOSSES_PER_KANJI: Final = 5
+
+
+class GlossIndex:
+    """Short English glosses of a deck's kanji, from JMdict,
+    in an SQLite file beside its vocab file, with an index
+    of the words in them, so that gloss: searches find the
+    kanji that mean something through the index, rather
+    than by reading every gloss.
+
+    A kanji's glosses are those of the first entry that it
+    finds in Jamdict, preferring the first that has one of
+    its kana. Kanji that find nothing are kept, with no
+    glosses, so that they are only looked up once. It is
+    emptied when the version of Jamdict or its data changes,
+    see caches.py, and has to be built again.
+
+    The file is only opened the first time that it is
+    used, so that it doesn't slow down starting."""
+
+    __SCHEMA: Final = """
+        CREATE TABLE IF NOT EXISTS glosses (
+            kanji TEXT PRIMARY KEY,
+            glosses TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS words (
+            word TEXT NOT NULL,
+            kanji TEXT NOT NULL,
+            PRIMARY KEY (word, kanji)
+        ) WITHOUT ROWID;
+    """
+
+    # Kanji are looked up in Jamdict this many at a time.
+    __BATCH_KANJI: Final = 5_000
+
+    def __init__(self, filename: str) -> None:
+        self.__filename: str = filename
+        self.__connection: sqlite3.Connection | None = None
+
+    # Public for tests.
+    @staticmethod
+    def filename_for(vocab_file: str) -> str:
+        """The deck's glosses are beside its vocab file,
+        vocab-glosses.db for vocab.csv."""
+        return os.path.splitext(vocab_file)[0] + "-glosses.db"
+
+    def __connected(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = connect_versioned(
+                self.__filename,
+                GlossIndex.__SCHEMA,
+                "jamdict",
+                data_version(),
+                ["glosses", "words"],
+            )
+        return self.__connection
+
+    def find(self, words: list[str]) -> set[str]:
+        """The kanji whose glosses have every word, none if
+        the glosses haven't been built."""
+        assert len(words) > 0, words
+        if self.__connection is None and not os.path.exists(self.__filename):
+            return set()
+        return {
+            str(kanji)
+            for (kanji,) in self.__connected().execute(
+                " INTERSECT ".join(
+                    ["SELECT kanji FROM words WHERE word = ?"] * len(words)
+                ),
+                words,
+            )
+        }
+
+    def build(self, kana_lists: Iterable[tuple[str, list[str]]]) -> int:
+        """Adds the glosses of kanji that don't have them
+        yet, given with their kana, and returns how many
+        were added."""
+        kana_lists = iter(kana_lists)
+        added = 0
+        jamdict = new_jamdict()
+        while batch := dict(islice(kana_lists, GlossIndex.__BATCH_KANJI)):
+            added += self.__build(jamdict, batch)
+        return added
+
+    def __build(self, jamdict: "Jamdict", kana_lists: dict[str, list[str]]) -> int:
+        connection = self.__connected()
+        marks = ",".join("?" * len(kana_lists))
+        for (kanji,) in connection.execute(
+            f"SELECT kanji FROM glosses WHERE kanji IN ({marks})", list(kana_lists)
+        ):
+            del kana_lists[kanji]
+        if len(kana_lists) == 0:
+            return 0
+        with jamdict.jmdict.ctx() as ctx:
+            found = sorted(find_entries(ctx.conn, list(kana_lists)))
+            idseqs = list({idseq for _kanji, _position, idseq in found})
+            marks = ",".join("?" * len(idseqs))
+            entry_kana: dict[int, set[str]] = {}
+            for idseq, kana in ctx.conn.execute(
+                f"SELECT idseq, text FROM Kana WHERE idseq IN ({marks})", idseqs
+            ):
+                entry_kana.setdefault(idseq, set()).add(kana)
+            entry_glosses: dict[int, list[str]] = {}
+            for idseq, gloss in ctx.conn.execute(
+                f"""
+                SELECT s.idseq, g.text
+                FROM Sense AS s JOIN SenseGloss AS g ON g.sid = s.ID
+                WHERE s.idseq IN ({marks}) AND g.lang = 'eng'
+                ORDER BY s.ID, g.rowid
+                """,
+                idseqs,
+            ):
+                glosses = entry_glosses.setdefault(idseq, [])
+                if len(glosses) < GLOSSES_PER_KANJI and gloss not in glosses:
+                    glosses.append(gloss)
+        glosses_of = dict.fromkeys(kana_lists, "")
+        for kanji, entries in groupby(found, key=lambda entry: entry[0]):
+            idseqs = [idseq for _kanji, _position, idseq in entries]
+            idseq = next(
+                (
+                    idseq
+                    for idseq in idseqs
+                    if not entry_kana.get(idseq, set()).isdisjoint(kana_lists[kanji])
+                ),
+                idseqs[0],
+            )
+            glosses_of[kanji] = "/".join(entry_glosses.get(idseq, []))
+        with connection:
+            connection.executemany(
+                "INSERT INTO glosses VALUES (?, ?)", glosses_of.items()
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO words VALUES (?, ?)",
+                (
+                    (word, kanji)
+                    for kanji, glosses in glosses_of.items()
+                    for word in gloss_words(glosses)
+                ),
+            )
+        return len(glosses_of)
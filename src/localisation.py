@@ -1,6 +1,4 @@
 from collections.abc import Callable
-from gettext import NullTranslations
-from gettext import translation
 
 GetText = Callable[[str], str]
 
@@ -16,10 +14,21 @@ def _(s: str) -> str:
     return __(s)
 
 
+class Translations(dict[str, str]):
+    """A locale's translations, by message, in which a
+    message that isn't translated is itself, so that
+    translating is only looking it up."""
+
+    def __missing__(self, message: str) -> str:
+        return message
+
+
 # pylint: disable=invalid-name
 __locale = None
 
-__translations: dict[str, NullTranslations] = {}  # locale.
+# Made from catalog.py the first time each locale is set, so
+# that setting it again is only a dict lookup.
+__translations: dict[str, Translations] = {}  # locale.
 
 
 def get_locale() -> str | None:
@@ -31,14 +40,21 @@ def set_locale(locale: str) -> None:
     global __locale
     __locale = locale
     if __locale not in __translations:
-        __translations[__locale] = translation(
-            "messages", localedir="locales", languages=[__locale]
-        )
+        # Imported the first time it's needed, it has every
+        # locale's translations.
+        # pylint: disable=import-outside-toplevel
+        from catalog import CATALOG
+
+        __translations[__locale] = Translations(CATALOG[__locale])
     # pylint: disable=global-statement
     global __
-    __ = __translations[__locale].gettext
+    __ = __translations[__locale].__getitem__
 
 
 def unset_locale() -> None:
+    # pylint: disable=global-statement
+    global __locale
     __locale = None
+    # pylint: disable=global-statement
+    global __
     __ = __no_locale
@@ -0,0 +1,466 @@
+import os
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
+
+from caches import LruTable
+from caches import connect_versioned
+from caches import open_in_cache_dir
+from vocab import Vocab
+
+if TYPE_CHECKING:
+    from jamdict import Jamdict  # type: ignore
+
+DEFAULT_MAX_SIZE: Final = 10_000
+DEFAULT_MEMORY_SIZE: Final = 64
+
+
+def data_version() -> str:
+    """The versions of Jamdict and of its data, which are
+    read from the installed packages' metadata, so that
+    getting them doesn't import Jamdict."""
+    versions = []
+    for package in ["jamdict", "jamdict-data"]:
+        try:
+            versions.append(version(package))
+        except PackageNotFoundError:
+            versions.append("")
+    return " ".join(versions)
+
+
+def new_jamdict(**kwargs: Any) -> "Jamdict":
+    """A Jamdict, importing Jamdict the first time it's
+    needed, since importing it takes a good part of starting
+    up."""
+    # pylint: disable=import-outside-toplevel
+    from jamdict import Jamdict
+
+    return Jamdict(**kwargs)
+
+
+def find_entries(
+    jmdict: sqlite3.Connection, words: list[str]
+) -> list[tuple[str, int, int]]:
+    """The entries that words find as kanji or kana in
+    Jamdict's database, as word, the entry's position in it,
+    and its id, the same entries that Jamdict's lookup finds
+    for them, except in English meanings."""
+    marks = ",".join("?" * len(words))
+    return [
+        (str(word), int(position), int(idseq))
+        for table in ["Kanji", "Kana"]
+        for word, position, idseq in jmdict.execute(
+            f"""
+            SELECT w.text, e.rowid, e.idseq
+            FROM {table} AS w JOIN Entry AS e ON e.idseq = w.idseq
+            WHERE w.text IN ({marks})
+            """,
+            words,
+        )
+    ]
+
+
+class DeckDictionary:
+    """The Jamdict entries of the words in a deck, its kanji
+    and kana, in a small SQLite database, so that looking
+    them up doesn't use Jamdict's whole database, which is
+    big in memory and slow on a phone. Words that aren't in
+    it are looked up in Jamdict.
+
+    Entries are kept once, as the text that is shown for
+    them, with the words that find them. Words that find
+    nothing are kept too, so that they aren't looked up in
+    Jamdict either. It is emptied when the version of
+    Jamdict or its data changes, see caches.py, and has to
+    be built again.
+
+    Looking up a word in it finds the same entries as
+    Jamdict finds, in the same order, except for words that
+    are also in an English meaning."""
+
+    __SCHEMA: Final = """
+        CREATE TABLE IF NOT EXISTS entries (
+            idseq INTEGER PRIMARY KEY,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS words (
+            word TEXT NOT NULL,
+            idseq INTEGER NOT NULL,
+            PRIMARY KEY (word, idseq)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS indexed (
+            word TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+    """
+
+    # Words are indexed from Jamdict this many at a time.
+    __BATCH_WORDS: Final = 5_000
+
+    def __init__(self, filename: str) -> None:
+        self.__connection: sqlite3.Connection = connect_versioned(
+            filename,
+            DeckDictionary.__SCHEMA,
+            "jamdict",
+            data_version(),
+            ["entries", "words", "indexed"],
+        )
+        # Made the first time a word is indexed.
+        self.__jamdict: "Jamdict | None" = None
+        # The vocab followed, and its kanji whose words have
+        # changed since they were last indexed.
+        self.__vocab: Vocab | None = None
+        self.__changed: dict[str, None] = {}  # kanji.
+
+    # Public for tests.
+    @staticmethod
+    def filename_for(vocab_file: str) -> str:
+        """The deck's dictionary is beside its vocab file,
+        vocab-dictionary.db for vocab.csv."""
+        return os.path.splitext(vocab_file)[0] + "-dictionary.db"
+
+    def clear(self) -> None:
+        with self.__connection:
+            for table in ["entries", "words", "indexed"]:
+                self.__connection.execute(f"DELETE FROM {table}")
+
+    def look_up(self, word: str, index: bool = True) -> list[str] | None:
+        """The text of each entry found for a word, which is
+        empty if nothing was found, or None if the word
+        isn't in the deck's dictionary. Kanji that have
+        changed are indexed first, if the word isn't, unless
+        index is false, since that needs Jamdict."""
+        if not self.__indexed(word):
+            if not index:
+                return None
+            self.__index_changed()
+            if not self.__indexed(word):
+                return None
+        return [
+            str(text)
+            for (text,) in self.__connection.execute(
+                """
+                SELECT text FROM words JOIN entries USING (idseq)
+                WHERE word = ? ORDER BY position
+                """,
+                (word,),
+            )
+        ]
+
+    def __indexed(self, word: str) -> bool:
+        return (
+            self.__connection.execute(
+                "SELECT 1 FROM indexed WHERE word = ?", (word,)
+            ).fetchone()
+            is not None
+        )
+
+    def build(self, vocab: Vocab) -> None:
+        """Indexes every kanji and kana in a vocab, from
+        scratch."""
+        self.clear()
+        self.add(
+            word
+            for kanji, kana_list in vocab.kana_lists()
+            for word in [kanji, *kana_list]
+        )
+
+    def follow(self, vocab: Vocab) -> None:
+        """Indexes kanji and kana as they are added to a
+        vocab, or changed in it. They are only noted as they
+        change, and indexed the next time that a word that
+        isn't indexed is looked up, which would need Jamdict
+        anyway, so that changing the vocab doesn't wait for
+        Jamdict, and changes to known status are ignored."""
+        self.__vocab = vocab
+
+        def changed(kanji_list: list[str], words: bool) -> None:
+            if words:
+                self.__changed.update(dict.fromkeys(kanji_list))
+
+        vocab.add_change_listener(changed)
+
+    def __index_changed(self) -> None:
+        vocab = self.__vocab
+        if vocab is None or len(self.__changed) == 0:
+            return
+        changed = list(self.__changed)
+        self.__changed.clear()
+        self.add(
+            word
+            for kanji in changed
+            if kanji in vocab
+            for word in [kanji, *vocab.get_kana(kanji)]
+        )
+
+    def add(self, words: Iterable[str]) -> None:
+        """Indexes words that aren't indexed yet, looking
+        them up in Jamdict's database a batch at a time."""
+        batch: list[str] = []
+        for word in words:
+            batch.append(word)
+            if len(batch) == DeckDictionary.__BATCH_WORDS:
+                self.__add(batch)
+                batch.clear()
+        self.__add(batch)
+
+    def __add(self, words: list[str]) -> None:
+        marks = ",".join("?" * len(words))
+        with self.__connection:
+            indexed = {
+                word
+                for (word,) in self.__connection.execute(
+                    f"SELECT word FROM indexed WHERE word IN ({marks})", words
+                )
+            }
+            new_words = sorted(set(words) - indexed)
+            if len(new_words) == 0:
+                return
+            if self.__jamdict is None:
+                self.__jamdict = new_jamdict()
+            jmdict = self.__jamdict.jmdict
+            with jmdict.ctx() as ctx:
+                found = find_entries(ctx.conn, new_words)
+                entries = {idseq: position for _word, position, idseq in found}
+                marks = ",".join("?" * len(entries))
+                for (idseq,) in self.__connection.execute(
+                    f"SELECT idseq FROM entries WHERE idseq IN ({marks})",
+                    list(entries),
+                ):
+                    del entries[idseq]
+                self.__connection.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?)",
+                    (
+                        (idseq, position, jmdict.get_entry(idseq, ctx=ctx).text(True))
+                        for idseq, position in entries.items()
+                    ),
+                )
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO words VALUES (?, ?)",
+                ((word, idseq) for word, _position, idseq in found),
+            )
+            self.__connection.executemany(
+                "INSERT INTO indexed VALUES (?)", ((word,) for word in new_words)
+            )
+
+
+class Jamdicts:
+    """Looks up searches in Jamdict, on the calling thread,
+    or ahead of time, up to prefetch_size at a time, one at a
+    time, on a worker thread, with its own Jamdict. Each
+    Jamdict is made the first time it's needed."""
+
+    def __init__(self, prefetch_size: int = 0) -> None:
+        assert prefetch_size >= 0, prefetch_size
+        self.__prefetch_size: int = prefetch_size
+        self.__jamdict: "Jamdict | None" = None
+        # The worker thread's Jamdict is only used by it.
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__worker_jamdict: "Jamdict | None" = None
+        self.__prefetching: dict[str, Future[list[str]]] = {}  # search.
+
+    @property
+    def prefetch_size(self) -> int:
+        return self.__prefetch_size
+
+    def prefetching(self, search: str) -> bool:
+        return search in self.__prefetching
+
+    def look_up(self, search: str) -> list[str]:
+        """The text of each entry found for a search, from
+        the worker thread if it has started looking it up,
+        and hasn't failed to."""
+        future = self.__prefetching.pop(search, None)
+        if future is not None and not future.cancel() and future.exception() is None:
+            return future.result()
+        if self.__jamdict is None:
+            self.__jamdict = new_jamdict()
+        return Jamdicts.__look_up(self.__jamdict, search)
+
+    def prefetch(self, search: str) -> None:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="lookups"
+            )
+        self.__prefetching[search] = self.__executor.submit(self.__prefetch, search)
+
+    def cancel(self) -> list[tuple[str, list[str]]]:
+        """Cancels looking up whatever hasn't started being
+        looked up on the worker thread yet, and returns what
+        has been, search and entries. What is being looked up
+        is kept."""
+        looked_up: list[tuple[str, list[str]]] = []
+        running: dict[str, Future[list[str]]] = {}
+        for search, future in self.__prefetching.items():
+            if future.done():
+                if future.exception() is None:
+                    looked_up.append((search, future.result()))
+            elif not future.cancel():
+                running[search] = future
+        self.__prefetching = running
+        return looked_up
+
+    def __prefetch(self, search: str) -> list[str]:
+        if self.__worker_jamdict is None:
+            # Not keeping a connection to its database open,
+            # which would be closed from another thread when
+            # the Jamdict is garbage collected.
+            self.__worker_jamdict = new_jamdict(reuse_ctx=False)
+        return Jamdicts.__look_up(self.__worker_jamdict, search)
+
+    @staticmethod
+    def __look_up(jamdict: "Jamdict", search: str) -> list[str]:
+        # Only entries are shown, so kanji characters
+        # aren't looked up, which is most of the time.
+        result = jamdict.lookup(search, lookup_chars=False)
+        return [entry.text(True) for entry in result.entries]
+
+
+class LookupCache:
+    """Looks up words in Jamdict, and remembers the entries
+    found, as the text that is shown for them, so that
+    looking up a word again doesn't open Jamdict's database,
+    or even make a Jamdict.
+
+    Words in the deck's dictionary, if there is one, are
+    looked up in it, the rest in Jamdict.
+
+    The most recently looked up are kept in memory, and at
+    most max_size in an SQLite cache, see caches.py, which
+    is emptied when the version of Jamdict or its data
+    changes.
+
+    If prefetch_size isn't 0, up to that many words can be
+    looked up ahead of time, see Jamdicts."""
+
+    __SCHEMA: Final = """
+        CREATE TABLE IF NOT EXISTS lookups (
+            search TEXT PRIMARY KEY,
+            entries TEXT NOT NULL,
+            used INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS lookups_used ON lookups (used);
+    """
+
+    def __init__(
+        self,
+        filename: str | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        memory_size: int = DEFAULT_MEMORY_SIZE,
+        dictionary: DeckDictionary | None = None,
+        prefetch_size: int = 0,
+    ) -> None:
+        assert memory_size > 0, memory_size
+        self.__lookups: LruTable = LruTable(
+            connect_versioned(
+                filename, LookupCache.__SCHEMA, "jamdict", data_version(), ["lookups"]
+            ),
+            "lookups",
+            ("search", "entries"),
+            max_size,
+        )
+        self.__memory_size: int = memory_size
+        self.__memory: OrderedDict[str, list[str]] = OrderedDict()  # search.
+        self.__dictionary: DeckDictionary | None = dictionary
+        self.__jamdicts: Jamdicts = Jamdicts(prefetch_size)
+
+    def look_up(self, search: str) -> list[str]:
+        """The text of each entry found for a search, which
+        is empty if nothing was found."""
+        if search in self.__memory:
+            self.__memory.move_to_end(search)
+            return self.__memory[search]
+        # What is being looked up on the worker thread isn't
+        # indexed in the deck's dictionary first, which would
+        # make a Jamdict here as well.
+        entries = self.__remembered(
+            search, index=not self.__jamdicts.prefetching(search)
+        )
+        if entries is None:
+            entries = self.__jamdicts.look_up(search)
+            self.__remember(search, entries)
+        self.__keep(search, entries)
+        return entries
+
+    def prefetch(self, searches: Iterable[str]) -> None:
+        """Looks up the first prefetch_size searches that
+        aren't remembered, on the worker thread, in place of
+        any still to be looked up there from before, so that
+        looking them up after is instant. Those that are
+        remembered are brought into memory. Nothing is
+        indexed in the deck's dictionary, which would make a
+        Jamdict on this thread, before the prompt."""
+        if self.__jamdicts.prefetch_size == 0:
+            return
+        self.cancel_prefetch()
+        for search in islice(searches, self.__jamdicts.prefetch_size):
+            if search in self.__memory:
+                continue
+            entries = self.__remembered(search, index=False)
+            if entries is not None:
+                self.__keep(search, entries)
+                continue
+            self.__jamdicts.prefetch(search)
+
+    def cancel_prefetch(self) -> None:
+        """Cancels looking up whatever hasn't started being
+        looked up on the worker thread yet, and remembers what
+        has been. What is being looked up is kept."""
+        for search, entries in self.__jamdicts.cancel():
+            self.__remember(search, entries)
+            self.__keep(search, entries)
+
+    def __remembered(self, search: str, index: bool = True) -> list[str] | None:
+        """A search's entries from the deck's dictionary, see
+        DeckDictionary.look_up(), or from disk, or None if it
+        isn't remembered."""
+        if self.__dictionary is not None:
+            entries = self.__dictionary.look_up(search, index)
+            if entries is not None:
+                return entries
+        joined = self.__lookups.get(search)
+        if joined is None:
+            return None
+        return joined.split("\n") if joined != "" else []
+
+    def __keep(self, search: str, entries: list[str]) -> None:
+        """Keeps a search's entries in memory."""
+        self.__memory[search] = entries
+        if len(self.__memory) > self.__memory_size:
+            self.__memory.popitem(last=False)
+
+    def __remember(self, search: str, entries: list[str]) -> None:
+        """Remembers a search's entries on disk."""
+        self.__lookups.put([(search, "\n".join(entries))])
+
+
+def open_deck_dictionary(vocab_file: str) -> DeckDictionary | None:
+    """The deck's dictionary, if it has been built."""
+    filename = DeckDictionary.filename_for(vocab_file)
+    if not os.path.exists(filename):
+        return None
+    try:
+        return DeckDictionary(filename)
+    except sqlite3.Error:
+        return None
+
+
+def open_lookup_cache(
+    dictionary: DeckDictionary | None = None, prefetch_size: int = 0
+) -> LookupCache:
+    """The lookup cache in the user's cache directory, or
+    in memory if it can't be opened there."""
+    return open_in_cache_dir(
+        "lookups.db",
+        lambda filename: LookupCache(
+            filename, dictionary=dictionary, prefetch_size=prefetch_size
+        ),
+    )
@@ -1,22 +1,28 @@
+import os
 from collections.abc import Callable
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Final
+from weakref import WeakKeyDictionary
 
 from colors import color  # type: ignore
-from jamdict import Jamdict  # type: ignore
 
 from commands import AddCommand
 from commands import AddKanaCommand
+from commands import AddReadingsCommand
 from commands import ChangeCommand
 from commands import ChangeKanaCommand
 from commands import CommandStack
 from commands import DeleteCommand
 from commands import DeleteKanaCommand
+from commands import SetListKnownCommand
 from commands import ToggleKnownCommand
 from localisation import _
 from localisation import get_locale
 from localisation import set_locale
+from lookups import LookupCache
+from validation import valid_list_name
+from verify import ReadingDiff
+from verify import verify_readings
 from vocab import Vocab
 
 # A function that can be called to check if the operation is
@@ -53,6 +59,9 @@ class OperationDescriptor:
     validation: OperationPrecheck | None
     error_message: str | None
     operation: Operation
+    # False for operations whose parameters are numbers,
+    # not indices in the search results.
+    takes_indices: bool = True
 
     def are_good_params(self, params: Sequence[str]) -> bool:
         return len(params) >= self.min_params and (
@@ -73,8 +82,44 @@ class HelpColumnWidths:
     help_text: int
 
 
+# In memory, for tests, unless main sets the one on disk.
+# Made the first time it's needed, rather than on import.
 # pylint: disable=invalid-name
-jam: Final = Jamdict()
+__lookups: LookupCache | None = None
+
+
+# The readings that v last found missing, by the vocab it
+# verified, which va adds, rather than generating every
+# reading again.
+__last_diffs: WeakKeyDictionary[Vocab, list[ReadingDiff]] = WeakKeyDictionary()
+
+
+def set_lookup_cache(lookups: LookupCache) -> None:
+    # pylint: disable=global-statement
+    global __lookups
+    __lookups = lookups
+
+
+def __lookup_cache() -> LookupCache:
+    # pylint: disable=global-statement
+    global __lookups
+    if __lookups is None:
+        __lookups = LookupCache()
+    return __lookups
+
+
+def prefetch_lookups(searches: list[str]) -> None:
+    """Looks searches up in the background, if the lookup
+    cache prefetches, so that looking them up by their
+    index in the search results is instant."""
+    __lookup_cache().prefetch(searches)
+
+
+def cancel_prefetch_lookups() -> None:
+    """Cancels looking up the previous search's results in
+    the background, when a new search starts."""
+    if __lookups is not None:
+        __lookups.cancel_prefetch()
 
 
 def __look_up(
@@ -82,10 +127,10 @@ def __look_up(
 ) -> OperationResult:
     assert len(params) >= 1
     search = " ".join(params)
-    result = jam.lookup(search)
-    if len(result.entries) > 0:
-        for entry in result.entries:
-            print("  " + entry.text(True))
+    entries = __lookup_cache().look_up(search)
+    if len(entries) > 0:
+        for entry in entries:
+            print("  " + entry)
     else:
         print(_("nothing-found"))
     return OperationResult(None, None, False)
@@ -199,6 +244,67 @@ def __toggle_known_status(
     return OperationResult(None, kanji, False)
 
 
+def __set_list_known(
+    command_stack: CommandStack, vocab: Vocab, params: list[str]
+) -> OperationResult:
+    assert 1 <= len(params) <= 2
+    list_name = params[0]
+    known = params[1] if len(params) > 1 else "1"
+    if not valid_list_name(list_name) or known not in ["0", "1"]:
+        print(__set_list_known_usage())
+        return OperationResult(None, None, False)
+    if vocab.count_in_list(list_name) == 0:
+        print(_("list-{list_name}-not-found").format(list_name=list_name))
+        return OperationResult(None, None, False)
+    command_stack.do(SetListKnownCommand(vocab, list_name, known == "1"))
+    return OperationResult(None, f"list:{list_name}", True)
+
+
+def __set_list_known_usage() -> str:
+    return _("usage") + ": tl " + _("list") + _("space") + "0" + _("bar") + "1"
+
+
+def __verify_readings(
+    _command_stack: CommandStack, vocab: Vocab, params: list[str]
+) -> OperationResult:
+    assert len(params) == 0
+    diffs = __readings_diff(vocab)
+    __last_diffs.clear()
+    __last_diffs[vocab] = diffs
+    for kanji, kana_list, reading in diffs:
+        print(f"  {kanji} {' '.join(kana_list) if kana_list else '-'} → {reading}")
+    print(_("{count}-kanji-without-their-generated-reading").format(count=len(diffs)))
+    return OperationResult(None, None, False)
+
+
+def __add_readings(
+    command_stack: CommandStack, vocab: Vocab, params: list[str]
+) -> OperationResult:
+    assert len(params) == 0
+    diffs = __last_diffs.pop(vocab, None)
+    if diffs is not None:
+        # Less those that have since been added, or whose
+        # kanji have gone.
+        readings = [
+            (kanji, reading)
+            for kanji, _, reading in diffs
+            if kanji in vocab and not vocab.contains(kanji, reading)
+        ]
+    else:
+        readings = [(kanji, reading) for kanji, _, reading in __readings_diff(vocab)]
+    if len(readings) == 0:
+        print(_("{count}-kanji-without-their-generated-reading").format(count=0))
+        return OperationResult(None, None, False)
+    command_stack.do(AddReadingsCommand(vocab, readings))
+    print(_("added-{count}-readings").format(count=len(readings)))
+    return OperationResult(None, None, True)
+
+
+def __readings_diff(vocab: Vocab) -> list[ReadingDiff]:
+    print(_("verifying-readings") + "...")
+    return verify_readings(vocab.kana_lists(), os.cpu_count() or 1)
+
+
 def __undo(
     command_stack: CommandStack, _vocab: Vocab, params: list[str]
 ) -> OperationResult:
@@ -238,7 +344,13 @@ def __info(
         + _("learning")
         + f": {learning}\n  "
         + _("total")
-        + f": {known + learning}\n"
+        + f": {known + learning}\n  "
+        + _("lists")
+        + ":\n"
+        + "".join(
+            f"    {list_name}: {list_known}/{list_known + list_learning}\n"
+            for list_name, (list_known, list_learning) in vocab.get_list_info().items()
+        )
     )
     return OperationResult(None, None, False)
 
@@ -281,6 +393,7 @@ __green_tick = color("✓", fg="green")
 def __operations_help() -> OperationsHelp:
     return [
         OperationHelp("", _("kanji") + _("bar") + _("kana"), _("help-search")),
+        OperationHelp("n", "", _("help-next-page")),
         OperationHelp(
             "l", _("japanese") + _("bar") + _("english"), _("help-dictionary-search")
         ),
@@ -301,6 +414,13 @@ def __operations_help() -> OperationsHelp:
             _("kanji"),
             _("help-known-or-not?{green_tick}").format(green_tick=__green_tick),
         ),
+        OperationHelp(
+            "tl",
+            _("list") + _("space") + "0" + _("bar") + "1",
+            _("help-set-list-known"),
+        ),
+        OperationHelp("v", "", _("help-verify-readings")),
+        OperationHelp("va", "", _("help-add-readings")),
         OperationHelp("u", "", _("help-undo")),
         OperationHelp("r", "", _("help-redo")),
         OperationHelp("s", "", _("help-save")),
@@ -404,6 +524,11 @@ def __operations() -> OperationsDescriptors:
         "t": OperationDescriptor(
             1, 1, False, None, _("usage") + ": t " + _("kanji"), __toggle_known_status
         ),
+        "tl": OperationDescriptor(
+            1, 2, False, None, __set_list_known_usage(), __set_list_known, False
+        ),
+        "v": OperationDescriptor(0, 0, False, None, None, __verify_readings),
+        "va": OperationDescriptor(0, 0, False, None, None, __add_readings),
         "u": OperationDescriptor(
             0,
             0,
@@ -434,7 +559,7 @@ assert sorted(
     [
         operation.command
         for operation in __operations_help()
-        if operation.command not in ["", "q"]
+        if operation.command not in ["", "n", "q"]
     ]
 ) == sorted(list(__operations()))
 
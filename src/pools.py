@@ -0,0 +1,38 @@
+import concurrent.futures
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import Final
+from typing import TypeVar
+
+# Work done in parallel is split into more chunks than
+# processes, so that they are kept busy.
+CHUNKS_PER_PROCESS: Final = 4
+
+Chunk = TypeVar("Chunk")
+Result = TypeVar("Result")
+
+
+def map_in_pool(
+    function: Callable[[Chunk], Result], chunks: Sequence[Chunk], processes: int
+) -> Iterator[Result] | None:
+    """Applies a function to each chunk in a pool of
+    processes, and generates the results in order, as they
+    are taken, or returns None if the system has no working
+    process pools, such as Termux, so that the work can be
+    done the usual way instead."""
+    try:
+        executor = concurrent.futures.ProcessPoolExecutor(processes)
+    except (ImportError, NotImplementedError, OSError):
+        return None
+    return __mapped(executor, function, chunks)
+
+
+def __mapped(
+    # Not evaluated, since that imports multiprocessing.
+    executor: "concurrent.futures.ProcessPoolExecutor",
+    function: Callable[[Chunk], Result],
+    chunks: Sequence[Chunk],
+) -> Iterator[Result]:
+    with executor:
+        yield from executor.map(function, chunks)
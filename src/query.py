@@ -0,0 +1,125 @@
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Final
+
+# Characters that searches need, that are otherwise stripped
+# from input, including the full width versions that a
+# Japanese keyboard types.
+QUERY_PUNCTUATION: Final = ":-~：－〜～"
+
+__FULL_WIDTH: Final = str.maketrans("：－〜～", ":-~~")
+
+__FIELDS: Final = ["list", "known", "kana", "kanji", "gloss"]
+
+
+@dataclass
+class Query:
+    """A parsed search, for example,
+
+      list:0300-0500 known:0 kana:~する 生
+
+    finds unknown kanji in lists 0300 to 0500, that have a
+    kana ending in する, and that have 生 in the kanji or in a
+    kana. Patterns for kana: and kanji: match the whole kana
+    or kanji when they contain ~, which matches anything,
+    otherwise they match part of it, the same as terms do.
+    gloss: matches kanji with the word in their English
+    glosses, see glosses.py.
+    """
+
+    # Terms that the kanji or one of its kana must contain.
+    terms: list[str] = field(default_factory=list)
+    kanji_patterns: list[re.Pattern[str]] = field(default_factory=list)
+    kana_patterns: list[re.Pattern[str]] = field(default_factory=list)
+    # Characters that must be in the kanji or its kana for
+    # any of the above to match.
+    required_chars: set[str] = field(default_factory=set)
+    lists: tuple[int, int] | None = None  # first, last.
+    known: bool | None = None
+    # Words that the kanji's glosses must contain, which
+    # aren't matched here, see search.py.
+    glosses: list[str] = field(default_factory=list)
+
+    def matches(
+        self, kanji: str, kana_list: Sequence[str], list_name: str, known: bool
+    ) -> bool:
+        return (
+            (self.known is None or known == self.known)
+            and (self.lists is None or self.lists[0] <= int(list_name) <= self.lists[1])
+            and all(
+                term in kanji or any(term in kana for kana in kana_list)
+                for term in self.terms
+            )
+            and all(pattern.fullmatch(kanji) for pattern in self.kanji_patterns)
+            and all(
+                any(pattern.fullmatch(kana) for kana in kana_list)
+                for pattern in self.kana_patterns
+            )
+        )
+
+
+def is_query(s: str) -> bool:
+    """True if a search has any field:value parts, plain
+    searches are just the string to search for."""
+    return any(__field(part) in __FIELDS for part in __parts(s))
+
+
+def parse_query(s: str) -> Query | None:
+    """Parses a search, returning None if it has bad field
+    values. Parts that don't start with a field name are
+    terms, so a plain search is a query with one term."""
+    query = Query()
+    for part in __parts(s):
+        name = __field(part)
+        value = part[len(name) + 1 :]
+        if name == "list":
+            match = re.fullmatch("([0-9]+)(?:-([0-9]+))?", value)
+            if match is None or query.lists is not None:
+                return None
+            first = int(match[1])
+            last = first if match[2] is None else int(match[2])
+            query.lists = (min(first, last), max(first, last))
+        elif name == "known":
+            if value not in ["0", "1"] or query.known is not None:
+                return None
+            query.known = value == "1"
+        elif name in ["kana", "kanji"]:
+            if value.strip("~") == "":
+                return None
+            pattern = __pattern(value)
+            if name == "kana":
+                query.kana_patterns.append(pattern)
+            else:
+                query.kanji_patterns.append(pattern)
+            query.required_chars.update(value.replace("~", ""))
+        elif name == "gloss":
+            words = gloss_words(value)
+            if len(words) == 0:
+                return None
+            query.glosses.extend(words)
+        else:
+            query.terms.append(part)
+            query.required_chars.update(part)
+    return query
+
+
+def gloss_words(s: str) -> list[str]:
+    """The words of an English gloss, or of a gloss: search,
+    in lower case, as they are indexed."""
+    return re.findall("[a-z0-9]+", s.lower())
+
+
+def __parts(s: str) -> list[str]:
+    return s.translate(__FULL_WIDTH).split()
+
+
+def __field(part: str) -> str:
+    return part.split(":", 1)[0] if ":" in part else ""
+
+
+def __pattern(value: str) -> re.Pattern[str]:
+    if "~" not in value:
+        value = f"~{value}~"
+    return re.compile(".*".join(re.escape(literal) for literal in value.split("~")))
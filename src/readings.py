@@ -0,0 +1,183 @@
+from collections.abc import Iterable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from importlib.metadata import version
+from typing import TYPE_CHECKING
+from typing import Final
+
+from caches import LruTable
+from caches import connect_versioned
+from caches import open_in_cache_dir
+
+if TYPE_CHECKING:
+    from pykakasi import kakasi
+
+DEFAULT_MAX_SIZE: Final = 100_000
+
+
+class ReadingGenerator:
+    """Generates readings with pykakasi, on the calling
+    thread, or on a worker thread. Both are made the first
+    time they are needed, since loading pykakasi takes most
+    of starting up."""
+
+    def __init__(self) -> None:
+        self.__kks: "kakasi | None" = None
+        self.__executor: ThreadPoolExecutor | None = None
+
+    def generate(self, kanji: str) -> str:
+        if self.__kks is None:
+            self.__kks = new_kakasi()
+        return to_hiragana(self.__kks, kanji)
+
+    def submit(self, kanji: str) -> Future[str]:
+        """Generates a reading on the worker thread."""
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="readings"
+            )
+        return self.__executor.submit(self.generate, kanji)
+
+
+class ReadingCache:
+    """Generates readings of kanji with pykakasi, and
+    remembers them, so that adding a kanji again, undoing
+    and redoing adding it, or importing words that it has
+    seen before, doesn't generate its reading again.
+
+    It holds at most max_size readings, see caches.py, and
+    is emptied when pykakasi's version changes, since a new
+    version might read kanji differently.
+
+    In the background, readings that aren't remembered are
+    generated on a worker thread, so that asking for one
+    doesn't wait for pykakasi, which loads its dictionaries
+    the first time it is used."""
+
+    __SCHEMA: Final = """
+        CREATE TABLE IF NOT EXISTS readings (
+            kanji TEXT PRIMARY KEY,
+            reading TEXT NOT NULL,
+            used INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS readings_used ON readings (used);
+    """
+
+    def __init__(
+        self,
+        filename: str | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        background: bool = False,
+    ) -> None:
+        self.__readings: LruTable = LruTable(
+            connect_versioned(
+                filename,
+                ReadingCache.__SCHEMA,
+                "pykakasi",
+                ReadingCache.pykakasi_version(),
+                ["readings"],
+            ),
+            "readings",
+            ("kanji", "reading"),
+            max_size,
+        )
+        self.__generator: ReadingGenerator = ReadingGenerator()
+        self.__background: bool = background
+        # Readings being generated in the background, by
+        # their requester's key, in the order requested.
+        self.__pending: dict[int, tuple[str, Future[str]]] = {}
+
+    # Public for tests.
+    @staticmethod
+    def pykakasi_version() -> str:
+        return version("pykakasi")
+
+    def __len__(self) -> int:
+        return len(self.__readings)
+
+    def reading(self, kanji: str) -> str:
+        """Generates a kanji's reading, unless it's
+        remembered."""
+        reading = self.get(kanji)
+        if reading is None:
+            reading = self.__generator.generate(kanji)
+            self.put(kanji, reading)
+        return reading
+
+    def request(self, key: int, kanji: str) -> str | None:
+        """A kanji's reading, or, in the background, if it
+        isn't remembered, None, and it is generated on the
+        worker thread, to be collected by ready() with the
+        key."""
+        if not self.__background:
+            return self.reading(kanji)
+        reading = self.get(kanji)
+        if reading is None:
+            self.cancel(key)
+            self.__pending[key] = (kanji, self.__generator.submit(kanji))
+        return reading
+
+    def cancel(self, key: int) -> None:
+        """Forgets a requested reading, for when what it
+        would be given to has changed, or gone, before it
+        arrives."""
+        pending = self.__pending.pop(key, None)
+        if pending is not None:
+            pending[1].cancel()
+
+    def ready(self, block: bool = False) -> list[tuple[int, str]]:
+        """The readings generated in the background since
+        the last call, with their keys, remembering them. If
+        block is true, it waits for all of those requested.
+        A reading that pykakasi failed to generate is
+        dropped, so that its kanji is left without one,
+        rather than the failure being raised to whatever
+        happened to ask for the readings."""
+        if block and len(self.__pending) > 0:
+            wait([future for _kanji, future in self.__pending.values()])
+        ready: list[tuple[int, str]] = []
+        for key, (kanji, future) in list(self.__pending.items()):
+            if not future.done():
+                continue
+            del self.__pending[key]
+            if future.exception() is None:
+                self.put(kanji, future.result())
+                ready.append((key, future.result()))
+        return ready
+
+    def get(self, kanji: str) -> str | None:
+        """The reading of a kanji, or None if it isn't
+        known."""
+        return self.__readings.get(kanji)
+
+    def put(self, kanji: str, reading: str) -> None:
+        self.seed([(kanji, reading)])
+
+    def seed(self, readings: Iterable[tuple[str, str]]) -> None:
+        """Adds readings, kanji and reading, all in one go,
+        as if they had just been used, keeping at most the
+        first max_size."""
+        self.__readings.put(readings)
+
+
+def new_kakasi() -> "kakasi":
+    """A kakasi, importing pykakasi the first time it's
+    needed."""
+    # pylint: disable=import-outside-toplevel
+    from pykakasi import kakasi
+
+    return kakasi()
+
+
+def to_hiragana(kks: "kakasi", kanji: str) -> str:
+    """A kanji's reading, as pykakasi reads it."""
+    return "".join([result["hira"] for result in kks.convert(kanji)])
+
+
+def open_reading_cache(background: bool = False) -> ReadingCache:
+    """The reading cache in the user's cache directory, or
+    in memory if it can't be opened there."""
+    return open_in_cache_dir(
+        "readings.db", lambda filename: ReadingCache(filename, background=background)
+    )
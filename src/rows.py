@@ -0,0 +1,76 @@
+from collections.abc import Iterator
+from weakref import WeakKeyDictionary
+
+from colors import color  # type: ignore
+
+from validation import valid_string
+from vocab import Vocab
+
+
+class RowCache:
+    """Caches the body of each kanji's search result row,
+    everything but its index, so that showing the same
+    kanji again doesn't build its row again. A row is
+    forgotten when the vocab says that its kanji has
+    changed."""
+
+    def __init__(self, vocab: Vocab) -> None:
+        self.__rows: dict[str, str] = {}  # kanji.
+        vocab.add_change_listener(self.__forget)
+
+    def row(self, vocab: Vocab, kanji: str) -> str:
+        assert valid_string(kanji), kanji
+        assert kanji in vocab, kanji
+        row = self.__rows.get(kanji)
+        if row is None:
+            row = RowCache.__format_row(vocab, kanji)
+            self.__rows[kanji] = row
+        return row
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __forget(self, kanji_list: list[str], _words: bool) -> None:
+        for kanji in kanji_list:
+            self.__rows.pop(kanji, None)
+
+    @staticmethod
+    def __format_row(vocab: Vocab, kanji: str) -> str:
+        out = [color(vocab.get_list_name(kanji), fg="grey") + " " + kanji]
+        kana_list = vocab.get_kana(kanji)
+        if len(kana_list) > 0:
+            out.append(
+                color(
+                    " ".join(
+                        [
+                            f'{color(str(kana_index + 1), fg="grey")} {kana}'
+                            for kana_index, kana in enumerate(kana_list)
+                        ]
+                    ),
+                    fg="grey",
+                )
+            )
+        if vocab.is_known(kanji):
+            green_tick = color("✓", fg="green")
+            out.append(green_tick)
+        return " ".join(out)
+
+
+# Weak so that a vocab's cache goes when the vocab goes.
+__row_caches: WeakKeyDictionary[Vocab, RowCache] = WeakKeyDictionary()
+
+
+def get_row_cache(vocab: Vocab) -> RowCache:
+    if vocab not in __row_caches:
+        __row_caches[vocab] = RowCache(vocab)
+    return __row_caches[vocab]
+
+
+def format_rows(vocab: Vocab, page: list[str], start: int) -> Iterator[str]:
+    """Generates the lines for a page of search results,
+    numbered from start. Only the index is formatted each
+    time, the rest of the row comes from the cache."""
+    row_cache = get_row_cache(vocab)
+    for kanji_index, kanji in enumerate(page, start):
+        index = color(f"{kanji_index + 1:4d}", fg="grey")
+        yield f"  {index} {row_cache.row(vocab, kanji)}"
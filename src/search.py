@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Final
+
+from query import Query
+from storage import Row
+
+# Public for tests.
+SEARCH_CACHE_SIZE: Final = 32
+
+# A change to more kanji than this forgets every result,
+# rather than checking each kanji against each of them.
+MAX_CHECKED_CHANGES: Final = 100
+
+# Called with the words of gloss: searches, returns the kanji
+# whose English glosses have them all.
+GlossFinder = Callable[[list[str]], set[str]]
+
+SearchKey = tuple[str, bool]  # search, exact.
+
+# The ids of the best kanji found, best first, in a dict so
+# that whether a kanji is in them is one lookup.
+Found = dict[int, None]
+
+
+@dataclass(frozen=True)
+class Search:
+    """A query, with the kanji that its gloss: words find,
+    which are found before it is matched, None if it has
+    none."""
+
+    query: Query
+    glossed_kanji: set[str] | None = None
+
+    def matches(
+        self, kanji: str, kana_list: Sequence[str], list_name: str, known: bool
+    ) -> bool:
+        return self.query.matches(kanji, kana_list, list_name, known) and (
+            self.glossed_kanji is None or kanji in self.glossed_kanji
+        )
+
+
+class SearchIndex:
+    """What a vocab's searches start from, other than its
+    columns, the ids of the kanji that have each character
+    in them or in their kana, and the kanji that gloss:
+    searches find, kept up to date as kanji change.
+    Characters aren't indexed until indexing is started, so
+    that a lazy vocab can be searched without parsing all of
+    it.
+
+    The best matches of each of the most recent searches,
+    as many as have been ranked, and how many matches there
+    are, are remembered, so that showing the next page of
+    it, or searching for it again, doesn't search again. A
+    result is forgotten when a kanji that is in it changes,
+    or when a kanji changes so that it would be in it, not
+    whenever anything changes. If only some of its matches
+    are remembered it is forgotten whenever anything
+    changes, since one that isn't might have changed."""
+
+    def __init__(
+        self, find_glossed: GlossFinder | None = None, indexed: bool = True
+    ) -> None:
+        self.__postings: dict[str, set[int]] = {}  # character.
+        # The characters of each kanji and its kana, in a
+        # string, which is smaller than a set.
+        self.__chars: list[str] = []  # id.
+        self.__indexed: bool = indexed
+        self.__find_glossed: GlossFinder | None = find_glossed
+        # Least recently used first, with the search, None
+        # for exact searches, and the number of matches.
+        self.__results: OrderedDict[
+            SearchKey, tuple[Search | None, int, Found]
+        ] = OrderedDict()
+
+    @property
+    def indexed(self) -> bool:
+        return self.__indexed
+
+    def start_indexing(self) -> None:
+        """From now on kanji are indexed, which is when every
+        kanji should be."""
+        self.__indexed = True
+
+    def index(self, kanji_id: int, chars: str) -> None:
+        """Indexes the characters of a kanji and its kana,
+        in place of those it had, which are none once it's
+        deleted."""
+        if kanji_id >= len(self.__chars):
+            self.__chars.extend([""] * (kanji_id + 1 - len(self.__chars)))
+        for char in self.__chars[kanji_id]:
+            self.__postings[char].discard(kanji_id)
+        for char in chars:
+            self.__postings.setdefault(char, set()).add(kanji_id)
+        self.__chars[kanji_id] = chars
+
+    def postings(self, char: str) -> set[int]:
+        """The ids of the kanji with a character in them, or
+        in their kana."""
+        return self.__postings.get(char, set())
+
+    def search(self, query: Query) -> Search:
+        """Finds the kanji for a query's gloss: words, which
+        is none if there is no gloss index."""
+        if len(query.glosses) == 0:
+            return Search(query)
+        return Search(
+            query,
+            self.__find_glossed(query.glosses)
+            if self.__find_glossed is not None
+            else set(),
+        )
+
+    def found(self, s: str, exact: bool) -> tuple[int, Found] | None:
+        """The number of matches that a search found, and
+        its best, if it's remembered."""
+        result = self.__results.get((s, exact))
+        if result is None:
+            return None
+        self.__results.move_to_end((s, exact))
+        return result[1:]
+
+    def remember(
+        self, s: str, exact: bool, search: Search | None, total: int, found: Found
+    ) -> None:
+        self.__results[(s, exact)] = (search, total, found)
+        if len(self.__results) > SEARCH_CACHE_SIZE:
+            self.__results.popitem(last=False)
+
+    def changed(self, rows: list[tuple[int, Row | None]]) -> None:
+        """Forgets the results that a change can change,
+        given the id and row of each kanji that changed, or
+        None if it has been deleted."""
+        if len(rows) > MAX_CHECKED_CHANGES:
+            self.forget()
+            return
+        for (s, exact), (search, total, found) in list(self.__results.items()):
+            if len(found) < total or any(
+                kanji_id in found
+                or (
+                    row is not None
+                    and (
+                        row[1] == s
+                        if search is None
+                        else search.matches(row[1], row[3], row[0], row[2])
+                    )
+                )
+                for kanji_id, row in rows
+            ):
+                del self.__results[(s, exact)]
+
+    def compact(self, new_ids: list[int]) -> None:
+        """Gives kanji the new ids that Columns.compact()
+        returned, see columns.py, forgetting every result."""
+        self.__postings = {
+            char: {new_ids[kanji_id] for kanji_id in ids}
+            for char, ids in self.__postings.items()
+        }
+        self.__chars = [
+            chars for chars, new_id in zip(self.__chars, new_ids) if new_id != -1
+        ]
+        self.forget()
+
+    def forget(self) -> None:
+        """Forgets every result."""
+        self.__results.clear()
@@ -0,0 +1,120 @@
+import builtins
+import sys
+import time
+from collections.abc import Mapping
+from collections.abc import Sequence
+from importlib.util import resolve_name
+from types import ModuleType
+from typing import Final
+
+
+class StartupProfile:
+    """Times starting up, for --profile-startup: importing
+    each module, and each step of initializing, up to the
+    first prompt, so that what makes starting up slow can
+    be found, and left until it is first used.
+
+    Imports are timed by wrapping __import__ until the
+    report is made. Each module imported for the first time
+    is given the time that it took, less the time of the
+    modules that it imported, which are given their own.
+    Each step is given the time since the step before it,
+    the first since the profile started."""
+
+    # The most imports that a report shows.
+    __REPORTED_IMPORTS: Final = 20
+
+    def __init__(self) -> None:
+        self.__started: float = time.perf_counter()
+        self.__last_step: float = self.__started
+        self.__steps: list[tuple[str, float]] = []
+        self.__imports: dict[str, float] = {}  # module.
+        # The time taken by the imports of each import being
+        # timed, innermost last.
+        self.__nested: list[float] = []
+        self.__import = builtins.__import__
+        builtins.__import__ = self.__timed_import
+
+    # pylint: disable=redefined-builtin
+    def __timed_import(
+        self,
+        name: str,
+        globals: Mapping[str, object] | None = None,
+        locals: Mapping[str, object] | None = None,
+        fromlist: Sequence[str] | None = (),
+        level: int = 0,
+    ) -> ModuleType:
+        if level > 0:
+            assert globals is not None
+            name = resolve_name("." * level + name, str(globals["__package__"]))
+        if name in sys.modules:
+            return self.__import(name, globals, locals, fromlist, 0)
+        start = time.perf_counter()
+        self.__nested.append(0.0)
+        try:
+            return self.__import(name, globals, locals, fromlist, 0)
+        finally:
+            took = time.perf_counter() - start
+            nested = self.__nested.pop()
+            if len(self.__nested) > 0:
+                self.__nested[-1] += took
+            self.__imports[name] = took - nested
+
+    def step(self, name: str) -> None:
+        """Ends a step of initializing."""
+        now = time.perf_counter()
+        self.__steps.append((name, now - self.__last_step))
+        self.__last_step = now
+
+    def report(self) -> str:
+        """Stops timing imports, and reports the slowest
+        imports, the steps, and the time to the first
+        prompt."""
+        total = time.perf_counter() - self.__started
+        builtins.__import__ = self.__import
+        lines = [f"imports, slowest {StartupProfile.__REPORTED_IMPORTS}:"]
+        lines.extend(
+            StartupProfile.__line(module, seconds)
+            for module, seconds in sorted(
+                self.__imports.items(), key=lambda item: item[1], reverse=True
+            )[: StartupProfile.__REPORTED_IMPORTS]
+        )
+        lines.append("steps:")
+        lines.extend(
+            StartupProfile.__line(name, seconds) for name, seconds in self.__steps
+        )
+        lines.append(StartupProfile.__line("time to first prompt", total, indent=""))
+        return "\n".join(lines)
+
+    @staticmethod
+    def __line(name: str, seconds: float, indent: str = "  ") -> str:
+        return f"{indent}{name:<40} {seconds * 1000:8.1f} ms"
+
+
+# pylint: disable=invalid-name
+__profile: StartupProfile | None = None
+
+
+def start_profile() -> None:
+    # pylint: disable=global-statement
+    global __profile
+    __profile = StartupProfile()
+
+
+def startup_step(name: str) -> None:
+    """Ends a step of starting up, if it is being
+    profiled."""
+    if __profile is not None:
+        __profile.step(name)
+
+
+def startup_report() -> str | None:
+    """The report of starting up, if it is being profiled,
+    which stops it being profiled."""
+    # pylint: disable=global-statement
+    global __profile
+    if __profile is None:
+        return None
+    report = __profile.report()
+    __profile = None
+    return report
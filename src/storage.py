@@ -0,0 +1,461 @@
+# pylint: disable=broad-exception-raised
+
+import csv
+import io
+import mmap
+import os
+import sqlite3
+from abc import ABC
+from abc import abstractmethod
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from functools import partial
+from itertools import groupby
+from itertools import islice
+from typing import Final
+from unicodedata import is_normalized
+
+from pools import CHUNKS_PER_PROCESS
+from pools import map_in_pool
+from validation import valid_kana_list
+from validation import valid_list_name
+from validation import valid_string
+
+Row = tuple[str, str, bool, Sequence[str]]  # list name, kanji, known, kana.
+
+# What loading and saving can fail with.
+STORAGE_ERRORS: Final = (OSError, sqlite3.Error)
+
+SQLITE_EXTENSIONS: Final = [".db", ".sqlite", ".sqlite3"]
+
+
+class Storage(ABC):
+    """Where a vocab is loaded from and saved to."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename: str = filename
+
+    @abstractmethod
+    def load(self) -> Iterator[Row]:
+        """Generates the rows of the vocab, and raises
+        exceptions on format errors."""
+
+    @abstractmethod
+    def save(self, rows: Iterable[Row]) -> None:
+        """Saves the whole vocab, given its rows in list name
+        and kanji order, which are generated as they are
+        taken, so storage that is already up to date can
+        skip them."""
+
+    def changed(self, changes: list[tuple[str, Row | None]]) -> None:
+        """Called after every change, with each kanji that
+        changed and its row, or None if it has been deleted,
+        which are written together. Storage that fails to
+        write them writes them on the next save."""
+
+    def renamed(self, kanji: str, new_kanji: str) -> None:
+        """Called when a kanji is changed, before the
+        changes to the old and new kanji."""
+
+    def map(self) -> "MappedCsv | None":
+        """The file memory mapped, so that rows can be parsed
+        as they are needed, or None if the storage can't do
+        that."""
+        return None
+
+    def load_parallel(self, processes: int) -> Iterator[Row]:
+        """The same as load(), with the parsing spread over
+        a number of processes, if the storage can do that."""
+        del processes
+        return self.load()
+
+
+class CsvStorage(Storage):
+    """The vocab as lines of list name, kanji, known status,
+    and kana, rewritten as a whole on every save, which
+    keeps it easy to edit by hand and to track with git.
+
+    Lines are split by the csv module, in C, with no
+    quoting, since nothing in a vocab has commas or quotes
+    in it. They are written a chunk at a time."""
+
+    # The known field, as a slice of a line's fields, which
+    # is empty if a line is too short.
+    __KNOWN: Final = (["0"], ["1"])
+
+    # Public for tests.
+    SAVE_CHUNK_ROWS: Final = 10_000
+
+    # Public for tests.
+    MIN_CHUNK_BYTES: Final = 1 << 20
+
+    def load(self) -> Iterator[Row]:
+        with open(self.filename, encoding="utf-8", newline="") as f:
+            yield from CsvStorage.parse_lines(f)
+
+    def load_parallel(self, processes: int) -> Iterator[Row]:
+        """Splits the file into chunks of whole lines, and
+        parses them in a pool of processes. Their rows come
+        back in file order, and the first bad line is raised
+        with its line number, the same as load() does, after
+        the rows before it. Files too small to be worth it,
+        or systems without working process pools, such as
+        Termux, are loaded the usual way, see pools.py."""
+        chunks = self.__chunks(processes * CHUNKS_PER_PROCESS) if processes > 1 else []
+        columns = (
+            map_in_pool(
+                partial(CsvStorage.parse_chunk, self.filename), chunks, processes
+            )
+            if len(chunks) > 1
+            else None
+        )
+        if columns is None:
+            yield from self.load()
+            return
+        for list_names, kanji, known, kana in columns:
+            for row in zip(list_names, kanji, known, kana):
+                yield (
+                    row[0],
+                    row[1],
+                    row[2] == 1,
+                    row[3].split(",") if row[3] != "" else [],
+                )
+
+    def __chunks(self, count: int) -> list[tuple[int, int, int]]:
+        """Splits the file into about count chunks of whole
+        lines, but none smaller than a minimum, as start, end,
+        and first line number."""
+        chunks: list[tuple[int, int, int]] = []
+        with open(self.filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            chunk_size = max(size // max(count, 1), CsvStorage.MIN_CHUNK_BYTES)
+            start = 0
+            line_number = 0
+            while start < size:
+                f.seek(min(start + chunk_size, size))
+                # To the end of the line that the chunk ends in.
+                f.readline()
+                end = f.tell()
+                chunks.append((start, end, line_number))
+                f.seek(start)
+                line_number += f.read(end - start).count(b"\n")
+                start = end
+        return chunks
+
+    @staticmethod
+    def parse_chunk(
+        filename: str, chunk: tuple[int, int, int]
+    ) -> tuple[list[str], list[str], bytes, list[str]]:
+        """Parses a chunk of a file, given its start, end,
+        and first line number, in a pool process. Its rows
+        are sent back as columns of list names, kanji, known
+        statuses, and kana joined by commas, which are much
+        quicker to unpickle than rows are."""
+        start, end, line_number = chunk
+        with open(filename, "rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode("utf-8")
+        rows = list(CsvStorage.parse_lines(io.StringIO(text, newline=""), line_number))
+        return (
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            bytes(row[2] for row in rows),
+            [",".join(row[3]) for row in rows],
+        )
+
+    @staticmethod
+    def parse_lines(lines: Iterable[str], first_line_number: int = 0) -> Iterator[Row]:
+        """Parses lines, the first of which is
+        first_line_number, raising exceptions on format
+        errors."""
+        reader = csv.reader(lines, quoting=csv.QUOTE_NONE, quotechar=None)
+        line_number = first_line_number - 1
+        while True:
+            line_number += 1
+            try:
+                fields = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # Such as a field larger than the field size
+                # limit.
+                raise Exception(f"line {line_number + 1}: bad line, {e}.") from e
+            kana_list = fields[3:]
+            if kana_list == [""]:
+                kana_list = []
+            # Good lines are checked in one go, only bad
+            # lines are checked field by field, for the
+            # error. A list name with spaces before it
+            # isn't numeric.
+            if (
+                fields[2:3] in CsvStorage.__KNOWN
+                and valid_list_name(fields[0])
+                and valid_string(fields[1])
+                and valid_kana_list(kana_list)
+                and not fields[-1][-1:].isspace()
+            ):
+                yield (fields[0], fields[1], fields[2] == "1", kana_list)
+            else:
+                yield CsvStorage.parse_line(",".join(fields), line_number)
+
+    def map(self) -> "MappedCsv":
+        return MappedCsv(self.filename)
+
+    @staticmethod
+    def parse_line(line: str, line_number: int) -> Row:
+        """Parses a line, raising exceptions on format
+        errors."""
+        line = line.strip()
+        parts = line.split(",")
+        if len(parts) < 3:
+            raise Exception(
+                f"line {line_number + 1}: bad line '{line}', "
+                + f"{len(parts)} fields, expected at least 4."
+            )
+        (list_name, kanji, known) = parts[:3]
+        if not valid_list_name(list_name):
+            raise Exception(
+                f"line {line_number + 1}: bad list name '{list_name}', "
+                + "expected numeric."
+            )
+        if not valid_string(kanji):
+            raise Exception(f"line {line_number + 1}: empty kanji '{kanji}'.")
+        if known not in ["0", "1"]:
+            raise Exception(
+                f"line {line_number + 1}: bad known status '{known}', "
+                + "expected 0 or 1."
+            )
+        kana_list = parts[3:]
+        if kana_list == [""]:
+            kana_list = []
+        if not valid_kana_list(kana_list):
+            raise Exception(
+                f"line {line_number + 1}: bad kana list '" + ",".join(kana_list) + "'"
+            )
+        return (list_name, kanji, known == "1", kana_list)
+
+    def save(self, rows: Iterable[Row]) -> None:
+        rows = iter(rows)
+        with open(self.filename, "w", encoding="utf-8") as f:
+            while chunk := list(islice(rows, CsvStorage.SAVE_CHUNK_ROWS)):
+                f.write(
+                    "".join(
+                        [
+                            f"{list_name},{kanji},{1 if known else 0},"
+                            + f"{','.join(kana_list)}\n"
+                            for list_name, kanji, known, kana_list in chunk
+                        ]
+                    )
+                )
+
+
+class MappedCsv:
+    """A CSV vocab file memory mapped, with only the offset
+    of each line kept, so that a million word deck can be
+    opened without parsing it. Lines are parsed when they
+    are asked for, and searched for strings without decoding
+    them. Every line is checked when it is opened, so that
+    a format error is raised then, rather than in the middle
+    of a session, but only its list name and kanji are
+    kept."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename: str = filename
+        with open(filename, "rb") as f:
+            # An empty file can't be mapped.
+            self.__map: mmap.mmap | bytes = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if os.fstat(f.fileno()).st_size > 0
+                else b""
+            )
+        # The start of each line, and the end of the file.
+        self.__offsets: "array[int]" = array("q", [0])
+
+    def lines(self) -> Iterator[tuple[str, str, bool]]:
+        """Generates the list name and kanji of each line,
+        and whether the line is NFC normalized, raising
+        exceptions on format errors in any of it. Lines that
+        aren't normalized won't be found by find() with
+        normalized strings."""
+        del self.__offsets[1:]
+        end = 0
+        for line_number, line in enumerate(self.__lines()):
+            end += len(line)
+            self.__offsets.append(end)
+            decoded = line.decode("utf-8")
+            parts = decoded.strip().split(",")
+            if (
+                len(parts) < 3
+                or not valid_list_name(parts[0])
+                or not valid_string(parts[1])
+                or parts[2] not in ["0", "1"]
+                or not (parts[3:] == [""] or valid_kana_list(parts[3:]))
+            ):
+                CsvStorage.parse_line(decoded, line_number)
+            yield (parts[0], parts[1], is_normalized("NFC", decoded))
+
+    def row(self, line_number: int) -> Row:
+        return CsvStorage.parse_line(self.__line(line_number), line_number)
+
+    def kanji(self, line_number: int) -> str:
+        return self.__line(line_number).strip().split(",", 2)[1]
+
+    def find(self, s: str) -> Iterator[int]:
+        """Generates the numbers of the lines that contain a
+        string, in order, each once."""
+        needle = s.encode("utf-8")
+        position = self.__map.find(needle, 0)
+        while position != -1:
+            line_number = bisect_right(self.__offsets, position) - 1
+            yield line_number
+            position = self.__map.find(needle, self.__offsets[line_number + 1])
+
+    def close(self) -> None:
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+
+    def __lines(self) -> Iterator[bytes]:
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.seek(0)
+            return iter(self.__map.readline, b"")
+        return iter([])
+
+    def __line(self, line_number: int) -> str:
+        start, end = self.__offsets[line_number : line_number + 2]
+        return self.__map[start:end].decode("utf-8")
+
+
+class SqliteStorage(Storage):
+    """The vocab in an SQLite database, in WAL mode, where
+    every change is written as it happens, in its own
+    transaction, however many kanji it changes, so saving
+    has nothing left to do, and loading doesn't parse or
+    validate anything.
+
+    Saving a vocab loaded from elsewhere to a new database
+    writes it as a whole, which is how a CSV file is
+    imported, and saving to a CSV file exports it."""
+
+    __SCHEMA: Final = """
+        CREATE TABLE IF NOT EXISTS vocab (
+            id INTEGER PRIMARY KEY,
+            list_name TEXT NOT NULL CHECK (list_name GLOB '[0-9]*'),
+            kanji TEXT NOT NULL UNIQUE CHECK (kanji != ''),
+            known INTEGER NOT NULL CHECK (known IN (0, 1))
+        );
+        CREATE INDEX IF NOT EXISTS vocab_list_name ON vocab (list_name);
+        CREATE TABLE IF NOT EXISTS kana (
+            vocab_id INTEGER NOT NULL REFERENCES vocab (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            kana TEXT NOT NULL CHECK (kana != ''),
+            PRIMARY KEY (vocab_id, position)
+        );
+        CREATE INDEX IF NOT EXISTS kana_kana ON kana (kana);
+    """
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename)
+        self.__connection: sqlite3.Connection | None = None
+        # True once the database has everything in the vocab,
+        # so that changes can be written as they happen.
+        self.__synced: bool = False
+
+    def load(self) -> Iterator[Row]:
+        if not os.path.exists(self.filename):
+            raise FileNotFoundError(f"No such file: '{self.filename}'")
+        connection = self.__connect()
+        rows = connection.execute(
+            """
+            SELECT vocab.list_name, vocab.kanji, vocab.known, kana.kana
+            FROM vocab LEFT JOIN kana ON kana.vocab_id = vocab.id
+            ORDER BY vocab.id, kana.position
+            """
+        )
+        for (list_name, kanji, known), kana in groupby(
+            rows, key=lambda row: (row[0], row[1], row[2])
+        ):
+            kana_list = [row[3] for row in kana if row[3] is not None]
+            yield (list_name, kanji, known == 1, kana_list)
+        self.__synced = True
+
+    def save(self, rows: Iterable[Row]) -> None:
+        connection = self.__connect()
+        if not self.__synced:
+            with connection:
+                connection.execute("DELETE FROM vocab")
+                for row in rows:
+                    self.__write(connection, row)
+            self.__synced = True
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def changed(self, changes: list[tuple[str, Row | None]]) -> None:
+        if not self.__synced:
+            return
+        connection = self.__connect()
+        try:
+            with connection:
+                for kanji, row in changes:
+                    if row is None:
+                        connection.execute(
+                            "DELETE FROM vocab WHERE kanji = ?", (kanji,)
+                        )
+                    else:
+                        self.__write(connection, row)
+        except sqlite3.Error:
+            # Written as a whole when it's next saved.
+            self.__synced = False
+            raise
+
+    def renamed(self, kanji: str, new_kanji: str) -> None:
+        """Keeps the kanji's id, and so its order."""
+        if not self.__synced:
+            return
+        connection = self.__connect()
+        try:
+            with connection:
+                connection.execute(
+                    "UPDATE vocab SET kanji = ? WHERE kanji = ?", (new_kanji, kanji)
+                )
+        except sqlite3.Error:
+            self.__synced = False
+            raise
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.filename)
+            self.__connection.execute("PRAGMA journal_mode = WAL")
+            self.__connection.execute("PRAGMA synchronous = NORMAL")
+            self.__connection.execute("PRAGMA foreign_keys = ON")
+            self.__connection.executescript(SqliteStorage.__SCHEMA)
+        return self.__connection
+
+    @staticmethod
+    def __write(connection: sqlite3.Connection, row: Row) -> None:
+        """Inserts or updates a row, keeping the id, and so
+        the order, of a kanji that is already there."""
+        list_name, kanji, known, kana_list = row
+        (vocab_id,) = connection.execute(
+            """
+            INSERT INTO vocab (list_name, kanji, known) VALUES (?, ?, ?)
+            ON CONFLICT (kanji) DO UPDATE
+            SET list_name = excluded.list_name, known = excluded.known
+            RETURNING id
+            """,
+            (list_name, kanji, 1 if known else 0),
+        ).fetchone()
+        connection.execute("DELETE FROM kana WHERE vocab_id = ?", (vocab_id,))
+        connection.executemany(
+            "INSERT INTO kana (vocab_id, position, kana) VALUES (?, ?, ?)",
+            [(vocab_id, position, kana) for position, kana in enumerate(kana_list)],
+        )
+
+
+def open_storage(filename: str) -> Storage:
+    """SQLite for .db, .sqlite, and .sqlite3 files,
+    otherwise CSV."""
+    if os.path.splitext(filename)[1] in SQLITE_EXTENSIONS:
+        return SqliteStorage(filename)
+    return CsvStorage(filename)
@@ -0,0 +1,21 @@
+# What the vocab accepts, which is also what its storage
+# accepts when it reads a file, so that the two can't
+# disagree.
+
+
+def valid_index(i: int) -> bool:
+    return isinstance(i, int) and i >= 0
+
+
+def valid_kana_list(kana_list: list[str]) -> bool:
+    return isinstance(kana_list, list) and all(
+        isinstance(k, str) and len(k) > 0 for k in kana_list
+    )
+
+
+def valid_list_name(list_name: str) -> bool:
+    return isinstance(list_name, str) and list_name.isnumeric()
+
+
+def valid_string(s: str) -> bool:
+    return isinstance(s, str) and len(s) > 0
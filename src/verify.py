@@ -0,0 +1,60 @@
+from collections.abc import Iterable
+from typing import Final
+
+from pools import CHUNKS_PER_PROCESS
+from pools import map_in_pool
+from readings import new_kakasi
+from readings import to_hiragana
+
+# Kanji whose kana don't include their generated reading, as
+# kanji, kana, and reading.
+ReadingDiff = tuple[str, list[str], str]
+
+# Public for tests.
+MIN_CHUNK_KANJI: Final = 20_000
+
+# Katakana to hiragana, which is the same code point less
+# 0x60, ァ to ヶ.
+__HIRAGANA: Final = {c: c - 0x60 for c in range(ord("ァ"), ord("ヶ") + 1)}
+
+
+def verify_readings(
+    kana_lists: Iterable[tuple[str, list[str]]], processes: int = 1
+) -> list[ReadingDiff]:
+    """Generates the reading of every kanji, as adding it
+    would, and returns those that their kana don't include,
+    so that kanji with missing or suspicious kana can be
+    found. Kana words, hiragana or katakana, which read as
+    themselves, are left out, as are their kana, when they
+    are saved.
+
+    Readings are generated in a pool of processes, unless
+    there are too few kanji for it to be worth it, or the
+    system has no working process pools, see pools.py."""
+    kanji_and_kana = list(kana_lists)
+    kanji = [k for k, _kana in kanji_and_kana]
+    chunk_size = max(
+        -(-len(kanji) // (processes * CHUNKS_PER_PROCESS)), MIN_CHUNK_KANJI
+    )
+    chunks = [kanji[i : i + chunk_size] for i in range(0, len(kanji), chunk_size)]
+    chunk_readings = (
+        map_in_pool(generate_readings, chunks, processes)
+        if processes > 1 and len(chunks) > 1
+        else None
+    )
+    readings = (
+        generate_readings(kanji)
+        if chunk_readings is None
+        else [reading for readings in chunk_readings for reading in readings]
+    )
+    return [
+        (k, kana, reading)
+        for (k, kana), reading in zip(kanji_and_kana, readings)
+        if reading not in kana and reading != k.translate(__HIRAGANA)
+    ]
+
+
+def generate_readings(kanji: list[str]) -> list[str]:
+    """Public for the process pool."""
+    kks = new_kakasi()
+    return [to_hiragana(kks, k) for k in kanji]
@@ -1,20 +1,41 @@
-# pylint: disable=broad-exception-raised
-
 import sys
-from copy import copy
-from dataclasses import dataclass
+from bisect import bisect_left
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from heapq import nsmallest
+from itertools import chain
+from itertools import compress
+from itertools import count
+from itertools import islice
 from typing import Final
 from unicodedata import normalize
 
-from pykakasi import kakasi
-
+from columns import Columns
+from columns import Lists
 from localisation import _
-
-
-@dataclass
-class KanjiInfo:
-    known: bool
-    kana_list: list[str]
+from query import parse_query
+from readings import ReadingCache
+from search import Found
+from search import GlossFinder
+from search import Search
+from search import SearchIndex
+from storage import STORAGE_ERRORS
+from storage import Row
+from storage import Storage
+from storage import open_storage
+from validation import valid_index
+from validation import valid_kana_list
+from validation import valid_list_name
+from validation import valid_string
+
+SearchMatch = tuple[int, bool, int]  # relevance, known, id.
+
+# Called after a change with the kanji that it changed, and
+# whether it changed them, or their kana, rather than only
+# their known status.
+ChangeListener = Callable[[list[str], bool], None]
 
 
 class Vocab:
@@ -26,279 +47,685 @@ class Vocab:
     alternative readings. Words that do not have kanji and
     katakana words are therefore 'kanji' for its interface's
     purposes.
-    """
-
-    __list_to_kanji: dict[str, list[str]]
 
-    __kanji_to_list: dict[str, str]
-
-    __kanji_to_info: dict[str, KanjiInfo]
+    Inside, each kanji has an integer id, given in the order
+    that kanji are added, that doesn't change, even when the
+    kanji is changed, until the vocab is saved with enough
+    deleted kanji that their ids are dropped, and everything
+    is kept in columns indexed by id, see columns.py. Kanji
+    strings are only looked up in its interface. Known
+    status and list membership are kept in arrays, so that
+    counting and filtering them runs a column at a time,
+    rather than a kanji at a time.
+
+    List names, each list's kanji, and each kanji's kana
+    are kept in the order that they are saved in, as they
+    change, so that saving is a straight write, without
+    sorting anything.
+
+    Every kanji and kana that its interface is given is NFC
+    normalized, so that one typed with a separate dakuten
+    is the same as one without.
+    """
 
     # Public for tests.
     ITEMS_PER_LIST: Final = 100
 
-    def __init__(self, filename: str) -> None:
-        """Loads vocabulary from a file, and raises
-        exceptions on format errors."""
-        self.__filename: str = filename
-        self.__kks: kakasi = kakasi()
-        self.__list_to_kanji = {}
-        self.__kanji_to_list = {}
-        self.__kanji_to_info = {}
-        with open(self.__filename, encoding="utf-8") as f:
-            lines = f.readlines()
-            for line_number, line in enumerate(lines):
-                line = line.strip()
-                parts = line.split(",")
-                if len(parts) < 3:
-                    raise Exception(
-                        f"line {line_number + 1}: bad line '{line}', "
-                        + f"{len(parts)} fields, expected at least 4."
-                    )
-                (list_name, kanji, known) = parts[:3]
-                if not Vocab.valid_list_name(list_name):
-                    raise Exception(
-                        f"line {line_number + 1}: bad list name '{list_name}', "
-                        + "expected numeric."
-                    )
-                if not Vocab.valid_string(kanji):
-                    raise Exception(f"line {line_number + 1}: empty kanji '{kanji}'.")
-                if known not in ["0", "1"]:
-                    raise Exception(
-                        f"line {line_number + 1}: bad known status '{known}', "
-                        + "expected 0 or 1."
-                    )
-                kana_list = parts[3:]
-                if kana_list == [""]:
-                    kana_list = []
-                if not Vocab.valid_kana_list(kana_list):
-                    raise Exception(
-                        f"line {line_number + 1}: bad kana list '"
-                        + ",".join(kana_list)
-                        + "'"
-                    )
-                if list_name not in self.__list_to_kanji:
-                    self.__list_to_kanji[list_name] = []
-                self.__list_to_kanji[list_name].append(kanji)
-                self.__kanji_to_list[kanji] = list_name
-                self.__kanji_to_info[kanji] = KanjiInfo(known == "1", kana_list)
+    # Search relevance, best first.
+    __EXACT_KANJI: Final = 0
+    __EXACT_KANA: Final = 1
+    __PREFIX: Final = 2
+    __SUBSTRING: Final = 3
+
+    # Ids are compacted when the vocab is saved once more
+    # than this fraction of them are of deleted kanji.
+    __MAX_DELETED: Final = 0.25
+
+    # Turns the known column into an unknown column.
+    __UNKNOWN: Final = bytes.maketrans(b"\0\1", b"\1\0")
+
+    def __init__(
+        self,
+        filename: str,
+        lazy: bool = False,
+        processes: int = 1,
+        readings: ReadingCache | None = None,
+        find_glossed: GlossFinder | None = None,
+    ) -> None:
+        """Loads vocabulary from a file, CSV, or SQLite, see
+        storage.py, and raises exceptions on format errors.
+        When a kanji is in the file more than once, the last
+        one is kept.
+
+        Lazy, for a CSV file, maps the file into memory and
+        reads only the list name and kanji of each line,
+        parsing the rest of a line the first time that its
+        kanji is used, so that very big decks open quickly
+        and only take the memory of what is used of them.
+        Format errors anywhere in a line are still raised
+        when it's opened.
+
+        Processes, for a big CSV file that isn't lazy, parses
+        it in that many processes, see storage.py. The rows
+        are loaded in file order, the same as without.
+
+        Readings is where the readings generated for kanji
+        being added are remembered, see readings.py, in
+        memory if it isn't given. When it's empty it's seeded
+        with the kanji that have just one kana, so that
+        adding them again doesn't need pykakasi.
+
+        Find glossed finds the kanji for gloss: searches, see
+        glosses.py, which find nothing if it isn't given."""
+        self.__readings: ReadingCache = (
+            readings if readings is not None else ReadingCache()
+        )
+        self.__change_listeners: list[ChangeListener] = []
+        self.__storage: Storage = open_storage(filename)
+        mapped = self.__storage.map() if lazy else None
+        self.__columns: Columns = Columns(mapped)
+        self.__lists: Lists = Lists()
+        # Not indexed while lazy, until everything has been
+        # parsed.
+        self.__searches: SearchIndex = SearchIndex(find_glossed, indexed=mapped is None)
+        # Whether anything has changed since it was loaded.
+        self.__unsaved: bool = False
+        if mapped is not None:
+            for line_number, (list_name, kanji, normalized) in enumerate(
+                mapped.lines()
+            ):
+                kanji_id = self.__load(list_name, kanji)
+                self.__columns.map_line(kanji_id, line_number, normalized)
+        else:
+            for list_name, kanji, known, kana_list in self.__storage.load_parallel(
+                processes
+            ):
+                kanji_id = self.__load(list_name, kanji, known, tuple(kana_list))
+                self.__index(kanji_id)
+            if len(self.__readings) == 0:
+                self.__readings.seed(
+                    (self.__columns.kanji_of(kanji_id), kana[0])
+                    for kanji_id in self.__columns.ids()
+                    if len(kana := self.__columns.kana_of(kanji_id)) == 1
+                )
+
+    def __load(
+        self,
+        list_name: str,
+        kanji: str,
+        known: bool = False,
+        kana: tuple[str, ...] = (),
+    ) -> int:
+        """Adds a kanji, or replaces it if it's already
+        there, and returns its id. Strings are NFC normalized
+        here, as they come in, so that nothing else has to."""
+        kanji = normalize("NFC", kanji)
+        kana = tuple(normalize("NFC", k) for k in kana)
+        if len(kana) > 1:
+            kana = tuple(sorted(kana))
+        kanji_id = self.__columns.get_id(kanji)
+        if kanji_id is None:
+            kanji_id = self.__columns.add(kanji, known, kana)
+        else:
+            self.__columns.set(kanji_id, known, kana)
+        self.__lists.put(kanji_id, list_name, self.__columns.kanji_of)
+        return kanji_id
+
+    def __id(self, kanji: str) -> int:
+        kanji_id = self.__columns.get_id(kanji)
+        assert kanji_id is not None, kanji
+        return kanji_id
+
+    def __load_all(self) -> None:
+        """Parses and indexes everything that hasn't been,
+        and stops being lazy, for things that need all of
+        the vocab."""
+        if not self.__columns.lazy:
+            return
+        self.__columns.parse_all()
+        self.__searches.start_indexing()
+        for kanji_id in self.__columns.ids():
+            self.__index(kanji_id)
 
     def save(self) -> None:
+        """Lazy, with nothing changed, there is nothing to
+        save, and a session that only searches doesn't parse
+        the whole vocab to write it out again. Readings still
+        being generated are waited for."""
+        self.apply_readings(block=True)
+        if self.__columns.lazy and not self.__unsaved:
+            return
+        self.__load_all()
+        self.__compact()
         try:
-            with open(self.__filename, "w", encoding="utf-8") as f:
-                for list_name in sorted(self.__list_to_kanji):
-                    for kanji in sorted(self.__list_to_kanji[list_name]):
-                        kanji_info: KanjiInfo = self.__kanji_to_info[kanji]
-                        if kanji in kanji_info.kana_list:
-                            kanji_info.kana_list.remove(kanji)
-                        kanji_info.kana_list = sorted(kanji_info.kana_list)
-                        f.write(
-                            normalize(
-                                "NFC",
-                                f"{list_name},{kanji},"
-                                + f"{1 if kanji_info.known else 0},"
-                                + f"{','.join(kanji_info.kana_list)}\n",
-                            )
-                        )
-        except OSError as err:
-            print(
-                _("{vocab_file}-failed-to-write-{err}").format(
-                    vocab_file=self.__filename, err=err
+            self.__storage.save(self.__rows())
+        except STORAGE_ERRORS as err:
+            self.__failed_to_write(err)
+            sys.exit(1)
+
+    def __compact(self) -> None:
+        """Drops the ids of deleted kanji, if there are
+        enough of them, so that adding and deleting kanji
+        doesn't grow the columns forever. It's only done when
+        nothing is lazy, and no readings are pending, whose
+        keys are ids."""
+        deleted = self.__columns.deleted_count
+        if deleted <= (len(self.__columns) + deleted) * Vocab.__MAX_DELETED:
+            return
+        new_ids = self.__columns.compact()
+        self.__lists.compact(new_ids)
+        self.__searches.compact(new_ids)
+
+    def __failed_to_write(self, err: Exception) -> None:
+        """Says that writing failed, which, for a change, is
+        tried again when the vocab is saved."""
+        print(
+            _("{vocab_file}-failed-to-write-{err}").format(
+                vocab_file=self.filename, err=err
+            )
+        )
+
+    def __rows(self) -> Iterator[Row]:
+        """Generates the rows to save, in list name and kanji
+        order, leaving out kana that are the same as their
+        kanji."""
+        for list_name in self.__lists.sorted_names():
+            for kanji_id in self.__lists.ids(list_name):
+                yield Vocab.__saved(
+                    (
+                        list_name,
+                        self.__columns.kanji_of(kanji_id),
+                        self.__columns.known_of(kanji_id),
+                        self.__columns.kana_of(kanji_id),
+                    )
                 )
+
+    @staticmethod
+    def __saved(row: Row) -> Row:
+        """A row as it's saved, without kana that are the
+        same as its kanji, which are the same however it's
+        stored."""
+        list_name, kanji, known, kana = row
+        if kanji in kana:
+            kana = tuple(k for k in kana if k != kanji)
+        return (list_name, kanji, known, kana)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Listeners are told about every change, once, with
+        the kanji that it changed, so that they can forget
+        anything they have worked out from them."""
+        self.__change_listeners.append(listener)
+
+    def __changed(self, changes: list[tuple[int, str]], words: bool = True) -> None:
+        """Called after a change, with the id and kanji of
+        each kanji that it changed, and with the old kanji as
+        well when a kanji is changed or deleted. Words is
+        False when only known status changed. However many
+        kanji it changed, it's written in one go, and
+        listeners are told once."""
+        rows: list[tuple[int, Row | None]] = []
+        for kanji_id, _kanji in changes:
+            if words:
+                self.__index(kanji_id)
+            self.__columns.changed(kanji_id)
+            rows.append((kanji_id, self.__row(kanji_id)))
+        self.__searches.changed(rows)
+        try:
+            self.__storage.changed(
+                [
+                    (
+                        kanji,
+                        (
+                            Vocab.__saved(row)
+                            if row is not None and row[1] == kanji
+                            else None
+                        ),
+                    )
+                    for (_kanji_id, kanji), (_id, row) in zip(changes, rows)
+                ]
+            )
+        except STORAGE_ERRORS as err:
+            self.__failed_to_write(err)
+        self.__unsaved = True
+        kanji_list = [kanji for _kanji_id, kanji in changes]
+        for listener in self.__change_listeners:
+            listener(kanji_list, words)
+
+    def __row(self, kanji_id: int) -> Row | None:
+        """A kanji's row, or None if it has been deleted."""
+        if self.__columns.is_deleted(kanji_id):
+            return None
+        return (
+            self.__lists.name_of(kanji_id),
+            self.__columns.kanji_of(kanji_id),
+            self.__columns.known_of(kanji_id),
+            self.__columns.kana_of(kanji_id),
+        )
+
+    def __index(self, kanji_id: int) -> None:
+        """Updates the search indexes for a kanji, whether
+        it has been added, changed, or deleted."""
+        if self.__searches.indexed:
+            self.__searches.index(
+                kanji_id,
+                ""
+                if self.__columns.is_deleted(kanji_id)
+                else "".join(
+                    set(self.__columns.kanji_of(kanji_id)).union(
+                        *self.__columns.kana_of(kanji_id)
+                    )
+                ),
             )
-            sys.exit(1)
 
     @property
     def filename(self) -> str:
-        return self.__filename
+        return self.__storage.filename
 
     @filename.setter
     def filename(self, filename: str) -> None:
-        self.__filename = filename
+        """Changes where the vocab will be saved, in the
+        format that the file name's extension says, which is
+        how it is exported or imported."""
+        self.__load_all()
+        self.__storage = open_storage(filename)
 
     def get_info(self) -> tuple[int, int]:
         """Returns a tuple of (known, learning) counts."""
-        known_count = 0
-        learning = 0
-        for list_kanji in self.__list_to_kanji.values():
-            for kanji in list_kanji:
-                known = self.__kanji_to_info[kanji].known
-                if known:
-                    known_count += 1
-                else:
-                    learning += 1
-        return (known_count, learning)
+        self.__load_all()
+        known_count = self.__columns.known_count
+        return (known_count, len(self.__columns) - known_count)
+
+    def get_list_info(self) -> dict[str, tuple[int, int]]:
+        """Returns (known, learning) counts for each list
+        that has kanji in it, in list name order."""
+        self.__load_all()
+        return self.__lists.info(self.__columns.known)
 
     def get_list_name(self, kanji: str) -> str:
         """A numeric name of the list that the kanji is in."""
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        return self.__kanji_to_list[kanji]
+        return self.__lists.name_of(self.__id(kanji))
 
     def __contains__(self, kanji: str) -> bool:
-        assert Vocab.valid_string(kanji), kanji
-        return kanji in self.__kanji_to_info
+        assert valid_string(kanji), kanji
+        return normalize("NFC", kanji) in self.__columns
 
     def contains(self, kanji: str, kana: str | None = None) -> bool:
-        assert Vocab.valid_string(kanji), kanji
-        assert kana is None or Vocab.valid_string(kana), kana
-        return kanji in self.__kanji_to_info and (
-            kana is None or kana in self.__kanji_to_info[kanji].kana_list
+        assert valid_string(kanji), kanji
+        assert kana is None or valid_string(kana), kana
+        kanji = normalize("NFC", kanji)
+        kana = None if kana is None else normalize("NFC", kana)
+        return kanji in self.__columns and (
+            kana is None or kana in self.__columns.kana_of(self.__id(kanji))
         )
 
-    def search(self, s: str, exact: bool = False) -> list[str]:
-        """Search for a string in the kanji and their kana.
+    def search_page(
+        self, s: str, exact: bool = False, start: int = 0, count: int | None = None
+    ) -> tuple[int, list[str]]:
+        """Search for a string, or a query, see query.py, in
+        the kanji and their kana, and return the total number
+        of matches, and count matches from start, best
+        matches first.
+
+        Only the best twice as many as start plus count are
+        ranked, without sorting the rest, and remembered, see
+        search.py, so that the next page, or the same search
+        again, is a slice of them, without searching again.
+        Pages past them rank twice as many again.
         Parameters
         ==========
           exact : True means an exact match.
+          start : the number of best matches to skip.
+          count : the maximum number of matches to return,
+                  None for all of them.
         """
-        assert Vocab.valid_string(s), s
-        assert isinstance(exact, bool)
-        kanji_found = []
-        for kanji in self.__kanji_to_list:
-            kana_list = self.__kanji_to_info[kanji].kana_list
-            if (
-                not exact
-                and (s in kanji or any(s in kana for kana in kana_list))
-                or exact
-                and s == kanji
-            ):
-                kanji_found.append(kanji)
-        return kanji_found
+        assert valid_index(start), start
+        assert count is None or valid_index(count), count
+        s = normalize("NFC", s)
+        end = None if count is None else start + count
+        result = self.__searches.found(s, exact)
+        if result is not None and len(result[1]) < result[0]:
+            # Only the best are ranked, is the page past them?
+            if end is None or end > len(result[1]):
+                result = None
+        if result is None:
+            search = None if exact else self.__search(s)
+            result = self.__ranked(s, search, None if end is None else end * 2)
+            self.__searches.remember(s, exact, search, *result)
+        total, found = result
+        page = islice(found, start, end)
+        return total, [self.__columns.kanji_of(kanji_id) for kanji_id in page]
+
+    def __ranked(
+        self, s: str, search: Search | None, best: int | None
+    ) -> tuple[int, Found]:
+        """The number of matches for a search, exact if it
+        is None, and the ids of the best of them, best first,
+        all of them if best is None."""
+        matches = self.__matches(s, search)
+        if best is None:
+            ranked = sorted(matches)
+            return len(ranked), dict.fromkeys(kanji_id for *_, kanji_id in ranked)
+        # Counted as they are ranked, rather than kept. zip
+        # stops at the end of the matches, before counting.
+        counted = count()
+        ranked = nsmallest(best, (match for match, _ in zip(matches, counted)))
+        return next(counted), dict.fromkeys(kanji_id for *_, kanji_id in ranked)
+
+    def __search(self, s: str) -> Search:
+        query = parse_query(s)
+        assert query is not None, s
+        return self.__searches.search(query)
+
+    def __matches(self, s: str, search: Search | None) -> Iterator[SearchMatch]:
+        """Generates the matches for a search, exact if it
+        is None, in no particular order, with what they are
+        ranked by.
+
+        Exact kanji matches come first, then exact kana
+        matches of the first term, then prefix matches, then
+        other matches, with unknown kanji before known kanji,
+        then in the order they were added."""
+        assert valid_string(s), s
+        if search is None:
+            if s in self.__columns:
+                kanji_id = self.__id(s)
+                yield (Vocab.__EXACT_KANJI, self.__columns.known_of(kanji_id), kanji_id)
+            return
+        for kanji_id in self.__plan(search):
+            kanji = self.__columns.kanji_of(kanji_id)
+            kana = self.__columns.kana_of(kanji_id)
+            known = self.__columns.known_of(kanji_id)
+            if search.matches(kanji, kana, self.__lists.name_of(kanji_id), known):
+                terms = search.query.terms
+                relevance = (
+                    Vocab.__relevance(terms[0], kanji, kana)
+                    if len(terms) > 0
+                    else Vocab.__EXACT_KANJI
+                )
+                yield (relevance, known, kanji_id)
+
+    def __plan(self, search: Search) -> Iterable[int]:
+        """Picks the smallest index that every match of a
+        search is in, to check it against, rather than
+        checking it against every kanji."""
+        query = search.query
+        plans: list[tuple[int, Iterable[int]]] = [
+            (len(self.__columns), self.__columns.ids())
+        ]
+        if query.lists is not None:
+            first, last = query.lists
+            lists = self.__lists.in_range(first, last)
+            plans.append((sum(len(ids) for ids in lists), chain.from_iterable(lists)))
+        if query.known is not None and self.__searches.indexed:
+            known_count = self.__columns.known_count
+            plans.append(
+                (
+                    known_count if query.known else len(self.__columns) - known_count,
+                    self.__known_ids(query.known),
+                )
+            )
+        if search.glossed_kanji is not None:
+            glossed = [
+                self.__id(kanji) for kanji in search.glossed_kanji if kanji in self
+            ]
+            plans.append((len(glossed), glossed))
+        if len(query.required_chars) > 0 and self.__columns.lazy:
+            found = min(
+                (self.__columns.find(char) for char in query.required_chars), key=len
+            )
+            plans.append((len(found), found))
+        elif len(query.required_chars) > 0:
+            postings = min(
+                (self.__searches.postings(char) for char in query.required_chars),
+                key=len,
+            )
+            plans.append((len(postings), postings))
+        _count, ids = min(plans, key=lambda plan: plan[0])
+        return ids
+
+    def __known_ids(self, known: bool) -> Iterator[int]:
+        """The ids of the kanji that are known, or not, which
+        are only found if it's the plan that is used."""
+        column = (
+            self.__columns.known
+            if known
+            else self.__columns.known.translate(Vocab.__UNKNOWN)
+        )
+        for kanji_id in compress(range(len(column)), column):
+            if not self.__columns.is_deleted(kanji_id):
+                yield kanji_id
+
+    @staticmethod
+    def __relevance(s: str, kanji: str, kana_list: Sequence[str]) -> int:
+        """How well a kanji matches a search term that it
+        matches, lower is better."""
+        if s == kanji:
+            return Vocab.__EXACT_KANJI
+        if s in kana_list:
+            return Vocab.__EXACT_KANA
+        if kanji.startswith(s) or any(kana.startswith(s) for kana in kana_list):
+            return Vocab.__PREFIX
+        return Vocab.__SUBSTRING
 
     def add(self, kanji: str, list_name: str | None = None) -> str:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji not in self, kanji
-        assert list_name is None or Vocab.valid_list_name(list_name), list_name
+        assert list_name is None or valid_list_name(list_name), list_name
         if list_name is None:
             list_name = self.new_kanji_list_name()
-        kana = "".join([result["hira"] for result in self.__kks.convert(kanji)])
-        known = False
-        kana_list = [kana] if kana != kanji else []
-        self.__list_to_kanji[list_name].append(kanji)
-        self.__kanji_to_list[kanji] = list_name
-        self.__kanji_to_info[kanji] = KanjiInfo(known, kana_list)
+        kanji_id = self.__load(list_name, kanji, False, ())
+        kana = self.__readings.request(kanji_id, kanji)
+        if kana is not None and kana != kanji:
+            self.__columns.set_kana(kanji_id, (kana,))
+        self.__changed([(kanji_id, kanji)])
         assert kanji in self, kanji
         return list_name
 
+    def apply_readings(self, block: bool = False) -> None:
+        """Gives kanji the readings that have been generated
+        for them in the background since they were added. A
+        kanji that has since been deleted, renamed, or had its
+        kana changed, had its reading cancelled. If block is
+        true, it waits for all of them."""
+        for kanji_id, kana in self.__readings.ready(block):
+            kanji = self.__columns.kanji_of(kanji_id)
+            if kana != kanji:
+                self.__columns.set_kana(kanji_id, (kana,))
+                self.__changed([(kanji_id, kanji)])
+
     def change(self, kanji: str, new_kanji: str) -> None:
-        assert Vocab.valid_string(kanji), kanji
+        """Only the kanji's entry in the table of kanji
+        strings changes, its id, and so everything else, stays
+        the same."""
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
+        new_kanji = normalize("NFC", new_kanji)
         assert kanji in self, kanji
-        assert Vocab.valid_string(new_kanji), kanji
+        assert valid_string(new_kanji), kanji
         assert new_kanji not in self, kanji
         assert new_kanji != kanji
-        list_name = self.__kanji_to_list[kanji]
-        self.__list_to_kanji[list_name].append(new_kanji)
-        self.__list_to_kanji[list_name].remove(kanji)
-        self.__kanji_to_list[new_kanji] = list_name
-        self.__kanji_to_list.pop(kanji)
-        self.__kanji_to_info[new_kanji] = copy(self.__kanji_to_info[kanji])
-        self.__kanji_to_info.pop(kanji)
+        kanji_id = self.__id(kanji)
+        self.__readings.cancel(kanji_id)
+        self.__columns.rename(kanji_id, new_kanji)
+        self.__lists.put(
+            kanji_id, self.__lists.name_of(kanji_id), self.__columns.kanji_of
+        )
+        try:
+            self.__storage.renamed(kanji, new_kanji)
+        except STORAGE_ERRORS as err:
+            self.__failed_to_write(err)
+        self.__changed([(kanji_id, kanji), (kanji_id, new_kanji)])
         assert kanji not in self, kanji
         assert new_kanji in self, kanji
-        assert self.get_list_name(new_kanji) == list_name
 
     # Public for tests.
     def new_kanji_list_name(self) -> str:
         """Public for tests."""
-        list_name = max(self.__list_to_kanji.keys())
-        if len(self.__list_to_kanji[list_name]) >= Vocab.ITEMS_PER_LIST:
+        list_name = self.__lists.last_name()
+        if len(self.__lists.ids(list_name)) >= Vocab.ITEMS_PER_LIST:
             list_name = f"{int(list_name) + Vocab.ITEMS_PER_LIST:04d}"
-            self.__list_to_kanji[list_name] = []
-        assert Vocab.valid_list_name(list_name), list_name
+            self.__lists.add(list_name)
+        assert valid_list_name(list_name), list_name
         return list_name
 
-    # Public for tests.
-    def count_in_current_list(self) -> int:
-        list_name = max(self.__list_to_kanji.keys())
-        return len(self.__list_to_kanji[list_name])
+    def count_in_list(self, list_name: str | None = None) -> int:
+        """The number of kanji in a list, the current one if
+        none is given, 0 if there is no such list."""
+        assert list_name is None or valid_list_name(list_name), list_name
+        return len(
+            self.__lists.ids(
+                self.__lists.last_name() if list_name is None else list_name
+            )
+        )
 
     def delete(self, kanji: str) -> str:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        list_name = self.__kanji_to_list[kanji]
-        self.__list_to_kanji[list_name].remove(kanji)
-        self.__kanji_to_list.pop(kanji)
-        self.__kanji_to_info.pop(kanji)
+        kanji_id = self.__id(kanji)
+        self.__readings.cancel(kanji_id)
+        list_name = self.__lists.name_of(kanji_id)
+        self.__lists.remove(kanji_id)
+        self.__columns.delete(kanji_id)
+        self.__changed([(kanji_id, kanji)])
         assert kanji not in self, kanji
         return list_name
 
-    def add_kana(self, kanji: str, kana: str, index: int | None = None) -> int:
-        assert Vocab.valid_string(kanji), kanji
+    def add_kana(self, kanji: str, kana: str) -> int:
+        """Adds a kana in kana order, and returns where it
+        went."""
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        assert Vocab.valid_string(kana), kana
+        kana = normalize("NFC", kana)
+        assert valid_string(kana), kana
         assert not self.contains(kanji, kana), kanji
-        assert index is None or Vocab.valid_index(index)
-        kana_list = self.__kanji_to_info[kanji].kana_list
-        if index is None:
-            index = len(kana_list)
-        kana_list.insert(index, kana)
+        kanji_id = self.__id(kanji)
+        self.__readings.cancel(kanji_id)
+        kana_list = self.__columns.kana_of(kanji_id)
+        index = bisect_left(kana_list, kana)
+        self.__columns.set_kana(
+            kanji_id, kana_list[:index] + (kana,) + kana_list[index:]
+        )
+        self.__changed([(kanji_id, kanji)])
         assert self.contains(kanji, kana), kanji + ", " + kana
-        return kana_list.index(kana)
+        return index
 
     def get_kana(self, kanji: str) -> list[str]:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        return self.__kanji_to_info[kanji].kana_list
-
-    def replace_all_kana(self, kanji: str, kana_list: list[str]) -> None:
-        assert Vocab.valid_string(kanji), kanji
-        assert Vocab.valid_kana_list(kana_list), kana_list
-        known = self.__kanji_to_info[kanji].known
-        self.__kanji_to_info[kanji] = KanjiInfo(known, kana_list)
+        return list(self.__columns.kana_of(self.__id(kanji)))
+
+    def kana_lists(self) -> Iterator[tuple[str, list[str]]]:
+        """Generates every kanji, with its kana, in list name
+        and kanji order."""
+        for _list_name, kanji, _known, kana in self.__rows():
+            yield (kanji, list(kana))
+
+    def replace_all_kana(self, kana_lists: list[tuple[str, list[str]]]) -> None:
+        """Replaces the kana of kanji, kanji and kana list,
+        as one change."""
+        assert isinstance(kana_lists, list), kana_lists
+        changes: list[tuple[int, str]] = []
+        for kanji, kana_list in kana_lists:
+            assert valid_string(kanji), kanji
+            assert valid_kana_list(kana_list), kana_list
+            kanji = normalize("NFC", kanji)
+            kanji_id = self.__id(kanji)
+            self.__readings.cancel(kanji_id)
+            self.__columns.set_kana(
+                kanji_id, tuple(sorted(normalize("NFC", k) for k in kana_list))
+            )
+            changes.append((kanji_id, kanji))
+        if len(changes) > 0:
+            self.__changed(changes)
 
     def change_kana(self, kanji: str, kana: str, new_kana: str) -> None:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
+        kana = normalize("NFC", kana)
+        new_kana = normalize("NFC", new_kana)
         assert kanji in self, kanji
-        assert Vocab.valid_string(kana), kana
+        assert valid_string(kana), kana
         assert self.contains(kanji, kana), kanji
-        assert Vocab.valid_string(new_kana), kana
+        assert valid_string(new_kana), kana
         assert not self.contains(kanji, new_kana), kanji
-        kanji_info = self.__kanji_to_info[kanji]
-        kanji_info.kana_list[kanji_info.kana_list.index(kana)] = new_kana
+        kanji_id = self.__id(kanji)
+        self.__readings.cancel(kanji_id)
+        kana_list = self.__columns.kana_of(kanji_id)
+        index = kana_list.index(kana)
+        kana_list = kana_list[:index] + kana_list[index + 1 :]
+        index = bisect_left(kana_list, new_kana)
+        self.__columns.set_kana(
+            kanji_id, kana_list[:index] + (new_kana,) + kana_list[index:]
+        )
+        self.__changed([(kanji_id, kanji)])
         assert not self.contains(kanji, kana), kanji
         assert self.contains(kanji, new_kana), kanji
 
     def delete_kana(self, kanji: str, kana: str) -> int:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
+        kana = normalize("NFC", kana)
         assert kanji in self, kanji
-        assert Vocab.valid_string(kana), kana
+        assert valid_string(kana), kana
         assert self.contains(kanji, kana), kanji
-        index = self.__kanji_to_info[kanji].kana_list.index(kana)
-        self.__kanji_to_info[kanji].kana_list.remove(kana)
+        kanji_id = self.__id(kanji)
+        self.__readings.cancel(kanji_id)
+        kana_list = self.__columns.kana_of(kanji_id)
+        index = kana_list.index(kana)
+        self.__columns.set_kana(kanji_id, kana_list[:index] + kana_list[index + 1 :])
+        self.__changed([(kanji_id, kanji)])
         assert not self.contains(kanji, kana), kanji
         return index
 
     def is_known(self, kanji: str) -> bool:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        return self.__kanji_to_info[kanji].known
+        return self.__columns.known_of(self.__id(kanji))
 
     def toggle_known(self, kanji: str) -> bool:
-        assert Vocab.valid_string(kanji), kanji
+        assert valid_string(kanji), kanji
+        kanji = normalize("NFC", kanji)
         assert kanji in self, kanji
-        self.__kanji_to_info[kanji].known = not self.__kanji_to_info[kanji].known
-        return self.__kanji_to_info[kanji].known
-
-    def set_known(self, kanji: str, known: bool) -> None:
-        assert Vocab.valid_string(kanji), kanji
+        known = not self.is_known(kanji)
+        self.set_known([kanji], known)
+        return known
+
+    def set_known(self, kanji_list: list[str], known: bool) -> None:
+        """Sets kanji known, or not, as one change."""
+        assert isinstance(kanji_list, list), kanji_list
+        assert all(valid_string(kanji) for kanji in kanji_list), kanji_list
         assert isinstance(known, bool)
-        self.__kanji_to_info[kanji].known = known
-
-    @staticmethod
-    def valid_index(i: int) -> bool:
-        return isinstance(i, int) and i >= 0
-
-    @staticmethod
-    def valid_kana_list(kana_list: list[str]) -> bool:
-        return isinstance(kana_list, list) and all(
-            isinstance(k, str) and len(k) > 0 for k in kana_list
+        self.__set_known(
+            [self.__id(normalize("NFC", kanji)) for kanji in kanji_list], known
         )
 
-    @staticmethod
-    def valid_list_name(list_name: str) -> bool:
-        return isinstance(list_name, str) and list_name.isnumeric()
-
-    @staticmethod
-    def valid_string(s: str) -> bool:
-        return isinstance(s, str) and len(s) > 0
+    def set_list_known(self, list_name: str, known: bool) -> list[str]:
+        """Sets every kanji in a list known, or not, as one
+        change, and returns the kanji that changed."""
+        assert valid_list_name(list_name), list_name
+        assert isinstance(known, bool)
+        changed = [
+            kanji_id
+            for kanji_id in self.__lists.ids(list_name)
+            if self.__columns.known_of(kanji_id) != known
+        ]
+        self.__set_known(changed, known)
+        return [self.__columns.kanji_of(kanji_id) for kanji_id in changed]
+
+    def __set_known(self, kanji_ids: list[int], known: bool) -> None:
+        if len(kanji_ids) == 0:
+            return
+        for kanji_id in kanji_ids:
+            self.__columns.set_known(kanji_id, known)
+        self.__changed(
+            [(kanji_id, self.__columns.kanji_of(kanji_id)) for kanji_id in kanji_ids],
+            words=False,
+        )
@@ -0,0 +1,26 @@
+import os
+import pathlib
+import subprocess
+import sys
+import zipfile
+
+
+def test_bundle(tmp_path: pathlib.Path) -> None:
+    bundle = str(tmp_path / "nevsjapanesevocab.pyz")
+    subprocess.run(["bash", "scripts/bundle", bundle], check=True)
+    with zipfile.ZipFile(bundle) as f:
+        names = f.namelist()
+    assert "vocab.pyc" in names
+    assert "vocab.py" not in names
+    assert "catalog.pyc" in names
+    # Nothing from src, or the locales directory.
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONPATH"}
+    help_text = subprocess.run(
+        [sys.executable, bundle, "--help"],
+        capture_output=True,
+        check=True,
+        cwd=tmp_path,
+        env=env,
+        text=True,
+    ).stdout
+    assert "語彙ファイル。" in help_text
@@ -0,0 +1,46 @@
+import pathlib
+
+import pytest
+
+from caches import LruTable
+from caches import connect_versioned
+from caches import open_in_cache_dir
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS items (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        used INTEGER NOT NULL
+    );
+"""
+
+
+def test_versioned(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "cache.db")
+    items = LruTable(
+        connect_versioned(filename, SCHEMA, "thing", "1", ["items"]),
+        "items",
+        ("key", "value"),
+        2,
+    )
+    items.put([("a", "1"), ("b", "2")])
+    items.put([("c", "3")])
+    assert len(items) == 2
+    assert items.get("a") is None
+    connection = connect_versioned(filename, SCHEMA, "thing", "1", ["items"])
+    assert LruTable(connection, "items", ("key", "value"), 2).get("c") == "3"
+    connection = connect_versioned(filename, SCHEMA, "thing", "2", ["items"])
+    assert len(LruTable(connection, "items", ("key", "value"), 2)) == 0
+
+
+def test_open_in_cache_dir(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert open_in_cache_dir("cache.db", lambda filename: filename) == str(
+        tmp_path / "nevsjapanesevocab" / "cache.db"
+    )
+    # Not a directory, so in memory.
+    (tmp_path / "file").touch()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "file"))
+    assert open_in_cache_dir("cache.db", lambda filename: filename) is None
@@ -0,0 +1,52 @@
+import pathlib
+import sqlite3
+
+from check import check_vocab
+from vocab import Vocab
+
+
+def test_check_good_vocab() -> None:
+    assert not list(check_vocab("tests/test_data/vocab_good.csv"))
+
+
+def test_check_vocab(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "vocab.csv")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(
+            "0100,研究,0,けんきゅう\n"
+            + "0100,送る\n"
+            + "asdd,呼ぶ,0,よぶ\n"
+            + "0100,すし,0,すし\n"
+            + "0200,研究,2,けんきゅう\n"
+            + "0200,研究,1,けんきゅう\n"
+            + "0200,工場,0,,\n"
+            + "0300,すし,0,\n"
+        )
+    assert list(check_vocab(filename)) == [
+        "line 2: bad line '0100,送る', 2 fields, expected at least 4.",
+        "line 3: bad list name 'asdd', expected numeric.",
+        "line 4: kana 'すし' is the same as the kanji.",
+        "line 5: bad known status '2', expected 0 or 1.",
+        "line 7: bad kana list ','",
+        "line 6: kanji '研究' in list 0200 is also on line 1 in list 0100, "
+        + "only the last is kept.",
+        "line 8: kanji 'すし' in list 0300 is also on line 4 in list 0100, "
+        + "only the last is kept.",
+    ]
+
+
+def test_check_database(tmp_path: pathlib.Path) -> None:
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    vocab.filename = str(tmp_path / "vocab.db")
+    vocab.save()
+    # Written as it happens.
+    vocab.add("すし")
+    # Not written by the vocab, which leaves it out.
+    with sqlite3.connect(vocab.filename) as connection:
+        connection.execute(
+            "INSERT INTO kana SELECT id, 0, kanji FROM vocab WHERE kanji = 'すし'"
+        )
+    connection.close()
+    assert list(check_vocab(vocab.filename)) == [
+        "line 6: kana 'すし' is the same as the kanji."
+    ]
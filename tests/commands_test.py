@@ -3,11 +3,13 @@ from test_helpers import strip_ansi_terminal_escapes
 
 from commands import AddCommand
 from commands import AddKanaCommand
+from commands import AddReadingsCommand
 from commands import ChangeCommand
 from commands import ChangeKanaCommand
 from commands import CommandStack
 from commands import DeleteCommand
 from commands import DeleteKanaCommand
+from commands import SetListKnownCommand
 from commands import ToggleKnownCommand
 from vocab import Vocab
 
@@ -121,7 +123,7 @@ def test_new_kana_command(vocab: Vocab, command_stack: CommandStack) -> None:
     assert vocab.get_kana("送る") == ["おくる"]
     command_stack.do(AddKanaCommand(vocab, "送る", "new"))
     assert vocab.contains("送る", "new")
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     message = command_stack.undo()
     assert message == "new-deleted-from-送る"
     assert not vocab.contains("送る", "new")
@@ -129,7 +131,7 @@ def test_new_kana_command(vocab: Vocab, command_stack: CommandStack) -> None:
     message = command_stack.redo()
     assert message == "new-added-to-送る"
     assert vocab.contains("送る", "new")
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     command_stack.undo()
     assert not vocab.contains("送る", "new")
     assert vocab.get_kana("送る") == ["おくる"]
@@ -150,7 +152,7 @@ def test_change_kana_command(vocab: Vocab, command_stack: CommandStack) -> None:
     assert not vocab.contains("new", "kana")
     assert vocab.contains("new", "kana2")
     assert vocab.contains("new", "kana3")
-    assert ["kana3", "kana2"] == vocab.get_kana("new")
+    assert ["kana2", "kana3"] == vocab.get_kana("new")
     message = command_stack.undo()
     assert message == "kana3-changed-back-to-kana-for-new"
     assert command_stack.current() == 2
@@ -175,7 +177,7 @@ def test_delete_kana_command(vocab: Vocab, command_stack: CommandStack) -> None:
     assert vocab.get_kana("送る") == ["おくる"]
     command_stack.do(AddKanaCommand(vocab, "送る", "new"))
     assert vocab.contains("送る", "new")
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     command_stack.do(DeleteKanaCommand(vocab, "送る", "おくる"))
     assert vocab.get_kana("送る") == ["new"]
     command_stack.do(AddKanaCommand(vocab, "送る", "new2"))
@@ -190,12 +192,12 @@ def test_delete_kana_command(vocab: Vocab, command_stack: CommandStack) -> None:
     command_stack.undo()
     assert vocab.get_kana("送る") == ["new"]
     command_stack.undo()
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     command_stack.undo()
     assert not command_stack.undoable()
     message = command_stack.redo()
     assert message == "new-added-to-送る"
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     command_stack.redo()
     assert vocab.get_kana("送る") == ["new"]
     command_stack.redo()
@@ -223,3 +225,34 @@ def test_toggle_status_command(vocab: Vocab, command_stack: CommandStack) -> Non
     assert vocab.is_known("送る") == (not known)
     command_stack.undo()
     assert vocab.is_known("送る") == known
+
+
+def test_set_list_known_command(vocab: Vocab, command_stack: CommandStack) -> None:
+    vocab.toggle_known("送る")
+    command_stack.do(SetListKnownCommand(vocab, "0100", True))
+    assert vocab.get_info() == (5, 0)
+    message = command_stack.undo()
+    assert message == "set-4-in-list-0100-unknown"
+    assert vocab.get_info() == (1, 4)
+    assert vocab.is_known("送る")
+    message = command_stack.redo()
+    assert message == "set-4-in-list-0100-known"
+    assert vocab.get_info() == (5, 0)
+
+
+def test_add_readings_command(vocab: Vocab, command_stack: CommandStack) -> None:
+    vocab.add("新しい")
+    vocab.delete_kana("新しい", "あたらしい")
+    readings = [("新しい", "あたらしい"), ("研究", "けんきゅ")]
+    changes: list[list[str]] = []
+    vocab.add_change_listener(lambda kanji, _words: changes.append(kanji))
+    command_stack.do(AddReadingsCommand(vocab, readings))
+    # As one change.
+    assert changes == [["新しい", "研究"]]
+    assert vocab.get_kana("新しい") == ["あたらしい"]
+    assert vocab.get_kana("研究") == ["けんきゅ", "けんきゅう"]
+    assert command_stack.undo() == "deleted-2-readings"
+    assert not vocab.get_kana("新しい")
+    assert vocab.get_kana("研究") == ["けんきゅう"]
+    assert command_stack.redo() == "added-2-readings"
+    assert vocab.get_kana("研究") == ["けんきゅ", "けんきゅう"]
@@ -0,0 +1,35 @@
+import os
+import pathlib
+
+import pytest
+from test_helpers import checked_kanji
+
+from glosses import GlossIndex
+from vocab import Vocab
+
+
+def test_glosses(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    filename = GlossIndex.filename_for(str(tmp_path / "vocab.csv"))
+    assert filename == str(tmp_path / "vocab-glosses.db")
+    glosses = GlossIndex(filename)
+    # Not built.
+    assert not glosses.find(["research"])
+    assert not os.path.exists(filename)
+    vocab = Vocab("tests/test_data/vocab_good.csv", find_glossed=glosses.find)
+    vocab.add("asdasd")
+    assert glosses.build(vocab.kana_lists()) == 6
+    assert glosses.build(vocab.kana_lists()) == 0
+    assert glosses.find(["research"]) == {"研究"}
+    assert glosses.find(["to", "collect"]) == {"集める"}
+    assert not glosses.find(["research", "collect"])
+    checked = checked_kanji(monkeypatch)
+    assert vocab.search_page("gloss:Research")[1] == ["研究"]
+    # Only the glossed kanji.
+    assert checked == ["研究"]
+    assert vocab.search_page("gloss:collect list:0100")[1] == ["集める"]
+    assert vocab.search_page("gloss:collect known:1")[0] == 0
+    vocab.add("新しい")
+    assert glosses.build(vocab.kana_lists()) == 1
+    # Opened again.
+    assert GlossIndex(filename).find(["new"]) == {"新しい"}
+    assert Vocab("tests/test_data/vocab_good.csv").search_page("gloss:research")[0] == 0
@@ -0,0 +1,31 @@
+from make_catalog import catalog_source
+
+from catalog import CATALOG
+from localisation import _
+from localisation import get_locale
+from localisation import set_locale
+from localisation import unset_locale
+
+
+def test_catalog_is_up_to_date() -> None:
+    # scripts/translate writes it.
+    with open("src/catalog.py", encoding="utf-8") as f:
+        assert f.read() == catalog_source()
+    assert sorted(CATALOG) == ["en", "es", "fr", "ja"]
+
+
+def test_set_locale() -> None:
+    for locale, loading in [
+        ("ja", "読み込み中"),
+        ("en", "Loading"),
+        ("ja", "読み込み中"),
+    ]:
+        set_locale(locale)
+        assert get_locale() == locale
+        assert _("loading") == loading
+        assert _("{kanji}-not-found").format(kanji="研究").startswith("研究")
+        # Not translated.
+        assert _("asdasd") == "asdasd"
+    unset_locale()
+    assert get_locale() is None
+    assert _("loading") == "loading"
@@ -0,0 +1,156 @@
+import pathlib
+import sqlite3
+import threading
+from typing import Any
+
+import pytest
+from jamdict import Jamdict  # type: ignore
+
+import lookups as lookups_module
+from lookups import DeckDictionary
+from lookups import LookupCache
+from lookups import open_deck_dictionary
+from vocab import Vocab
+
+
+def no_jamdict(**_kwargs: bool) -> None:
+    raise AssertionError("Jamdict made.")
+
+
+def no_lookup(_jamdict: Jamdict, search: str, **_kwargs: bool) -> None:
+    raise AssertionError(f"{search} looked up.")
+
+
+def test_lookup_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups = LookupCache(max_size=2, memory_size=1)
+    assert lookups.look_up("研究") == ["けんきゅう (研究) : study/research/investigation"]
+    assert not lookups.look_up("asdasd")
+    lookups.look_up("呼ぶ")
+    monkeypatch.setattr(Jamdict, "lookup", no_lookup)
+    # In memory.
+    assert lookups.look_up("呼ぶ")[0].startswith("よぶ (呼ぶ)")
+    # On disk.
+    assert not lookups.look_up("asdasd")
+    # The least recently used is forgotten.
+    with pytest.raises(AssertionError):
+        lookups.look_up("研究")
+
+
+def test_lookup_cache_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    filename = str(tmp_path / "lookups.db")
+    entries = LookupCache(filename).look_up("研究")
+    with monkeypatch.context() as patch:
+        patch.setattr(lookups_module, "new_jamdict", no_jamdict)
+        assert LookupCache(filename).look_up("研究") == entries
+    monkeypatch.setattr(lookups_module, "data_version", lambda: "0.0.0")
+    lookups = LookupCache(filename)
+    monkeypatch.setattr(lookups_module, "new_jamdict", no_jamdict)
+    with pytest.raises(AssertionError):
+        lookups.look_up("研究")
+
+
+def test_deck_dictionary(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    vocab_file = str(tmp_path / "vocab.csv")
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    vocab.add("かみ")
+    vocab.add("asdasd")
+    vocab.filename = vocab_file
+    vocab.save()
+    assert open_deck_dictionary(vocab_file) is None
+    DeckDictionary(DeckDictionary.filename_for(vocab_file)).build(vocab)
+    dictionary = open_deck_dictionary(vocab_file)
+    assert dictionary is not None
+    # The same as Jamdict.
+    for word in ["研究", "けんきゅう", "集める", "かみ", "asdasd"]:
+        assert dictionary.look_up(word) == LookupCache().look_up(word)
+    assert len(dictionary.look_up("かみ") or []) > 1
+    assert not dictionary.look_up("asdasd")
+    assert dictionary.look_up("新しい") is None
+    dictionary.follow(vocab)
+    entries = LookupCache().look_up("研究")
+    with monkeypatch.context() as patch:
+        patch.setattr(lookups_module, "new_jamdict", no_jamdict)
+        # Not indexed until a word that isn't indexed is
+        # looked up.
+        vocab.add("新しい")
+        vocab.toggle_known("新しい")
+        assert dictionary.look_up("研究") == entries
+    assert dictionary.look_up("新しい") == LookupCache().look_up("新しい")
+    assert dictionary.look_up("あたらしい") == LookupCache().look_up("あたらしい")
+    monkeypatch.setattr(Jamdict, "lookup", no_lookup)
+    lookups = LookupCache(dictionary=dictionary)
+    assert lookups.look_up("研究") == ["けんきゅう (研究) : study/research/investigation"]
+    with pytest.raises(AssertionError):
+        lookups.look_up("工事")
+
+
+def test_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Lookups are done when the test says so.
+    started = threading.Event()
+    go = threading.Event()
+    looked_up: list[str] = []
+    lookup = Jamdict.lookup
+
+    def blocked_lookup(jamdict: Jamdict, search: str, **kwargs: bool) -> Any:
+        started.set()
+        go.wait()
+        looked_up.append(search)
+        return lookup(jamdict, search, **kwargs)
+
+    monkeypatch.setattr(Jamdict, "lookup", blocked_lookup)
+    lookups = LookupCache(prefetch_size=2)
+    go.set()
+    lookups.look_up("工場")
+    go.clear()
+    started.clear()
+    lookups.prefetch(["研究", "呼ぶ", "送る"])
+    started.wait()
+    # A new search's prefetch cancels what hasn't started.
+    lookups.prefetch(["工場", "集める"])
+    go.set()
+    assert lookups.look_up("集める")[0].startswith("あつめる (集める)")
+    assert lookups.look_up("研究")[0].startswith("けんきゅう (研究)")
+    # Each once, 集める in the foreground if it hadn't started.
+    assert sorted(looked_up) == sorted(["工場", "研究", "集める"])
+    lookups.prefetch([])
+    assert lookups.look_up("呼ぶ")[0].startswith("よぶ (呼ぶ)")
+    assert sorted(looked_up) == sorted(["工場", "研究", "集める", "呼ぶ"])
+
+
+def test_prefetch_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    entries = LookupCache().look_up("研究")
+
+    def no_worker_jamdict(**kwargs: bool) -> Jamdict:
+        if kwargs.get("reuse_ctx") is False:
+            raise sqlite3.OperationalError("unable to open database file")
+        return Jamdict(**kwargs)
+
+    monkeypatch.setattr(lookups_module, "new_jamdict", no_worker_jamdict)
+    lookups = LookupCache(prefetch_size=1)
+    lookups.prefetch(["研究"])
+    # Looked up here instead.
+    assert lookups.look_up("研究") == entries
+
+
+def test_prefetch_doesnt_index(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    dictionary = DeckDictionary(str(tmp_path / "vocab-dictionary.db"))
+    dictionary.build(vocab)
+    dictionary.follow(vocab)
+    entries = LookupCache().look_up("新しい")
+    lookups = LookupCache(dictionary=dictionary, prefetch_size=1)
+    vocab.add("新しい")
+    with monkeypatch.context() as patch:
+        # No Jamdict is made here, and the worker thread's
+        # fails, so it's looked up here after all.
+        patch.setattr(lookups_module, "new_jamdict", no_jamdict)
+        lookups.prefetch(["新しい"])
+    assert lookups.look_up("新しい") == entries
+    # Indexed when it's next looked up, not prefetched.
+    assert dictionary.look_up("新しい") == entries
@@ -8,6 +8,8 @@ from io import StringIO
 import pytest
 from test_helpers import strip_ansi_terminal_escapes
 
+import nevsjapanesevocab
+import verify as verify_module
 from commands import CommandStack
 from localisation import _
 from localisation import set_locale
@@ -46,16 +48,16 @@ def vocab() -> Vocab:
         ("新しい", ["2", "-1"], ["新しい二"]),
         ("新しい", ["2", "0"], ["新しい二"]),
         ("新しい", ["2", "1"], ["新しい二", "あたらしいに"]),
-        ("新しい", ["2", "2"], ["新しい二", "かなに"]),
-        ("新しい", ["2", "3"], ["新しい二", "かなさん"]),
+        ("新しい", ["2", "2"], ["新しい二", "かなさん"]),
+        ("新しい", ["2", "3"], ["新しい二", "かなに"]),
         ("新しい", ["2", "4"], ["新しい二"]),
         ("新しい", ["2", "999"], ["新しい二"]),
         ("新しい", ["新しい二", "-50"], ["新しい二"]),
         ("新しい", ["新しい二", "-1"], ["新しい二"]),
         ("新しい", ["新しい二", "0"], ["新しい二"]),
         ("新しい", ["新しい二", "1"], ["新しい二", "あたらしいに"]),
-        ("新しい", ["新しい二", "2"], ["新しい二", "かなに"]),
-        ("新しい", ["新しい二", "3"], ["新しい二", "かなさん"]),
+        ("新しい", ["新しい二", "2"], ["新しい二", "かなさん"]),
+        ("新しい", ["新しい二", "3"], ["新しい二", "かなに"]),
         ("新しい", ["新しい二", "4"], ["新しい二"]),
         ("新しい", ["新しい二", "999"], ["新しい二"]),
     ],
@@ -63,7 +65,7 @@ def vocab() -> Vocab:
 def test_replace_indices(
     vocab: Vocab, search: str, params: list[str], expected_result: list[str]
 ) -> None:
-    found_kanji = vocab.search(search)
+    found_kanji = vocab.search_page(search)[1]
     assert (
         replace_indices(vocab, "あああああ", found_kanji, params, False) == expected_result
     )
@@ -197,15 +199,41 @@ def __io_general() -> list[IO]:
             "i",
             f'{_("info")}:\n  {_("known")}: 0\n  {_("learning")}: 6\n  {_("total")}: 6',
         ),
+        IO("tl 0100", f'{_("found")}: \\(6\\).*0100 新しい 1 あたらしい ✓'),
+        IO(
+            "i",
+            f'{_("known")}: 6\n.*\n.*\n  {_("lists")}:\n    0100: 6/6\n',
+        ),
+        IO(
+            "u",
+            _("set-{count}-in-list-{list_name}-unknown").format(
+                count=6, list_name="0100"
+            ),
+        ),
+        IO("tl 0100 2", _("usage") + ": tl "),
+        IO("tl 0900", _("list-{list_name}-not-found").format(list_name="0900")),
+        IO("v", _("{count}-kanji-without-their-generated-reading").format(count=0)),
+        IO(
+            "dk 新しい あたらしい",
+            _("{kana}-deleted-from-{kanji}").format(kanji="新しい", kana="あたらしい"),
+        ),
+        IO(
+            "v",
+            "新しい - → あたらしい\n"
+            + _("{count}-kanji-without-their-generated-reading").format(count=1),
+        ),
+        IO("va", _("added-{count}-readings").format(count=1)),
+        IO("u", _("deleted-{count}-readings").format(count=1)),
+        IO("r", _("added-{count}-readings").format(count=1)),
         IO("d 新しい", _("{kanji}-deleted").format(kanji="新しい")),
         # Indexes.
         IO("新しい", _("nothing-found")),
         IO("a 新しい", "1 0100 新しい 1 あたらしい"),
         IO("ak 1 かな", "1 0100 新しい 1 あたらしい 2 かな"),
         IO("ak 1 かなに", "1 0100 新しい 1 あたらしい 2 かな 3 かなに"),
-        IO("ak 1 かなさん", "1 0100 新しい 1 あたらしい 2 かな 3 かなに 4 かなさん"),
+        IO("ak 1 かなさん", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん 4 かなに"),
         IO("ck ああああ いいいい　うううう", _("{kanji}-not-found").format(kanji="ああああ")),
-        IO("ck 1 かなに かなよん", "1 0100 新しい 1 あたらしい 2 かな 3 かなよん 4 かなさん"),
+        IO("ck 1 かなに かなよん", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん 4 かなよん"),
         IO(
             "u",
             _("{new_kana}-changed-back-to-{kana}-for-{kanji}").format(
@@ -224,10 +252,10 @@ def __io_general() -> list[IO]:
                 kanji="新しい", kana="かなに", new_kana="かなよん"
             ),
         ),
-        IO("新しい", "1 0100 新しい 1 あたらしい 2 かな 3 かなに 4 かなさん"),
-        IO("t 1", "1 0100 新しい 1 あたらしい 2 かな 3 かなに 4 かなさん ✓"),
-        IO("t 1", "1 0100 新しい 1 あたらしい 2 かな 3 かなに 4 かなさん[^✓]+$"),
-        IO("dk 1 3", _("{kana}-deleted-from-{kanji}").format(kanji="新しい", kana="かなに")),
+        IO("新しい", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん 4 かなに"),
+        IO("t 1", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん 4 かなに ✓"),
+        IO("t 1", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん 4 かなに[^✓]+$"),
+        IO("dk 1 4", _("{kana}-deleted-from-{kanji}").format(kanji="新しい", kana="かなに")),
         IO("新しい", "1 0100 新しい 1 あたらしい 2 かな 3 かなさん"),
         IO("dk 1 3", _("{kana}-deleted-from-{kanji}").format(kanji="新しい", kana="かなさん")),
         IO("新しい", "1 0100 新しい 1 あたらしい 2 かな"),
@@ -345,6 +373,133 @@ def test_change_lang(locale: str | None) -> None:
     do_usage(locale, __io_change_lang)
 
 
+def __io_pages() -> list[IO]:
+    return [
+        IO("n", _("nothing-found")),
+        IO("う", f'{_("found")}: \\(2\\)\n     1 0100 研究 1 けんきゅう\n'),
+        IO("n", "     2 0100 工場 1 こうじょう\n$"),
+        IO("n", _("nothing-more-found")),
+        # Indices carry on from page to page.
+        IO("t 2", f'{_("found")}: \\(1\\)\n     1 0100 工場 1 こうじょう ✓'),
+        IO("u", ""),
+        IO("う", _("{count}-more-n-for-next-page").format(count=1)),
+        IO("n", "2 0100 工場"),
+        IO("d 2", _("{kanji}-deleted").format(kanji="工場")),
+    ]
+
+
+@pytest.mark.parametrize(
+    "locale",
+    [
+        None,
+        ("ja"),
+        ("en"),
+    ],
+)
+def test_pages(monkeypatch: pytest.MonkeyPatch, locale: str | None) -> None:
+    monkeypatch.setattr(nevsjapanesevocab, "RESULTS_PER_PAGE", 1)
+    do_usage(locale, __io_pages)
+
+
+def __io_exact_pages() -> list[IO]:
+    return [
+        # Only 研 itself, not 研究 as well.
+        IO("a 研", f'{_("found")}: \\(1\\)\n     1 0100 研 '),
+        IO("n", _("nothing-more-found")),
+        IO("", f'{_("found")}: \\(1\\)\n     1 0100 研 '),
+        IO("n", _("nothing-more-found")),
+    ]
+
+
+def test_exact_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(nevsjapanesevocab, "RESULTS_PER_PAGE", 1)
+    do_usage(None, __io_exact_pages)
+
+
+def __io_prefetch() -> list[IO]:
+    return [
+        IO("研究", f'{_("found")}: \\(1\\)'),
+        IO("n", _("nothing-more-found")),
+        IO("無い", _("nothing-found")),
+    ]
+
+
+def test_new_searches_cancel_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    cancelled: list[None] = []
+    monkeypatch.setattr(
+        nevsjapanesevocab, "cancel_prefetch_lookups", lambda: cancelled.append(None)
+    )
+    do_usage(None, __io_prefetch)
+    # Not by the next page, but by a search that finds
+    # nothing.
+    assert len(cancelled) == 2
+
+
+def __io_queries() -> list[IO]:
+    return [
+        IO("t 研究", "1 0100 研究 1 けんきゅう ✓"),
+        IO("known:1", f'{_("found")}: \\(1\\)\n     1 0100 研究'),
+        IO("known：0　kana：〜る", f'{_("found")}: \\(2\\)\n     1 0100 送る.*2 0100 集める'),
+        IO("l 2", "あつめる \\(集める\\)"),
+        IO("list:0100-0200 known:0 う", "1 0100 工場 1 こうじょう\n$"),
+        IO("list:0200", _("nothing-found")),
+        IO(
+            "known:2",
+            _("{search}-is-not-a-valid-search").format(search="known:2"),
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "locale",
+    [
+        None,
+        ("ja"),
+    ],
+)
+def test_queries(locale: str | None) -> None:
+    do_usage(locale, __io_queries)
+
+
+def __io_punctuation() -> list[IO]:
+    return [
+        # Only queries keep their punctuation.
+        IO("t 研究〜", "1 0100 研究 1 けんきゅう ✓"),
+        IO("kanji:研〜", f'{_("found")}: \\(1\\)\n     1 0100 研究'),
+    ]
+
+
+def test_punctuation() -> None:
+    do_usage(None, __io_punctuation)
+
+
+def __io_readings() -> list[IO]:
+    return [
+        IO("dk 研究 けんきゅう", ""),
+        IO("v", "研究 - → けんきゅう"),
+        IO("va", _("added-{count}-readings").format(count=1)),
+        IO("dk 研究 けんきゅう", ""),
+        IO("dk 工場 こうじょう", ""),
+        IO("v", _("{count}-kanji-without-their-generated-reading").format(count=2)),
+        IO("ak 研究 けんきゅう", ""),
+        IO("va", _("added-{count}-readings").format(count=1)),
+    ]
+
+
+def test_readings(monkeypatch: pytest.MonkeyPatch) -> None:
+    verified: list[int] = []
+    generate_readings = verify_module.generate_readings
+
+    def counted(kanji: list[str]) -> list[str]:
+        verified.append(len(kanji))
+        return generate_readings(kanji)
+
+    monkeypatch.setattr(verify_module, "generate_readings", counted)
+    do_usage(None, __io_readings)
+    # va adds what v found, less what was added since.
+    assert len(verified) == 2
+
+
 def __io_save() -> list[IO]:
     return [
         IO("s", ""),
@@ -383,6 +538,7 @@ def do_usage(locale: str | None, test_io: Callable[[], list[IO]]) -> None:
         command_stack = CommandStack()
         previous_search: str = ""
         kanji_found: list[str] = []
+        exact = False
         for io in test_io():
             sys.stdin.seek(0)
             sys.stdout.seek(0)
@@ -390,8 +546,8 @@ def do_usage(locale: str | None, test_io: Callable[[], list[IO]]) -> None:
             sys.stdout.truncate(0)
             sys.stdin.write(io.test_input + "\n")
             sys.stdin.seek(0)
-            previous_search, kanji_found = main_stuff(
-                vocab, command_stack, previous_search, kanji_found
+            previous_search, kanji_found, exact = main_stuff(
+                vocab, command_stack, previous_search, kanji_found, exact
             )
             sys.stdout.seek(0)
             actual_output = strip_ansi_terminal_escapes(sys.stdout.read())
@@ -16,6 +16,7 @@ from operations import format_help
             """
 使い方:
      漢字｜仮名　　　　　検索
+  n  　　　　　　　　　　次のページを表示する。
   l  日本語｜英語　　　　和英辞書で検索する。
   a  漢字　　　　　　　　新漢字
   d  漢字　　　　　　　　漢字削除
@@ -24,6 +25,9 @@ from operations import format_help
   dk 漢字　仮名　　　　　仮名削除
   ck 漢字　仮名　新仮名　仮名変更
   t  漢字　　　　　　　　分かったか✓否かを切り換える。
+  tl リスト　0｜1　　　リスト全体を既知にする。0なら未知にする。
+  v  　　　　　　　　　　生成された読みが仮名にない漢字を表示する。
+  va 　　　　　　　　　　生成された読みを追加する。
   u  　　　　　　　　　　元に戻す。
   r  　　　　　　　　　　遣り直す。
   s  　　　　　　　　　　書き込む。
@@ -41,6 +45,7 @@ from operations import format_help
             """
 Help:
      kanji|kana          Search.
+  n                      Show the next page of results.
   l  Japanese|English    Search the Japanese/English dictionary.
   a  kanji               Add a new kanji.
   d  kanji               Delete a kanji.
@@ -49,6 +54,9 @@ Help:
   dk kanji kana          Delete a kana from a kanji.
   ck kanji kana new-kana Change a kana for a kanji.
   t  kanji               Toggle known ✓ status.
+  tl list 0|1            Set a whole list known, or unknown with 0.
+  v                      Show kanji whose kana don't include their generated reading.
+  va                     Add their generated readings to them.
   u                      Undo.
   r                      Redo.
   s                      Save.
@@ -66,6 +74,7 @@ Help:
             """
 Uso:
      kanji|kana            Buscar.
+  n                        Mostrar la página siguiente de resultados.
   l  japonés|inglés        Buscar en el diccionario japonés/inglés.
   a  kanji                 Añadir un kanji.
   d  kanji                 Borrar un kanji.
@@ -74,6 +83,9 @@ Uso:
   dk kanji kana            Borrar un kana.
   ck kanji kana kana-nuevo Cambiar un kana.
   t  kanji                 Cambiar el estado conocido ✓.
+  tl lista 0|1             Marcar toda una lista como conocida, o desconocida con 0.
+  v                        Mostrar los kanji cuyos kana no incluyen su lectura generada.
+  va                       Añadirles su lectura generada.
   u                        Deshacer.
   r                        Rehacer.
   s                        Guardar.
@@ -91,6 +103,7 @@ Uso:
             """
 L'utilisation:
      kanji|kana              Chercher.
+  n                          Afficher la page suivante de résultats.
   l  japonais|anglais        Rechercher dans le dictionnaire japonais/anglais.
   a  kanji                   Ajouter un kanji.
   d  kanji                   Supprimer un kanji.
@@ -99,6 +112,9 @@ L'utilisation:
   dk kanji kana              Supprimer un kana.
   ck kanji kana kana-nouveau Changer un kana.
   t  kanji                   Basculer l'état connu ✓.
+  tl liste 0|1               Marquer toute une liste comme connue, ou inconnue avec 0.
+  v                          Afficher les kanji sans leur lecture générée.
+  va                         Leur ajouter leur lecture générée.
   u                          Défaire.
   r                          Refaire.
   s                          Sauvegarder.
@@ -0,0 +1,90 @@
+import pytest
+
+from query import is_query
+from query import parse_query
+
+
+def test_is_query() -> None:
+    assert is_query("known:0")
+    assert is_query("生 list:0100")
+    assert is_query("kana：〜する")
+    assert is_query("gloss:study")
+    assert not is_query("生")
+    assert not is_query("junk:生")
+
+
+def test_parse_query() -> None:
+    query = parse_query("list:0500-0300 known:0 kana:~する 生 kanji:生~")
+    assert query is not None
+    assert query.lists == (300, 500)
+    assert query.known is False
+    assert query.terms == ["生"]
+    assert query.required_chars == {"す", "る", "生"}
+    assert len(query.kana_patterns) == 1
+    assert len(query.kanji_patterns) == 1
+    query = parse_query("list:0100")
+    assert query is not None
+    assert query.lists == (100, 100)
+    assert query.known is None
+    # Full width, as typed on a Japanese keyboard.
+    query = parse_query("list：0100－0200 kana：〜する")
+    assert query is not None
+    assert query.lists == (100, 200)
+    assert query.kana_patterns[0].fullmatch("かんしゃする")
+    query = parse_query("gloss:Research gloss:study")
+    assert query is not None
+    assert query.glosses == ["research", "study"]
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "list:",
+        "list:abc",
+        "list:0100-",
+        "list:0100 list:0200",
+        "known:2",
+        "known:0 known:1",
+        "kana:",
+        "kana:~~",
+        "kanji:",
+        "gloss:",
+        "gloss:〜",
+    ],
+)
+def test_bad_queries(s: str) -> None:
+    assert parse_query(s) is None
+
+
+@pytest.mark.parametrize(
+    "s, entry, expected",
+    [
+        ("生", ("生活", ["せいかつ"], "0100", False), True),
+        ("せい", ("生活", ["せいかつ"], "0100", False), True),
+        ("生 活", ("生活", ["せいかつ"], "0100", False), True),
+        ("生 死", ("生活", ["せいかつ"], "0100", False), False),
+        ("known:1", ("生活", ["せいかつ"], "0100", False), False),
+        ("known:0", ("生活", ["せいかつ"], "0100", False), True),
+        ("list:0100-0300", ("生活", ["せいかつ"], "0200", False), True),
+        ("list:0100-0300", ("生活", ["せいかつ"], "0400", False), False),
+        ("kana:~かつ", ("生活", ["せいかつ"], "0100", False), True),
+        ("kana:せい~", ("生活", ["せいかつ"], "0100", False), True),
+        ("kana:せ~つ", ("生活", ["せいかつ"], "0100", False), True),
+        ("kana:~せい", ("生活", ["せいかつ"], "0100", False), False),
+        ("kana:いか", ("生活", ["せいかつ"], "0100", False), True),
+        ("kana:~する", ("勉強", ["べんきょう"], "0100", False), False),
+        ("kana:~する", ("勉強する", ["べんきょうする"], "0100", False), True),
+        ("kanji:~する", ("勉強する", ["べんきょうする"], "0100", False), True),
+        ("kanji:勉強", ("勉強する", [], "0100", False), True),
+        ("kanji:勉強~", ("勉強する", [], "0100", False), True),
+        ("kanji:勉強", ("勉強する", [], "0100", False), True),
+        ("kanji:~勉強", ("勉強する", [], "0100", False), False),
+        ("kana:.*", ("勉強する", ["べんきょうする"], "0100", False), False),
+    ],
+)
+def test_matches(
+    s: str, entry: tuple[str, list[str], str, bool], expected: bool
+) -> None:
+    query = parse_query(s)
+    assert query is not None
+    assert query.matches(*entry) == expected
@@ -0,0 +1,116 @@
+import pathlib
+import threading
+from typing import Any
+
+import pytest
+from pykakasi import kakasi
+
+from commands import AddCommand
+from commands import CommandStack
+from readings import ReadingCache
+from vocab import Vocab
+
+
+def test_reading_cache() -> None:
+    readings = ReadingCache(max_size=2)
+    assert readings.get("研究") is None
+    readings.put("研究", "けんきゅう")
+    readings.put("送る", "おくる")
+    assert readings.get("研究") == "けんきゅう"
+    readings.put("呼ぶ", "よぶ")
+    # The least recently used is forgotten.
+    assert readings.get("送る") is None
+    assert readings.get("研究") == "けんきゅう"
+    assert readings.get("呼ぶ") == "よぶ"
+    assert len(readings) == 2
+    readings.seed([("工場", "こうじょう"), ("集める", "あつめる"), ("新しい", "あたらしい")])
+    assert len(readings) == 2
+    assert readings.get("工場") == "こうじょう"
+    assert readings.get("集める") == "あつめる"
+
+
+def test_reading_cache_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    filename = str(tmp_path / "readings.db")
+    ReadingCache(filename).put("研究", "けんきゅう")
+    assert ReadingCache(filename).get("研究") == "けんきゅう"
+    monkeypatch.setattr(ReadingCache, "pykakasi_version", lambda: "0.0.0")
+    readings = ReadingCache(filename)
+    assert len(readings) == 0
+    assert readings.get("研究") is None
+
+
+def test_vocab_readings() -> None:
+    readings = ReadingCache()
+    vocab = Vocab("tests/test_data/vocab_good.csv", readings=readings)
+    # Seeded from the vocab.
+    assert len(readings) == 5
+    assert readings.get("研究") == "けんきゅう"
+    vocab.delete("研究")
+    readings.put("研究", "けんきゅ")
+    vocab.add("研究")
+    assert vocab.get_kana("研究") == ["けんきゅ"]
+    vocab.add("新しい")
+    assert readings.get("新しい") == "あたらしい"
+    # Not seeded again.
+    Vocab("tests/test_data/vocab_good.csv", readings=readings)
+    assert readings.get("研究") == "けんきゅ"
+
+
+def test_background_reading_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    convert = kakasi.convert
+
+    def failing_convert(self: kakasi, text: str) -> Any:
+        if text == "新しい":
+            raise ValueError(text)
+        return convert(self, text)
+
+    monkeypatch.setattr(kakasi, "convert", failing_convert)
+    readings = ReadingCache(background=True)
+    vocab = Vocab("tests/test_data/vocab_good.csv", readings=readings)
+    vocab.add("新しい")
+    vocab.add("正しい")
+    vocab.apply_readings(block=True)
+    # Left without a reading, and not remembered.
+    assert not vocab.get_kana("新しい")
+    assert readings.get("新しい") is None
+    assert vocab.get_kana("正しい") == ["ただしい"]
+
+
+def test_background_readings(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Readings are generated when the test says so.
+    go = threading.Event()
+    convert = kakasi.convert
+
+    def blocked_convert(self: kakasi, text: str) -> Any:
+        go.wait()
+        return convert(self, text)
+
+    monkeypatch.setattr(kakasi, "convert", blocked_convert)
+    readings = ReadingCache(background=True)
+    vocab = Vocab("tests/test_data/vocab_good.csv", readings=readings)
+    vocab.add("新しい")
+    assert not vocab.get_kana("新しい")
+    vocab.add("工事")
+    vocab.add_kana("工事", "こうじ")
+    vocab.add("大学")
+    vocab.delete("大学")
+    command_stack = CommandStack()
+    command_stack.do(AddCommand(vocab, "正しい"))
+    command_stack.undo()
+    go.set()
+    vocab.apply_readings(block=True)
+    assert vocab.get_kana("新しい") == ["あたらしい"]
+    # Cancelled by changing the kana, and by deleting.
+    assert vocab.get_kana("工事") == ["こうじ"]
+    assert "大学" not in vocab
+    # It arrived after the undo, and is only given to the
+    # kanji when it is added again.
+    assert "正しい" not in vocab
+    assert readings.get("正しい") is None
+    command_stack.redo()
+    assert not vocab.get_kana("正しい")
+    vocab.apply_readings(block=True)
+    assert vocab.get_kana("正しい") == ["ただしい"]
+    assert readings.get("新しい") == "あたらしい"
@@ -0,0 +1,39 @@
+import pytest
+from test_helpers import strip_ansi_terminal_escapes
+
+from rows import format_rows
+from rows import get_row_cache
+from vocab import Vocab
+
+
+@pytest.fixture
+def vocab() -> Vocab:
+    return Vocab("tests/test_data/vocab_good.csv")
+
+
+def test_format_rows(vocab: Vocab) -> None:
+    rows = [
+        strip_ansi_terminal_escapes(row) for row in format_rows(vocab, ["研究", "呼ぶ"], 9)
+    ]
+    assert rows == ["    10 0100 研究 1 けんきゅう", "    11 0100 呼ぶ 1 よぶ"]
+
+
+def test_row_cache(vocab: Vocab) -> None:
+    row_cache = get_row_cache(vocab)
+    assert get_row_cache(vocab) is row_cache
+    assert len(row_cache) == 0
+    row = row_cache.row(vocab, "研究")
+    assert row_cache.row(vocab, "研究") is row
+    assert len(row_cache) == 1
+    vocab.toggle_known("研究")
+    assert len(row_cache) == 0
+    assert strip_ansi_terminal_escapes(row_cache.row(vocab, "研究")).endswith("✓")
+    vocab.add_kana("研究", "けんきゅ")
+    assert len(row_cache) == 0
+    row_cache.row(vocab, "研究")
+    vocab.change("研究", "研究所")
+    assert len(row_cache) == 0
+    assert (
+        strip_ansi_terminal_escapes(row_cache.row(vocab, "研究所"))
+        == "0100 研究所 1 けんきゅ 2 けんきゅう ✓"
+    )
@@ -0,0 +1,38 @@
+import builtins
+import subprocess
+import sys
+
+from startup import StartupProfile
+
+
+def test_startup_profile() -> None:
+    original_import = builtins.__import__
+    profile = StartupProfile()
+    sys.modules.pop("tabnanny", None)
+    __import__("tabnanny")
+    profile.step("importing tabnanny")
+    report = profile.report().splitlines()
+    assert builtins.__import__ is original_import
+    assert report[0] == "imports, slowest 20:"
+    assert any(line.startswith("  tabnanny ") for line in report)
+    assert report[-3] == "steps:"
+    assert report[-2].startswith("  importing tabnanny ")
+    assert report[-1].startswith("time to first prompt ")
+    assert report[-1].endswith(" ms")
+
+
+def test_heavy_modules_not_imported() -> None:
+    # Only imported when what uses them is first used.
+    heavy = ["pykakasi", "jamdict", "concurrent.futures.process"]
+    imported = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, nevsjapanesevocab; "
+            + f"print(*[m for m in {heavy} if m in sys.modules])",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert imported.strip() == ""
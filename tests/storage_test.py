@@ -0,0 +1,175 @@
+import concurrent.futures
+import pathlib
+import sqlite3
+
+import pytest
+
+from storage import CsvStorage
+from storage import Row
+from storage import SqliteStorage
+from storage import open_storage
+from vocab import Vocab
+
+
+@pytest.fixture
+def db_filename(tmp_path: pathlib.Path) -> str:
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    db_filename = str(tmp_path / "vocab.db")
+    vocab.filename = db_filename
+    vocab.save()
+    return db_filename
+
+
+def test_open_storage() -> None:
+    assert isinstance(open_storage("vocab.csv"), CsvStorage)
+    assert isinstance(open_storage("vocab"), CsvStorage)
+    assert isinstance(open_storage("vocab.db"), SqliteStorage)
+    assert isinstance(open_storage("vocab.sqlite"), SqliteStorage)
+    assert isinstance(open_storage("vocab.sqlite3"), SqliteStorage)
+
+
+def test_import_export(tmp_path: pathlib.Path, db_filename: str) -> None:
+    vocab = Vocab(db_filename)
+    assert {
+        kanji: vocab.get_kana(kanji) for kanji in vocab.search_page("list:0100")[1]
+    } == {
+        "研究": ["けんきゅう"],
+        "呼ぶ": ["よぶ"],
+        "送る": ["おくる"],
+        "工場": ["こうじょう"],
+        "集める": ["あつめる"],
+    }
+    csv_filename = str(tmp_path / "vocab.csv")
+    vocab.filename = csv_filename
+    vocab.save()
+    with open(csv_filename, encoding="utf-8") as f:
+        exported = f.read()
+    with open("tests/test_data/vocab_good.csv", encoding="utf-8") as f:
+        assert exported == "".join(sorted(f.readlines()))
+
+
+def test_changes_are_written_as_they_happen(db_filename: str) -> None:
+    vocab = Vocab(db_filename)
+    vocab.add("新しい")
+    vocab.add_kana("新しい", "かな")
+    vocab.toggle_known("研究")
+    vocab.change("送る", "贈る")
+    vocab.delete("呼ぶ")
+    vocab.delete_kana("工場", "こうじょう")
+    # Left out, as it is from CSV files.
+    vocab.add_kana("集める", "集める")
+    # Not saved.
+    vocab2 = Vocab(db_filename)
+    assert vocab2.get_kana("新しい") == ["あたらしい", "かな"]
+    assert vocab2.get_kana("集める") == ["あつめる"]
+    assert vocab2.get_list_name("新しい") == "0100"
+    assert vocab2.is_known("研究")
+    assert "送る" not in vocab2
+    assert vocab2.get_kana("贈る") == ["おくる"]
+    assert "呼ぶ" not in vocab2
+    # pylint: disable-next=use-implicit-booleaness-not-comparison
+    assert vocab2.get_kana("工場") == []
+    # In the same order.
+    assert vocab2.search_page("list:0100")[1] == vocab.search_page("list:0100")[1]
+
+
+def test_bulk_changes_are_one_write(
+    monkeypatch: pytest.MonkeyPatch, db_filename: str
+) -> None:
+    vocab = Vocab(db_filename)
+    writes: list[int] = []
+    changed = SqliteStorage.changed
+
+    def counted(storage: SqliteStorage, changes: list[tuple[str, Row | None]]) -> None:
+        writes.append(len(changes))
+        changed(storage, changes)
+
+    monkeypatch.setattr(SqliteStorage, "changed", counted)
+    vocab.set_list_known("0100", True)
+    assert writes == [5]
+    assert Vocab(db_filename).get_info() == (5, 0)
+
+
+def test_changes_that_fail_are_saved(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    db_filename: str,
+) -> None:
+    def locked(*_args: object) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    vocab = Vocab(db_filename)
+    with monkeypatch.context() as m:
+        m.setattr(SqliteStorage, "_SqliteStorage__write", locked)
+        vocab.toggle_known("研究")
+    assert "database is locked" in capsys.readouterr().out
+    assert vocab.is_known("研究")
+    vocab.toggle_known("工場")
+    assert not Vocab(db_filename).is_known("工場")
+    # Written as a whole.
+    vocab.save()
+    vocab2 = Vocab(db_filename)
+    assert vocab2.is_known("研究")
+    assert vocab2.is_known("工場")
+
+
+def test_missing_database(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(OSError):
+        Vocab(str(tmp_path / "missing.db"))
+
+
+def test_csv_save_load(tmp_path: pathlib.Path) -> None:
+    storage = CsvStorage(str(tmp_path / "vocab.csv"))
+    # More than one chunk.
+    rows = [
+        (f"{row // 100 + 1:04d}", f"漢字{row}", row % 2 == 0, ["かな"] * (row % 3))
+        for row in range(CsvStorage.SAVE_CHUNK_ROWS + 1)
+    ]
+    storage.save(rows)
+    assert list(storage.load()) == rows
+
+
+def test_csv_spaces(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "vocab.csv")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(" 0100,研究,0,けんきゅう \r\n0100,送る,1, \n")
+    assert list(CsvStorage(filename).load()) == [
+        ("0100", "研究", False, ["けんきゅう"]),
+        ("0100", "送る", True, []),
+    ]
+
+
+def test_load_parallel(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    monkeypatch.setattr(CsvStorage, "MIN_CHUNK_BYTES", 100)
+    filename = str(tmp_path / "vocab.csv")
+    storage = CsvStorage(filename)
+    storage.save(
+        [(f"{row // 100 + 1:04d}", f"漢字{row}", False, ["かな"]) for row in range(1000)]
+    )
+    assert list(storage.load_parallel(2)) == list(storage.load())
+
+    def no_process_pools(processes: int) -> None:
+        raise NotImplementedError(processes)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(concurrent.futures, "ProcessPoolExecutor", no_process_pools)
+        assert list(storage.load_parallel(2)) == list(storage.load())
+    vocab = Vocab(filename, processes=2)
+    assert vocab.search_page("漢字")[1] == Vocab(filename).search_page("漢字")[1]
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write("0100,送る,2,おくる\n")
+    for rows in [storage.load(), storage.load_parallel(2)]:
+        with pytest.raises(Exception) as e_info:
+            list(rows)
+        assert "line 1001: bad known status '2', expected 0 or 1." in str(e_info)
+
+
+def test_csv_field_too_large(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "vocab.csv")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("0100,研究,0,けんきゅう\n0100," + "あ" * 200_000 + ",0,\n")
+    with pytest.raises(Exception) as e_info:
+        list(CsvStorage(filename).load())
+    assert str(e_info.value) == (
+        "line 2: bad line, field larger than field limit (131072)."
+    )
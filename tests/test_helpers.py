@@ -1,5 +1,26 @@
 import re
 
+import pytest
+
+from query import Query
+
 
 def strip_ansi_terminal_escapes(s: str) -> str:
     return re.sub("\x1b\\[[\\d;]+m", "", s)
+
+
+def checked_kanji(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Records the kanji that searches check their queries
+    against, which are only those in the index that a search
+    starts from."""
+    checked: list[str] = []
+    matches = Query.matches
+
+    def checked_matches(
+        query: Query, kanji: str, kana_list: list[str], list_name: str, known: bool
+    ) -> bool:
+        checked.append(kanji)
+        return matches(query, kanji, kana_list, list_name, known)
+
+    monkeypatch.setattr(Query, "matches", checked_matches)
+    return checked
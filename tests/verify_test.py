@@ -0,0 +1,42 @@
+import concurrent.futures
+
+import pytest
+
+import verify as verify_module
+from verify import verify_readings
+from vocab import Vocab
+
+
+def test_verify_readings() -> None:
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    assert not verify_readings(vocab.kana_lists())
+    vocab.add("すし")
+    vocab.add("テレビ")
+    vocab.add("コーヒー")
+    vocab.add("新しい")
+    vocab.delete_kana("新しい", "あたらしい")
+    vocab.change_kana("研究", "けんきゅう", "けんきゅ")
+    vocab.add_kana("呼ぶ", "よびます")
+    assert verify_readings(vocab.kana_lists()) == [
+        ("新しい", [], "あたらしい"),
+        ("研究", ["けんきゅ"], "けんきゅう"),
+    ]
+
+
+def test_verify_readings_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(verify_module, "MIN_CHUNK_KANJI", 2)
+    kana_lists = [
+        ("研究", ["けんきゅ"]),
+        ("呼ぶ", ["よぶ"]),
+        ("送る", []),
+        ("工場", ["こうじょう"]),
+        ("集める", ["あつめる"]),
+    ]
+    expected = [("研究", ["けんきゅ"], "けんきゅう"), ("送る", [], "おくる")]
+    assert verify_readings(kana_lists, 2) == expected
+
+    def no_process_pools(processes: int) -> None:
+        raise NotImplementedError(processes)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_process_pools)
+    assert verify_readings(kana_lists, 2) == expected
@@ -3,27 +3,30 @@ import sys
 from io import StringIO
 
 import pytest
+from test_helpers import checked_kanji
 
+from columns import Columns
 from localisation import _
 from localisation import unset_locale
+from search import SEARCH_CACHE_SIZE
 from vocab import Vocab
 
 
-@pytest.fixture
-def vocab() -> Vocab:
-    return Vocab("tests/test_data/vocab_good.csv")
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def vocab(request: pytest.FixtureRequest) -> Vocab:
+    return Vocab("tests/test_data/vocab_good.csv", lazy=request.param)
 
 
 def test_new_kanji_list_name(vocab: Vocab) -> None:
     assert vocab.new_kanji_list_name() == "0100"
     with open(vocab.filename, encoding="utf-8") as f:
-        assert vocab.count_in_current_list() == len(f.readlines())
-    for i in range(0, vocab.ITEMS_PER_LIST - vocab.count_in_current_list() - 1):
+        assert vocab.count_in_list() == len(f.readlines())
+    for i in range(0, vocab.ITEMS_PER_LIST - vocab.count_in_list() - 1):
         vocab.add(f"new{i}")
-    assert vocab.count_in_current_list() == vocab.ITEMS_PER_LIST - 1
+    assert vocab.count_in_list() == vocab.ITEMS_PER_LIST - 1
     assert vocab.new_kanji_list_name() == "0100"
     vocab.add("fillit")
-    assert vocab.count_in_current_list() == 100
+    assert vocab.count_in_list() == 100
     assert vocab.new_kanji_list_name() == "0200"
     assert vocab.add("tipitover") == "0200"
 
@@ -35,6 +38,179 @@ def test_contains(vocab: Vocab) -> None:
     assert not vocab.contains("送る", "junk")
 
 
+def test_search(vocab: Vocab) -> None:
+    vocab.add("研")
+    vocab.add("究める")
+    # Exact kanji, then prefix.
+    assert vocab.search_page("研")[1] == ["研", "研究"]
+    assert vocab.search_page("研", exact=True)[1] == ["研"]
+    # Exact kana, then prefix.
+    assert vocab.search_page("けん")[1] == ["研", "研究"]
+    # Prefix, then substring.
+    assert vocab.search_page("究")[1] == ["究める", "研究"]
+    # Unknown, then known.
+    assert vocab.search_page("う")[1] == ["研究", "工場"]
+    vocab.toggle_known("研究")
+    assert vocab.search_page("う")[1] == ["工場", "研究"]
+    assert vocab.search_page("junk")[0] == 0
+    assert vocab.search_page("う", count=1) == (2, ["工場"])
+
+
+def test_search_page(vocab: Vocab) -> None:
+    assert vocab.search_page("う") == (2, ["研究", "工場"])
+    assert vocab.search_page("う", start=0, count=1) == (2, ["研究"])
+    assert vocab.search_page("う", start=1, count=1) == (2, ["工場"])
+    assert vocab.search_page("う", start=2, count=1) == (2, [])
+    assert vocab.search_page("junk", start=0, count=1) == (0, [])
+
+
+def test_search_cache(monkeypatch: pytest.MonkeyPatch, vocab: Vocab) -> None:
+    checked = checked_kanji(monkeypatch)
+    assert vocab.search_page("う", count=1) == (2, ["研究"])
+    assert len(checked) > 0
+    checked.clear()
+    # The next page, and the same search again, don't search.
+    assert vocab.search_page("う", start=1, count=1) == (2, ["工場"])
+    assert vocab.search_page("う", count=1) == (2, ["研究"])
+    assert not checked
+    # Nor do they after changes that can't change them.
+    vocab.toggle_known("呼ぶ")
+    vocab.add_kana("送る", "おくりがな")
+    checked.clear()
+    assert vocab.search_page("う", count=1) == (2, ["研究"])
+    assert not checked
+    # A kanji in them changing does.
+    vocab.toggle_known("研究")
+    assert vocab.search_page("う", count=1) == (2, ["工場"])
+    # As does one changing so that it would be in them.
+    vocab.add_kana("呼ぶ", "よぶう")
+    assert vocab.search_page("う", count=1) == (3, ["工場"])
+    vocab.delete("工場")
+    assert vocab.search_page("う", count=1) == (2, ["研究"])
+    assert vocab.search_page("研究", exact=True) == (1, ["研究"])
+    vocab.change("研究", "研究所")
+    assert vocab.search_page("研究", exact=True) == (0, [])
+    vocab.change("研究所", "研究")
+    assert vocab.search_page("研究", exact=True) == (1, ["研究"])
+    for i in range(SEARCH_CACHE_SIZE + 1):
+        vocab.search_page(f"{i}")
+    checked.clear()
+    assert vocab.search_page("う", count=1) == (2, ["研究"])
+    assert len(checked) > 0
+
+
+def test_search_cache_best(monkeypatch: pytest.MonkeyPatch, vocab: Vocab) -> None:
+    checked = checked_kanji(monkeypatch)
+    # Twice as many as the page are ranked, so the next page
+    # doesn't search, and the one after does.
+    assert vocab.search_page("list:0100", count=1) == (5, ["研究"])
+    checked.clear()
+    assert vocab.search_page("list:0100", start=1, count=1) == (5, ["呼ぶ"])
+    assert not checked
+    assert vocab.search_page("list:0100", start=2, count=1) == (5, ["送る"])
+    assert len(checked) > 0
+    # A kanji that isn't ranked changing forgets them too.
+    assert vocab.search_page("known:0", count=1) == (5, ["研究"])
+    vocab.delete("集める")
+    assert vocab.search_page("known:0", count=1) == (4, ["研究"])
+
+
+def test_query(vocab: Vocab) -> None:
+    vocab.add("研")
+    vocab.add("究める")
+    vocab.toggle_known("研究")
+    vocab.toggle_known("研")
+    assert vocab.search_page("known:1")[1] == ["研究", "研"]
+    assert vocab.search_page("known:0 kana:~る")[1] == ["送る", "集める", "究める"]
+    assert vocab.search_page("list:0100 kana:~める")[1] == ["集める", "究める"]
+    assert vocab.search_page("list:0200-0300 kana:~める")[0] == 0
+    assert vocab.search_page("list:0100-0200 研")[1] == ["研", "研究"]
+    assert vocab.search_page("kanji:~める known:1")[0] == 0
+    vocab.delete("研")
+    vocab.change("研究", "研究所")
+    assert vocab.search_page("known:1")[1] == ["研究所"]
+    assert vocab.search_page("研") == (1, ["研究所"])
+
+
+def __checked(vocab: Vocab, checked: list[str], s: str) -> list[str]:
+    """The kanji that a search checks its query against,
+    none if it's remembered."""
+    checked.clear()
+    vocab.search_page(s)
+    return sorted(checked)
+
+
+def test_plans(monkeypatch: pytest.MonkeyPatch) -> None:
+    vocab = Vocab("tests/test_data/vocab_good.csv")
+    vocab.add("研")
+    vocab.toggle_known("研究")
+    vocab.toggle_known("研")
+    vocab.add("究める")
+    checked = checked_kanji(monkeypatch)
+    # The postings of 研.
+    assert __checked(vocab, checked, "研") == ["研", "研究"]
+    assert __checked(vocab, checked, "known:0") == [
+        "呼ぶ",
+        "工場",
+        "究める",
+        "送る",
+        "集める",
+    ]
+    assert __checked(vocab, checked, "known:1 list:0100") == ["研", "研究"]
+    assert not __checked(vocab, checked, "list:0200 known:0")
+    # The postings of く.
+    assert __checked(vocab, checked, "list:0100 kana:~く~") == ["送る"]
+
+
+def test_lazy(monkeypatch: pytest.MonkeyPatch) -> None:
+    vocab = Vocab("tests/test_data/vocab_good.csv", lazy=True)
+    checked = checked_kanji(monkeypatch)
+    assert "研究" in vocab
+    assert vocab.get_list_name("研究") == "0100"
+    # Found in the mapped file, and only checked once.
+    assert __checked(vocab, checked, "ける") == ["研究"]
+    vocab.toggle_known("研究")
+    # Remembered, since 研究 changing can't change it.
+    assert not __checked(vocab, checked, "ける")
+    assert __checked(vocab, checked, "けん") == ["研究"]
+    assert vocab.search_page("う")[1] == ["工場", "研究"]
+    # No index of known kanji until everything is parsed.
+    assert len(__checked(vocab, checked, "known:1")) == 5
+    assert vocab.get_info() == (1, 4)
+    assert __checked(vocab, checked, "list:0100 known:1") == ["研究"]
+    # The postings of け.
+    assert __checked(vocab, checked, "けんきゅう") == ["研究"]
+
+
+def test_lazy_save(tmp_path: pathlib.Path) -> None:
+    tmp_filename = str(tmp_path / "vocab.csv")
+    with open("tests/test_data/vocab_good.csv", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    vocab = Vocab(tmp_filename, lazy=True)
+    assert vocab.search_page("る")[1] == ["送る", "集める"]
+    # Nothing changed, nothing written.
+    vocab.save()
+    with open(tmp_filename, encoding="utf-8") as f:
+        assert f.readlines() == lines
+    vocab.add_kana("送る", "おくります")
+    vocab.save()
+    vocab2 = Vocab(tmp_filename)
+    assert vocab2.get_kana("送る") == ["おくります", "おくる"]
+    assert vocab2.get_kana("研究") == ["けんきゅう"]
+
+
+def test_lazy_bad_file() -> None:
+    # Every line is checked on loading, not when it's used.
+    with pytest.raises(Exception) as e_info:
+        Vocab("tests/test_data/vocab_bad_known.csv", lazy=True)
+    assert "line 3: bad known status '2', expected 0 or 1." in str(e_info)
+    with pytest.raises(Exception) as e_info:
+        Vocab("tests/test_data/vocab_bad_kanji.csv", lazy=True)
+    assert "line 3: empty kanji ''." in str(e_info)
+
+
 def test_add_delete_kanji(vocab: Vocab) -> None:
     assert not vocab.contains("new")
     list_name = vocab.add("new")
@@ -66,22 +242,109 @@ def test_change_kanji(vocab: Vocab) -> None:
     assert vocab.contains("NEW")
     assert vocab.contains("NEW", "kana")
     assert vocab.contains("NEW", "kana2")
+    # In the same place.
+    assert vocab.search_page("list:0100")[1][-1] == "NEW"
+    vocab.change("呼ぶ", "読ぶ")
+    assert vocab.search_page("list:0100")[1][1] == "読ぶ"
+    assert vocab.search_page("読")[1] == ["読ぶ"]
+    assert vocab.search_page("呼")[0] == 0
+
+
+def test_list_known(vocab: Vocab) -> None:
+    vocab.add("新しい", "0200")
+    vocab.toggle_known("研究")
+    assert vocab.get_list_info() == {"0100": (1, 4), "0200": (0, 1)}
+    changes: list[tuple[list[str], bool]] = []
+    vocab.add_change_listener(lambda kanji, words: changes.append((kanji, words)))
+    assert vocab.set_list_known("0100", True) == ["呼ぶ", "工場", "送る", "集める"]
+    # One change, of known status only.
+    assert changes == [(["呼ぶ", "工場", "送る", "集める"], False)]
+    assert vocab.get_info() == (5, 1)
+    assert vocab.get_list_info() == {"0100": (5, 0), "0200": (0, 1)}
+    assert vocab.search_page("known:0")[1] == ["新しい"]
+    assert vocab.set_list_known("0100", True) == []
+    vocab.delete("研究")
+    assert vocab.set_list_known("0100", False) == ["呼ぶ", "工場", "送る", "集める"]
+    assert vocab.get_list_info() == {"0100": (0, 4), "0200": (0, 1)}
+    assert vocab.get_info() == (0, 5)
+    assert vocab.search_page("known:1")[0] == 0
+
+
+def test_duplicate_kanji(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "vocab.csv")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("0100,研究,0,けんきゅう\n0100,送る,0,おくる\n0200,研究,1,\n")
+    for lazy in [False, True]:
+        vocab = Vocab(filename, lazy=lazy)
+        assert vocab.get_list_name("研究") == "0200"
+        assert vocab.is_known("研究")
+        assert len(vocab.get_kana("研究")) == 0
+        assert vocab.search_page("list:0100-0200")[1] == ["送る", "研究"]
+
+
+def test_normalized(tmp_path: pathlib.Path) -> None:
+    filename = str(tmp_path / "vocab.csv")
+    # Separate dakuten and handakuten, rather than が and ぴ.
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("0100,学校,0,か\u3099っこう\n0100,ひ\u309aん,0,\n")
+    for lazy in [False, True]:
+        vocab = Vocab(filename, lazy=lazy)
+        assert vocab.search_page("ぴん", exact=True)[1] == ["ぴん"]
+        assert vocab.get_kana("学校") == ["がっこう"]
+    assert vocab.search_page("がっこう")[1] == ["学校"]
+    vocab.add("ち\u3099")
+    assert "ぢ" in vocab
+    vocab.add_kana("学校", "か\u3099く")
+    vocab.change_kana("学校", "がっこう", "か\u3099っこ")
+    assert vocab.get_kana("学校") == ["がく", "がっこ"]
+    vocab.change("ぢ", "ひ\u3099")
+    assert "び" in vocab
+    vocab.save()
+    with open(filename, encoding="utf-8") as f:
+        assert "\u3099" not in f.read()
+
+
+def test_decomposed(vocab: Vocab) -> None:
+    # ぢ, が, ぐ, and ご, with separate dakuten.
+    di, ga, gu, go = "ち\u3099", "か\u3099", "く\u3099", "こ\u3099"
+    vocab.add(di)
+    assert di in vocab
+    assert vocab.contains(di)
+    assert vocab.get_list_name(di) == "0100"
+    vocab.replace_all_kana([(di, [ga])])
+    assert vocab.contains(di, ga)
+    assert vocab.get_kana(di) == ["が"]
+    assert vocab.add_kana(di, gu) == 1
+    vocab.change_kana(di, gu, go)
+    assert vocab.delete_kana(di, ga) == 0
+    assert vocab.get_kana(di) == ["ご"]
+    assert vocab.toggle_known(di)
+    assert vocab.is_known(di)
+    vocab.set_known([di], False)
+    assert not vocab.is_known(di)
+    assert vocab.search_page(di, exact=True)[1] == ["ぢ"]
+    assert vocab.search_page(go) == (1, ["ぢ"])
+    vocab.change(di, ga)
+    assert "が" in vocab
+    assert vocab.delete(ga) == "0100"
+    assert "が" not in vocab
 
 
 def test_add_delete_kana(vocab: Vocab) -> None:
     assert not vocab.contains("送る", "new")
     index = vocab.add_kana("送る", "new")
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert index == 0
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     index2 = vocab.add_kana("送る", "new2")
     assert vocab.contains("送る", "new2")
-    assert vocab.get_kana("送る") == ["おくる", "new", "new2"]
+    assert vocab.get_kana("送る") == ["new", "new2", "おくる"]
     assert vocab.delete_kana("送る", "new2") == index2
     assert not vocab.contains("送る", "new2")
-    assert vocab.get_kana("送る") == ["おくる", "new"]
+    assert vocab.get_kana("送る") == ["new", "おくる"]
     index2 = vocab.add_kana("送る", "new2")
     assert vocab.delete_kana("送る", "new") == index
     assert not vocab.contains("送る", "new")
-    assert vocab.get_kana("送る") == ["おくる", "new2"]
+    assert vocab.get_kana("送る") == ["new2", "おくる"]
     assert vocab.delete_kana("送る", "new2") == index
     assert not vocab.contains("送る", "new2")
     assert vocab.get_kana("送る") == ["おくる"]
@@ -102,7 +365,7 @@ def test_change_kana(vocab: Vocab) -> None:
     assert not vocab.contains("new", "kana")
     assert vocab.contains("new", "kana2")
     assert vocab.contains("new", "kana3")
-    assert ["kana3", "kana2"] == vocab.get_kana("new")
+    assert ["kana2", "kana3"] == vocab.get_kana("new")
 
 
 @pytest.mark.parametrize(
@@ -132,8 +395,17 @@ def test_save(tmp_path: pathlib.Path, vocab: Vocab) -> None:
     vocab.add_kana("new", "kana")
     vocab.add("new2")
     vocab.toggle_known("new2")
+    vocab.add("aaa", "0100")
     vocab.filename = tmp_filename
+    changes: list[list[str]] = []
+    vocab.add_change_listener(lambda kanji, _words: changes.append(kanji))
     vocab.save()
+    # Saving doesn't change the vocab.
+    assert not changes
+    assert vocab.get_kana("new") == ["kana", "kana2", "new"]
+    with open(tmp_filename, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines == sorted(lines)
     vocab2 = Vocab(tmp_filename)
     assert "new" in vocab2
     # expressly not kana 'new' that duplicates the kanji 'new'.
@@ -143,6 +415,40 @@ def test_save(tmp_path: pathlib.Path, vocab: Vocab) -> None:
     assert vocab2.is_known("new2")
 
 
+def test_save_compacts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, vocab: Vocab
+) -> None:
+    ids: list[int] = []
+    add = Columns.add
+
+    def recorded(
+        columns: Columns, kanji: str, known: bool, kana: tuple[str, ...]
+    ) -> int:
+        ids.append(add(columns, kanji, known, kana))
+        return ids[-1]
+
+    monkeypatch.setattr(Columns, "add", recorded)
+    vocab.filename = str(tmp_path / "new.csv")
+    vocab.add("研")
+    vocab.toggle_known("研")
+    for i in range(9):
+        vocab.add(f"new{i}")
+        vocab.delete(f"new{i}")
+        vocab.save()
+    # The six kanji, and up to three deleted ones, before
+    # saving drops them.
+    assert max(ids) == 8
+    vocab.add("究める")
+    assert ids[-1] == 6
+    checked = checked_kanji(monkeypatch)
+    # The postings of 研, in the order that they were added.
+    assert __checked(vocab, checked, "研") == ["研", "研究"]
+    assert vocab.search_page("研")[1] == ["研", "研究"]
+    assert vocab.search_page("list:0100 known:1")[1] == ["研"]
+    assert vocab.get_info() == (1, 6)
+    assert vocab.count_in_list("0100") == 7
+
+
 def test_fail_save(vocab: Vocab) -> None:
     unset_locale()
     stdout = sys.stdout
@@ -0,0 +1,67 @@
+import ast
+import glob
+import json
+import os
+import sys
+from collections.abc import Iterable
+from collections.abc import Iterator
+from functools import partial
+
+
+def catalog_source(localedir: str = "locales") -> str:
+    """The source of catalog.py, with the translations of
+    every locale in the locales directory, from its .po
+    file, which scripts/translate writes to src/catalog.py,
+    so that setting a locale doesn't read or parse any of
+    them. Being a module, it is compiled to bytecode with
+    the rest of the source, and bundled with it by
+    scripts/bundle."""
+    # Double quoted, as black would have them.
+    literal = partial(json.dumps, ensure_ascii=False)
+    lines = [
+        "# Written by scripts/translate, from the locales' .po files.",
+        "# pylint: disable=line-too-long,too-many-lines",
+        "from typing import Final",
+        "",
+        "CATALOG: Final[dict[str, dict[str, str]]] = {",
+    ]
+    for po_file in sorted(glob.glob(os.path.join(localedir, "*/LC_MESSAGES/*.po"))):
+        locale = po_file.split(os.sep)[-3]
+        with open(po_file, encoding="utf-8") as f:
+            messages = dict(translations(f))
+        lines.append(f"    {literal(locale)}: {{")
+        lines.extend(
+            f"        {literal(msgid)}: {literal(msgstr)},"
+            for msgid, msgstr in sorted(messages.items())
+        )
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def translations(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Generates the messages of a .po file, with their
+    translations, leaving out the header, fuzzy ones, and
+    those that aren't translated, as msgfmt does."""
+    entry: dict[str, str] = {}
+    keyword = ""
+    fuzzy = False
+    for line in [*lines, ""]:
+        line = line.strip()
+        if line == "":
+            if entry.get("msgid", "") != "" and entry.get("msgstr", "") != "":
+                if not fuzzy:
+                    yield entry["msgid"], entry["msgstr"]
+            entry = {}
+            fuzzy = False
+        elif line.startswith("#"):
+            fuzzy = fuzzy or (line.startswith("#,") and "fuzzy" in line)
+        else:
+            if not line.startswith('"'):
+                keyword, line = line.split(None, 1)
+            # Its escapes are C's, which are Python's too.
+            entry[keyword] = entry.get(keyword, "") + ast.literal_eval(line)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(catalog_source())